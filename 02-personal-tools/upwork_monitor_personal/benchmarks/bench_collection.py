@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+収集ベンチマーク
+逐次収集 vs 非同期収集 (ローカルフィクスチャサーバー使用・オフライン実行)
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from scraper import UpworkScraper
+from fixture_server import FixtureServer
+
+def run_benchmark(latency, pages, settings_file):
+    results = {}
+
+    with FixtureServer(latency=latency) as server:
+        scraper = UpworkScraper(settings_file)
+        scraper.search_url = server.search_url
+        scraper.pages_per_keyword = pages
+
+        for mode, collect in (("serial", scraper.collect_jobs),
+                              ("async", scraper.collect_jobs_async)):
+            start = time.perf_counter()
+            jobs = collect()
+            results[mode] = {"seconds": round(time.perf_counter() - start, 3), "jobs": len(jobs)}
+
+        results["requests"] = server.requests
+        results["peak_in_flight"] = server.peak_in_flight
+
+    results["keywords"] = len(scraper.search_keywords)
+    results["speedup"] = round(results["serial"]["seconds"] / results["async"]["seconds"], 1)
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Upwork collection benchmark (serial vs async)')
+    parser.add_argument('--latency', type=float, default=0.1, help='Simulated response latency (sec)')
+    parser.add_argument('--pages', type=int, default=2, help='Pages per keyword')
+    parser.add_argument('--settings', default='config/settings.json', help='Settings file')
+
+    args = parser.parse_args()
+    print(json.dumps(run_benchmark(args.latency, args.pages, args.settings), indent=2))
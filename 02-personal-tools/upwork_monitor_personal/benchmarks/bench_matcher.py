@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+キーワードマッチベンチマーク
+キーワード毎の部分文字列走査 vs SkillMatcher (1パス) - キーワード数を増やした時のコスト比較
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from skill_matcher import SkillMatcher
+from synthetic_jobs import generate_jobs
+
+def run_benchmark(n, sizes):
+    texts = [f"{job.title} {job.description}" for job in generate_jobs(n)]
+    results = []
+
+    for size in sizes:
+        keywords = ["python", "ai", "machine learning", "wsl", "linux", "automation", "data"]
+        keywords += [f"skill{i}" for i in range(size - len(keywords))]
+
+        start = time.perf_counter()
+        for text in texts:
+            lowered = text.lower()
+            sum(1 for k in keywords if k in lowered)
+        scan_sec = time.perf_counter() - start
+
+        matcher = SkillMatcher(keywords)
+        start = time.perf_counter()
+        for text in texts:
+            matcher.count(text)
+        matcher_sec = time.perf_counter() - start
+
+        results.append({
+            "keywords": size,
+            "scan_texts_per_sec": round(n / scan_sec),
+            "matcher_texts_per_sec": round(n / matcher_sec)
+        })
+
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Keyword matching benchmark')
+    parser.add_argument('--jobs', type=int, default=20000, help='Number of job texts')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[7, 50, 200, 500], help='Keyword list sizes')
+
+    args = parser.parse_args()
+    print(json.dumps(run_benchmark(args.jobs, args.sizes), indent=2))
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+メール通知ベンチマーク
+アラート毎の同期送信 (毎回接続) vs MailDispatcher (キュー・ダイジェスト集約・接続再利用)
+ローカルSMTPスタンドイン使用・オフライン実行
+"""
+
+import argparse
+import json
+import os
+import smtplib
+import sys
+import time
+from email.mime.text import MIMEText
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from mail_dispatcher import MailDispatcher
+from smtp_server import SMTPStandIn
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))] if values else None
+
+def summarize(blocking, latencies, server, seconds):
+    return {
+        "seconds": round(seconds, 3),
+        "caller_blocked_ms_p50": round(percentile(blocking, 0.5) * 1000, 3),
+        "caller_blocked_ms_p95": round(percentile(blocking, 0.95) * 1000, 3),
+        "delivery_latency_ms_p50": round(percentile(latencies, 0.5) * 1000, 1),
+        "delivery_latency_ms_p95": round(percentile(latencies, 0.95) * 1000, 1),
+        "messages": len(server.messages),
+        "connections": server.connections
+    }
+
+def run_direct(alerts, interval, connect_latency, data_latency):
+    """アラート毎に接続して同期送信 (呼び出し側が送信完了まで停止)"""
+    with SMTPStandIn(connect_latency, data_latency) as server:
+        host, port = server.address
+        blocking = []
+        start = time.perf_counter()
+        for i in range(alerts):
+            sent = time.perf_counter()
+            msg = MIMEText(f"alert {i}", 'plain', 'utf-8')
+            with smtplib.SMTP(host, port) as smtp:
+                smtp.send_message(msg, "monitor@example.com", ["me@example.com"])
+            blocking.append(time.perf_counter() - sent)
+            time.sleep(interval)
+        return summarize(blocking, blocking, server, time.perf_counter() - start)
+
+def run_dispatcher(alerts, interval, connect_latency, data_latency, window):
+    """キュー投入のみ (集約・送信はワーカー)"""
+    with SMTPStandIn(connect_latency, data_latency) as server:
+        host, port = server.address
+        dispatcher = MailDispatcher({"smtp_host": host, "smtp_port": port, "starttls": False,
+                                     "from_addr": "monitor@example.com", "to_addrs": ["me@example.com"],
+                                     "digest_window": window, "max_batch": alerts})
+        blocking = []
+        start = time.perf_counter()
+        for i in range(alerts):
+            sent = time.perf_counter()
+            dispatcher.submit(f"alert {i}")
+            blocking.append(time.perf_counter() - sent)
+            time.sleep(interval)
+        dispatcher.close()
+        return summarize(blocking, dispatcher.latencies, server, time.perf_counter() - start)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Email notification benchmark (direct vs dispatcher)')
+    parser.add_argument('--alerts', type=int, default=200, help='Number of alerts')
+    parser.add_argument('--interval', type=float, default=0.005, help='Seconds between alerts')
+    parser.add_argument('--connect-latency', type=float, default=0.05, help='Simulated connect/handshake latency (sec)')
+    parser.add_argument('--data-latency', type=float, default=0.01, help='Simulated message accept latency (sec)')
+    parser.add_argument('--window', type=float, default=0.25, help='Digest window (sec)')
+
+    args = parser.parse_args()
+    results = {
+        "alerts": args.alerts,
+        "direct": run_direct(args.alerts, args.interval, args.connect_latency, args.data_latency),
+        "dispatcher": run_dispatcher(args.alerts, args.interval, args.connect_latency,
+                                     args.data_latency, args.window)
+    }
+    print(json.dumps(results, indent=2))
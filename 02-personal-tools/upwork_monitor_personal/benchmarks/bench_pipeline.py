@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Upwork監視パイプライン 負荷ベンチマーク
+合成案件 1e3〜1e6 件で 採点・保存/読込・レポート生成・通知チェック の処理時間とピークメモリを計測 (JSON出力)
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from scraper import UpworkScraper
+from analyzer import UpworkAnalyzer
+from notifier import UpworkNotifier
+from job_store import JobStore
+from synthetic_jobs import generate_jobs
+
+def measure(func, memory=True):
+    """処理時間 (計測なし実行) とピークメモリ (tracemalloc下で再実行) を計測"""
+    start = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - start
+
+    peak_mb = None
+    if memory:
+        tracemalloc.start()
+        func()
+        peak_mb = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        tracemalloc.stop()
+
+    return result, {"seconds": round(seconds, 4),
+                    "peak_mb": round(peak_mb, 2) if peak_mb is not None else None}
+
+def run_stages(n, backend, seed, memory):
+    """1規模・1保存方式の全ステージ計測 (一時ディレクトリで実行)"""
+    jobs = generate_jobs(n, seed=seed)
+    stages = {}
+
+    with tempfile.TemporaryDirectory() as workdir:
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        store = None
+        try:
+            if backend == "sqlite":
+                store = JobStore("data/jobs.db")
+            scraper = UpworkScraper("missing_settings.json", store=store)
+            notifier = UpworkNotifier(store=store)
+
+            def score():
+                for job in jobs:
+                    job.takawasi_score = scraper.calculate_takawasi_score(job)
+
+            _, stages["calculate_takawasi_score"] = measure(score, memory)
+            _, stages["save_jobs"] = measure(lambda: scraper.save_jobs(jobs), memory)
+            _, stages["load_jobs"] = measure(scraper.load_jobs, memory)
+            # 集計キャッシュが効かないよう毎回新しいAnalyzerで計測
+            _, stages["generate_report"] = measure(
+                lambda: UpworkAnalyzer(store=store).generate_report(), memory)
+            matches, stages["check_high_score_jobs"] = measure(notifier.check_high_score_jobs, memory)
+        finally:
+            if store is not None:
+                store.close()
+            os.chdir(cwd)
+
+    return {"jobs": n, "backend": backend, "high_score_jobs": len(matches), "stages": stages}
+
+def run_benchmark(sizes, backends, seed=42, memory=True):
+    results = []
+    for n in sizes:
+        for backend in backends:
+            print(f"⏳ {n} jobs / {backend}", file=sys.stderr)
+            results.append(run_stages(n, backend, seed, memory))
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "memory_measured": memory
+        },
+        "results": results
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Upwork monitor pipeline load benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help='Job counts (e.g. 1000 10000 100000 1000000)')
+    parser.add_argument('--backends', nargs='+', default=['json', 'sqlite'], choices=['json', 'sqlite'])
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--no-memory', action='store_true', help='Skip tracemalloc peak memory pass')
+    parser.add_argument('--output', help='Write JSON results to this file')
+
+    args = parser.parse_args()
+
+    # 各ステージの進捗表示は抑制 (stdoutはJSON出力専用)
+    real_stdout = sys.stdout
+    sys.stdout = open(os.devnull, 'w')
+    try:
+        results = run_benchmark(args.sizes, args.backends, args.seed, not args.no_memory)
+    finally:
+        sys.stdout.close()
+        sys.stdout = real_stdout
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    print(output)
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+スコア計算ベンチマーク
+calculate_takawasi_score (1件ずつ) vs score_batch (配列一括)
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from scraper import UpworkScraper
+from batch_scorer import score_batch, to_frame
+from synthetic_jobs import generate_jobs
+
+def run_benchmark(n):
+    scraper = UpworkScraper("missing_settings.json")
+    jobs = generate_jobs(n)
+    df = to_frame(jobs)
+
+    start = time.perf_counter()
+    scalar = [scraper.calculate_takawasi_score(job) for job in jobs]
+    scalar_sec = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = score_batch(df)
+    batch_sec = time.perf_counter() - start
+
+    return {
+        "jobs": n,
+        "scalar_jobs_per_sec": round(n / scalar_sec),
+        "batch_jobs_per_sec": round(n / batch_sec),
+        "speedup": round(scalar_sec / batch_sec, 1),
+        "parity": bool((batch == scalar).all())
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='takawasi score throughput benchmark')
+    parser.add_argument('--jobs', type=int, default=100000, help='Number of jobs')
+
+    args = parser.parse_args()
+    print(json.dumps(run_benchmark(args.jobs), indent=2))
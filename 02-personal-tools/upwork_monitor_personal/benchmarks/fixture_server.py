@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+ローカル検索結果フィクスチャサーバー
+オフラインでの収集ベンチマーク・テスト用 (応答遅延を再現)
+"""
+
+import hashlib
+import html
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+SEARCH_PATH = "/nx/search/jobs/"
+
+def render_search_page(keyword, page, jobs_per_page=10):
+    """検索結果ページHTML生成 (キーワード・ページから決定的に生成)"""
+    slug = keyword.replace(" ", "-")
+    tiles = []
+
+    for i in range(jobs_per_page):
+        n = page * 100 + i
+        budget_type = "hourly" if n % 2 else "fixed"
+        budget_amount = 40 + (n * 7) % 180 if budget_type == "hourly" else 150 + (n * 53) % 3000
+        tiles.append(f"""
+<article class="job-tile" data-job-id="{slug}_{page}_{i}" data-budget-type="{budget_type}"
+         data-budget-amount="{budget_amount}" data-proposals="{n % 30}"
+         data-client-rating="{3.5 + (n % 15) / 10:.1f}" data-client-spent="{n * 250}"
+         data-posted="2025-07-03">
+  <h2 class="job-title">{html.escape(keyword.title())} project #{n}</h2>
+  <p class="job-description">Looking for a {html.escape(keyword)} expert. Python and automation experience preferred.</p>
+  <span class="job-skill">{html.escape(keyword.title())}</span>
+  <span class="job-skill">Python</span>
+  <span class="client-location">United States</span>
+</article>""")
+
+    return f"<html><body><section class=\"results\">{''.join(tiles)}</section></body></html>"
+
+class FixtureServer:
+    def __init__(self, latency=0.05, jobs_per_page=10, port=0):
+        self.latency = latency
+        self.jobs_per_page = jobs_per_page
+        self.port = port
+        self.requests = 0
+        self.not_modified = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    def _handler(self):
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlsplit(self.path)
+                if url.path != SEARCH_PATH:
+                    self.send_error(404)
+                    return
+
+                with fixture._lock:
+                    fixture.requests += 1
+                    fixture.in_flight += 1
+                    fixture.peak_in_flight = max(fixture.peak_in_flight, fixture.in_flight)
+                try:
+                    time.sleep(fixture.latency)
+                    query = parse_qs(url.query)
+                    body = render_search_page(query.get("q", [""])[0],
+                                              int(query.get("page", ["1"])[0]),
+                                              fixture.jobs_per_page).encode("utf-8")
+                finally:
+                    with fixture._lock:
+                        fixture.in_flight -= 1
+
+                # ETagによる条件付きリクエスト対応
+                etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    with fixture._lock:
+                        fixture.not_modified += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    @property
+    def search_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{SEARCH_PATH}"
+
+    def start(self):
+        """バックグラウンドで起動"""
+        self._server = ThreadingHTTPServer(("127.0.0.1", self.port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+if __name__ == "__main__":
+    with FixtureServer() as server:
+        print(f"🧪 フィクスチャサーバー起動: {server.search_url}")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+ローカルSMTPスタンドインサーバー
+メール通知のテスト・ベンチマーク用 (接続・受信遅延と一時エラーを再現、受信内容を記録)
+"""
+
+import socketserver
+import threading
+import time
+
+class SMTPStandIn:
+    def __init__(self, connect_latency=0.0, data_latency=0.0, fail_first=0, port=0):
+        self.connect_latency = connect_latency  # 接続確立 (TLSハンドシェイク等) の遅延
+        self.data_latency = data_latency        # メッセージ受理までの遅延
+        self.fail_first = fail_first            # 最初のN回の MAIL FROM に 451 を返す
+        self.port = port
+        self.messages = []
+        self.received_at = []
+        self.connections = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    def _handler(self):
+        stand_in = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def reply(self, line):
+                self.wfile.write(line.encode("ascii") + b"\r\n")
+                self.wfile.flush()
+
+            def handle(self):
+                with stand_in._lock:
+                    stand_in.connections += 1
+                time.sleep(stand_in.connect_latency)
+                self.reply("220 localhost SMTP stand-in")
+
+                while True:
+                    line = self.rfile.readline()
+                    if not line:
+                        return
+                    command = line.decode("ascii", "replace").strip()
+                    verb = command.split(" ", 1)[0].upper()
+
+                    if verb == "EHLO":
+                        self.reply("250-localhost")
+                        self.reply("250 8BITMIME")
+                    elif verb == "MAIL":
+                        with stand_in._lock:
+                            reject = stand_in.fail_first > 0
+                            if reject:
+                                stand_in.fail_first -= 1
+                                stand_in.rejected += 1
+                        self.reply("451 Temporary failure" if reject else "250 OK")
+                    elif verb == "DATA":
+                        self.reply("354 End data with <CR><LF>.<CR><LF>")
+                        self.receive_data()
+                    elif verb == "QUIT":
+                        self.reply("221 Bye")
+                        return
+                    elif verb in ("HELO", "RCPT", "RSET", "NOOP"):
+                        self.reply("250 OK")
+                    else:
+                        self.reply("502 Command not implemented")
+
+            def receive_data(self):
+                lines = []
+                while True:
+                    line = self.rfile.readline()
+                    if not line or line in (b".\r\n", b".\n"):
+                        break
+                    lines.append(line[1:] if line.startswith(b"..") else line)
+                time.sleep(stand_in.data_latency)
+                with stand_in._lock:
+                    stand_in.messages.append(b"".join(lines))
+                    stand_in.received_at.append(time.perf_counter())
+                self.reply("250 Message accepted")
+
+        return Handler
+
+    @property
+    def address(self):
+        return self._server.server_address[:2]
+
+    def start(self):
+        """バックグラウンドで起動"""
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", self.port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+if __name__ == "__main__":
+    with SMTPStandIn() as server:
+        print(f"🧪 SMTPスタンドイン起動: {server.address[0]}:{server.address[1]}")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+合成案件データ生成
+シード固定で再現可能な UpworkJob を 1e3〜1e6 件規模で生成 (負荷ベンチマーク・テスト用)
+"""
+
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from scraper import UpworkJob
+
+TITLE_WORDS = ["python", "ai", "machine learning", "wsl", "linux", "automation", "data",
+               "react", "design", "marketing", "api", "scraping", "maintain", "email",
+               "dashboard", "pipeline", "bot", "integration", "analysis", "database"]
+SKILLS = ["Python", "Machine Learning", "AI", "Linux", "WSL", "Automation", "Data Analysis",
+          "Pandas", "Web Scraping", "BeautifulSoup", "TensorFlow", "React", "SQL", "Docker", "AWS"]
+LOCATIONS = ["United States", "United Kingdom", "Canada", "Australia", "Germany",
+             "Japan", "India", "France", "Netherlands", "Singapore"]
+
+def generate_jobs(n, seed=42, days=365, end=date(2025, 7, 3)):
+    """合成案件生成 (同じ n・seed なら同じ結果)"""
+    rng = random.Random(seed)
+    posted_dates = [(end - timedelta(days=d)).isoformat() for d in range(days)]
+    jobs = []
+
+    for i in range(n):
+        budget_type = "hourly" if rng.random() < 0.55 else "fixed"
+        if budget_type == "hourly":
+            budget_amount = float(round(min(max(rng.lognormvariate(4.0, 0.5), 5), 400)))
+        else:
+            budget_amount = float(round(min(max(rng.lognormvariate(6.3, 1.0), 20), 50000), -1))
+
+        jobs.append(UpworkJob(
+            id=f"job_{seed}_{i}",
+            title=" ".join(rng.choices(TITLE_WORDS, k=4)),
+            description=" ".join(rng.choices(TITLE_WORDS, k=20)),
+            budget_type=budget_type,
+            budget_amount=budget_amount,
+            skills=rng.sample(SKILLS, rng.randint(2, 5)),
+            posted=rng.choice(posted_dates),
+            proposals=min(int(rng.expovariate(1 / 12)), 80),
+            client_rating=round(rng.uniform(3.0, 5.0), 1),
+            client_spent=float(rng.randint(0, 100000)),
+            client_location=rng.choice(LOCATIONS)
+        ))
+
+    return jobs
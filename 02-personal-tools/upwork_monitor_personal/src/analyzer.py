@@ -4,119 +4,221 @@ Upwork案件分析システム
 データ分析・トレンド・レポート生成
 """
 
-import json
 import pandas as pd
 import matplotlib.pyplot as plt
 from datetime import datetime, timedelta
 from collections import Counter
 import os
 
+from report_aggregates import ReportAggregator
+from report_renderer import render_report, report_data
+from job_stream import iter_jobs
+from job_context import file_version
+from rollups import JobRollups, ALL_KEYWORDS
+from quantile_sketch import rank_error, DEFAULT_K
+from scoring_rules import ScoringRulesLoader
+
+# 集計に必要な列 (説明文・スキルは読み込まない)
+ANALYSIS_COLUMNS = ["id", "budget_type", "budget_amount", "proposals", "takawasi_score"]
+# JSON読み込み時は注目案件の表示列も同じ1パスで取り出す
+REPORT_COLUMNS = ANALYSIS_COLUMNS + ["title", "client_location"]
+
+# スケッチモードで返す分位点
+SKETCH_QUANTILES = (0.5, 0.9, 0.99)
+
 class UpworkAnalyzer:
-    def __init__(self):
+    def __init__(self, store=None, stats_mode="exact", context=None, scoring=None, sketch_k=DEFAULT_K):
         self.data_file = "data/jobs.json"
+        self.store = store
+        self.context = context
+        # 高スコアの閾値は score_thresholds.high_priority (設定更新時は次回集計で反映)
+        self.scoring = scoring or ScoringRulesLoader()
+        self.rules = self.scoring.current()
+        self.aggregator = ReportAggregator(high_score=self.rules.high_priority)
+        # 日別スケッチは収集側と同じ k で合算 (異なる k だと再圧縮され誤差上限も一致しない)
+        self.rollups = JobRollups(store, sketch_k=sketch_k) if store is not None else None
+        # exact: pandasで厳密集計 / sketch: 日別スケッチの合算 (SQLite保存時のみ)
+        self.stats_mode = stats_mode if self.rollups is not None else "exact"
         
     def load_data(self):
-        """データ読み込み"""
-        try:
-            with open(self.data_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            return pd.DataFrame(data['jobs'])
-        except FileNotFoundError:
+        """データ読み込み (共有コンテキストがあれば同じ版数のデータを再利用)"""
+        if self.store is not None:
+            if self.context is None:
+                return self.store.to_dataframe(ANALYSIS_COLUMNS)
+            return self.context.get_or_load("frame", self.store.version(),
+                                            lambda: self.store.to_dataframe(ANALYSIS_COLUMNS))
+        
+        version = self.data_version()
+        if version is None:
             print(f"⚠️  データファイルが見つかりません: {self.data_file}")
             return pd.DataFrame()
+        
+        if self.context is not None:
+            return self.context.get_or_load("frame", version, lambda: self._to_frame(
+                self.context.get_or_load("jobs", version, lambda: list(iter_jobs(self.data_file)))))
+        
+        # 必要な列のみをストリーミングで取り出す (ファイル全体・説明文は保持しない)
+        return self._to_frame(iter_jobs(self.data_file))
+    
+    def _to_frame(self, jobs):
+        """案件辞書 → 集計用DataFrame (REPORT_COLUMNS のみ)"""
+        columns = {key: [] for key in REPORT_COLUMNS}
+        for job in jobs:
+            for key, values in columns.items():
+                values.append(job[key])
+        return pd.DataFrame(columns) if columns['id'] else pd.DataFrame()
     
     def analyze_price_trends(self, df):
         """価格動向分析"""
         if df.empty:
             return {}
-            
-        # 時間単価案件の分析
-        hourly_jobs = df[df['budget_type'] == 'hourly']
-        fixed_jobs = df[df['budget_type'] == 'fixed']
-        
-        analysis = {
-            "hourly_stats": {
-                "count": len(hourly_jobs),
-                "avg_rate": hourly_jobs['budget_amount'].mean() if len(hourly_jobs) > 0 else 0,
-                "median_rate": hourly_jobs['budget_amount'].median() if len(hourly_jobs) > 0 else 0,
-                "max_rate": hourly_jobs['budget_amount'].max() if len(hourly_jobs) > 0 else 0,
-                "min_rate": hourly_jobs['budget_amount'].min() if len(hourly_jobs) > 0 else 0
-            },
-            "fixed_stats": {
-                "count": len(fixed_jobs),
-                "avg_budget": fixed_jobs['budget_amount'].mean() if len(fixed_jobs) > 0 else 0,
-                "median_budget": fixed_jobs['budget_amount'].median() if len(fixed_jobs) > 0 else 0,
-                "max_budget": fixed_jobs['budget_amount'].max() if len(fixed_jobs) > 0 else 0,
-                "min_budget": fixed_jobs['budget_amount'].min() if len(fixed_jobs) > 0 else 0
-            }
-        }
         
-        return analysis
+        if self.stats_mode == "sketch":
+            trends = self.sketch_price_trends()
+            return {"hourly_stats": trends["hourly_stats"], "fixed_stats": trends["fixed_stats"]}
+        
+        return self.aggregator.compute(df).price_trends()
+    
+    def sketch_price_trends(self, since=None, until=None):
+        """日別スケッチを合算した単価・提案数の分位点 (期間の長さによらず一定メモリ)"""
+        if self.rollups is None:
+            return {}
+        
+        trends = {}
+        for key, metric, suffix in (("hourly_stats", "hourly_rate", "rate"),
+                                    ("fixed_stats", "fixed_budget", "budget"),
+                                    ("proposal_stats", "proposals", "proposals")):
+            sketch = self.rollups.merged_sketch(metric, since, until)
+            p50, p90, p99 = sketch.quantiles(SKETCH_QUANTILES)
+            trends[key] = {
+                "count": sketch.count,
+                f"avg_{suffix}": sketch.mean() or 0,
+                f"median_{suffix}": p50 or 0,
+                f"p90_{suffix}": p90 or 0,
+                f"p99_{suffix}": p99 or 0,
+                f"max_{suffix}": sketch.max or 0,
+                f"min_{suffix}": sketch.min or 0,
+                "exact": sketch.exact
+            }
+        trends["rank_error"] = rank_error(self.rollups.sketch_k)
+        return trends
     
     def analyze_competition(self, df):
         """競合状況分析"""
         if df.empty:
             return {}
-            
-        return {
-            "avg_proposals": df['proposals'].mean(),
-            "median_proposals": df['proposals'].median(), 
-            "low_competition": len(df[df['proposals'] < 5]),  # 提案5件未満
-            "high_competition": len(df[df['proposals'] > 20]),  # 提案20件超
-            "total_jobs": len(df)
-        }
+        
+        return self.aggregator.compute(df).competition
     
-    def get_top_opportunities(self, df, min_score=70, limit=10):
+    def get_top_opportunities(self, df, min_score=None, limit=10):
         """注目案件抽出"""
         if df.empty:
             return []
+        
+        if min_score is None:
+            min_score = self.rules.high_priority
+        if self.store is not None:
+            return self.store.high_score_jobs(min_score, limit=limit)
             
         top_jobs = df[df['takawasi_score'] >= min_score].nlargest(limit, 'takawasi_score')
         return top_jobs.to_dict('records')
     
+    def data_version(self):
+        """データ版数 (ストアは件数・最終更新時刻、JSONはファイルの更新時刻・サイズ)"""
+        if self.store is not None:
+            return self.store.version()
+        return file_version(self.data_file)
+    
+    def refresh_rules(self):
+        """採点ルールの更新確認 (閾値が変わったら集計キャッシュを破棄)"""
+        rules = self.scoring.current()
+        if rules is not self.rules:
+            self.rules = rules
+            self.aggregator = ReportAggregator(high_score=rules.high_priority)
+        return rules
+    
+    def compute_stats(self):
+        """レポート集計 (データ版数が変わっていなければキャッシュを再利用)"""
+        self.refresh_rules()
+        version = self.data_version()
+        stats = self.aggregator.cached(version)
+        if stats is not None:
+            return stats
+        
+        df = self.load_data()
+        if df.empty:
+            return None
+        
+        stats = self.aggregator.compute(df, version)
+        stats.top_opportunities = self.get_top_opportunities(df)
+        if self.stats_mode == "sketch":
+            trends = self.sketch_price_trends()
+            stats.hourly_stats, stats.fixed_stats = trends["hourly_stats"], trends["fixed_stats"]
+        return stats
+    
     def generate_report(self):
         """総合レポート生成"""
-        df = self.load_data()
+        stats = self.compute_stats()
         
-        if df.empty:
+        if stats is None:
             return "データが見つかりません"
-            
-        # 各種分析実行
-        price_analysis = self.analyze_price_trends(df)
-        competition_analysis = self.analyze_competition(df) 
-        top_opportunities = self.get_top_opportunities(df)
         
-        # レポート生成
+        return self.format_report(stats)
+    
+    def format_report(self, stats):
+        """集計結果 → テキストレポート"""
+        return render_report(report_data(stats), "text")
+    
+    def analyze_historical_trends(self, period="weekly", months=6, keyword=ALL_KEYWORDS):
+        """長期トレンド (ロールアップ表から最新データ基準で months ヶ月分)"""
+        if self.rollups is None:
+            return pd.DataFrame()
+        
+        latest = self.rollups.latest_period(period)
+        if latest is None:
+            return pd.DataFrame()
+        
+        since = latest - timedelta(days=months * 30)
+        return self.rollups.trends(period, since, keyword)
+    
+    def generate_trend_report(self, period="weekly", months=6):
+        """長期トレンドレポート生成"""
+        if self.rollups is None:
+            return "トレンド分析はSQLite保存 (storage.backend: sqlite) でのみ利用できます"
+        
+        trends = self.analyze_historical_trends(period, months)
+        if trends.empty:
+            return "ロールアップデータが見つかりません"
+        
+        since = datetime.fromisoformat(trends['period_start'].iloc[0]).date()
+        label = "週" if period == "weekly" else "日"
+        
         report = f"""
-🎯 Upwork案件分析レポート
+📈 Upwork案件 長期トレンド ({months}ヶ月 / {label}次)
 Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-📊 概要
-- 総案件数: {len(df)}
-- 高スコア案件 (70点以上): {len(df[df['takawasi_score'] >= 70])}
-- 平均スコア: {df['takawasi_score'].mean():.1f}点
-
-💰 価格動向
-時間単価案件 ({price_analysis['hourly_stats']['count']}件):
-- 平均時給: ${price_analysis['hourly_stats']['avg_rate']:.0f}
-- 中央値: ${price_analysis['hourly_stats']['median_rate']:.0f}
-- 範囲: ${price_analysis['hourly_stats']['min_rate']:.0f} - ${price_analysis['hourly_stats']['max_rate']:.0f}
-
-固定価格案件 ({price_analysis['fixed_stats']['count']}件):
-- 平均予算: ${price_analysis['fixed_stats']['avg_budget']:.0f}
-- 中央値: ${price_analysis['fixed_stats']['median_budget']:.0f}
-
-🏁 競合状況
-- 平均提案数: {competition_analysis['avg_proposals']:.1f}件
-- 低競合案件 (<5提案): {competition_analysis['low_competition']}件
-- 高競合案件 (>20提案): {competition_analysis['high_competition']}件
-
-🎯 注目案件 TOP 5:
 """
+        for budget_type, unit in (("hourly", "時給"), ("fixed", "予算")):
+            rows = trends[trends['budget_type'] == budget_type]
+            report += f"\n💰 {unit}推移 ({budget_type}):\n"
+            for row in rows.itertuples():
+                report += (f"{row.period_start} | {row.jobs:4d}件 | 中央値 ${row.amount_p50:.0f} "
+                           f"(p25 ${row.amount_p25:.0f} - p90 ${row.amount_p90:.0f}) | "
+                           f"提案 {row.proposals_avg:.1f} | スコア {row.score_avg:.1f} "
+                           f"(80+: {row.score_notify})\n")
         
-        for i, job in enumerate(top_opportunities[:5], 1):
-            report += f"{i}. [{job['takawasi_score']:.1f}点] {job['title']}\n"
-            report += f"   ${job['budget_amount']:.0f}/{job['budget_type']} | {job['proposals']}提案 | {job['client_location']}\n\n"
+        sketches = self.sketch_price_trends(since)
+        report += f"\n📐 期間分位点 (日別スケッチ合算・順位誤差 ±{sketches['rank_error'] * 100:.1f}%):\n"
+        for key, label, suffix, unit in (("hourly_stats", "時給", "rate", "$"),
+                                         ("fixed_stats", "固定予算", "budget", "$"),
+                                         ("proposal_stats", "提案数", "proposals", "")):
+            stats = sketches[key]
+            report += (f"- {label} ({stats['count']}件): p50 {unit}{stats[f'median_{suffix}']:.0f} / "
+                       f"p90 {unit}{stats[f'p90_{suffix}']:.0f} / p99 {unit}{stats[f'p99_{suffix}']:.0f}\n")
+        
+        report += "\n🔑 キーワード別案件数:\n"
+        for keyword, jobs in self.rollups.keyword_totals(period, since).items():
+            if keyword != ALL_KEYWORDS:
+                report += f"- {keyword}: {jobs}件\n"
         
         return report
     
@@ -130,7 +232,16 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
         print(f"✅ レポート保存完了: {filename}")
 
 if __name__ == "__main__":
-    analyzer = UpworkAnalyzer()
+    from scraper import load_settings
+    from job_store import open_job_store
+    
+    # 単体実行時も main.py と同じく設定ファイルの閾値・集計設定を使用
+    settings = load_settings()
+    analysis = settings.get("analysis", {})
+    analyzer = UpworkAnalyzer(store=open_job_store(settings),
+                              stats_mode=analysis.get("stats_mode", "exact"),
+                              scoring=ScoringRulesLoader("config/settings.json"),
+                              sketch_k=analysis.get("sketch_k", DEFAULT_K))
     report = analyzer.generate_report()
     print(report)
     analyzer.save_report(report)
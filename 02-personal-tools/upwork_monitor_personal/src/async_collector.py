@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Upwork案件 非同期収集エンジン
+全キーワード×全ページを同時取得 (接続プール上限・ホスト別同時接続数制限付き)
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from http_cache import CachingAdapter
+
+class AsyncCollector:
+    def __init__(self, scraper, max_connections=16, per_host_limit=8):
+        self.scraper = scraper
+        self.max_connections = max_connections
+        self.per_host_limit = per_host_limit
+        self.session = self._build_session()
+        self.stats = {"requests": 0, "errors": 0, "elapsed": 0.0}
+
+    def _build_session(self):
+        """共有セッション作成 (接続プールをmax_connectionsで固定)"""
+        session = requests.Session()
+        session.headers.update(self.scraper.session.headers)
+
+        pool = dict(pool_connections=self.max_connections,
+                    pool_maxsize=self.max_connections,
+                    pool_block=True)
+        if self.scraper.http_cache is not None:
+            adapter = CachingAdapter(self.scraper.http_cache, **pool)
+        else:
+            adapter = HTTPAdapter(**pool)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _host_limit(self, url):
+        """ホスト別セマフォ取得"""
+        host = urlsplit(url).netloc
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_semaphores[host]
+
+    async def _fetch(self, executor, keyword, page):
+        """1ページ取得 (取得・解析はワーカースレッドで実行)"""
+        loop = asyncio.get_running_loop()
+
+        async with self._global_limit, self._host_limit(self.scraper.search_url):
+            self.stats["requests"] += 1
+            try:
+                return await loop.run_in_executor(
+                    executor, self.scraper.fetch_search_page, keyword, page, self.session)
+            except requests.RequestException as e:
+                self.stats["errors"] += 1
+                print(f"⚠️  取得失敗: {keyword} p{page} ({e})")
+                return []
+
+    async def collect(self, keywords):
+        """全キーワード同時取得 (結果はキーワード・ページ順)"""
+        self._global_limit = asyncio.Semaphore(self.max_connections)
+        self._host_semaphores = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_connections) as executor:
+            tasks = [self._fetch(executor, keyword, page)
+                     for keyword in keywords
+                     for page in range(1, self.scraper.pages_per_keyword + 1)]
+            pages = await asyncio.gather(*tasks)
+
+        return self.scraper.merge_jobs(pages)
+
+    def run(self, keywords):
+        """同期呼び出し用エントリポイント"""
+        start = time.perf_counter()
+        try:
+            jobs = asyncio.run(self.collect(keywords))
+        finally:
+            self.session.close()
+        self.stats["elapsed"] = time.perf_counter() - start
+
+        print(f"⚡ 非同期収集: {self.stats['requests']}リクエスト "
+              f"({self.stats['errors']}件失敗) {self.stats['elapsed']:.2f}秒")
+        return jobs
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+takawasiスコア 一括計算エンジン
+列指向の案件バッチ (DataFrame) を配列演算でまとめて採点 (履歴再採点用)
+"""
+
+from dataclasses import asdict
+
+import numpy as np
+import pandas as pd
+
+from scoring_rules import default_rules
+from job_batch import JobBatch
+
+def to_frame(jobs):
+    """UpworkJobリスト・列辞書・JobBatch・DataFrameをDataFrameに統一"""
+    if isinstance(jobs, pd.DataFrame):
+        return jobs
+    if isinstance(jobs, JobBatch):
+        return jobs.to_dataframe(include_skills=False)
+    if isinstance(jobs, dict):
+        return pd.DataFrame(jobs)
+    return pd.DataFrame([asdict(job) for job in jobs])
+
+def score_components(jobs, rules=None):
+    """4項目のスコアを配列で計算 (calculate_takawasi_scoreと同じ採点ルール)"""
+    rules = rules or default_rules()
+    df = to_frame(jobs)
+    return rules.score_components(
+        (df['title'] + " " + df['description']).tolist(),
+        (df['budget_type'] == 'hourly').to_numpy(),
+        df['budget_amount'].to_numpy(dtype=np.float64),
+        df['proposals'].to_numpy(dtype=np.int64),
+        df['client_rating'].to_numpy(dtype=np.float64))
+
+def score_batch(jobs, rules=None):
+    """takawasi適合度スコア一括計算 (100点満点)"""
+    rules = rules or default_rules()
+    return rules.score_array(score_components(jobs, rules))
+
+def apply_scores(jobs, rules=None):
+    """UpworkJobリストにスコアを一括設定"""
+    if not jobs:
+        return jobs
+
+    for job, score in zip(jobs, score_batch(jobs, rules)):
+        job.takawasi_score = float(score)
+    return jobs
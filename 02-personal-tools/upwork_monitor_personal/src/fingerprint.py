@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+案件フィンガープリント・変更検知
+タイトル・説明・予算・提案数の正規化ハッシュで新規/変更案件のみを抽出
+"""
+
+import hashlib
+import re
+
+WHITESPACE = re.compile(r"\s+")
+
+def _normalize_text(text):
+    return WHITESPACE.sub(" ", text).strip().lower()
+
+def job_fingerprint(job):
+    """案件フィンガープリント (正規化した内容のSHA-1)"""
+    if isinstance(job, dict):
+        fields = (job['title'], job['description'], job['budget_type'],
+                  job['budget_amount'], job['proposals'])
+    else:
+        fields = (job.title, job.description, job.budget_type,
+                  job.budget_amount, job.proposals)
+
+    title, description, budget_type, budget_amount, proposals = fields
+    normalized = "\x1f".join([
+        _normalize_text(title),
+        _normalize_text(description),
+        budget_type.lower(),
+        f"{float(budget_amount):.2f}",
+        str(int(proposals))
+    ])
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+class ChangeDetector:
+    def __init__(self, store=None):
+        self.store = store
+        self.known = {}  # ストア未使用時: 案件ID → (フィンガープリント, スコア)
+
+    def split(self, jobs):
+        """新規・変更案件と未変更案件に分割 (未変更案件には保存済みスコアを復元)"""
+        if self.store is not None:
+            known = self.store.fingerprints([job.id for job in jobs])
+        else:
+            known = self.known
+
+        changed, unchanged = [], []
+        for job in jobs:
+            previous = known.get(job.id)
+            if previous and previous[0] == job_fingerprint(job):
+                job.takawasi_score = previous[1]
+                unchanged.append(job)
+            else:
+                changed.append(job)
+        return changed, unchanged
+
+    def commit(self, jobs):
+        """処理済み案件のフィンガープリント記録 (ストア使用時はupsert時に保存済み)"""
+        if self.store is None:
+            for job in jobs:
+                self.known[job.id] = (job_fingerprint(job), job.takawasi_score)
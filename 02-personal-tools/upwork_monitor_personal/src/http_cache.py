@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+HTTP条件付きリクエスト・レスポンスキャッシュ
+ETag / Last-Modified を保存して If-None-Match / If-Modified-Since を送信し、304はディスクから応答
+(requests.Session に mount するトランスポートアダプター・LRU容量制限付き)
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# 保存・復元するヘッダー (検証子と Content-Type のみ・Set-Cookie や Content-Encoding は保存しない)
+STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+# このCache-Control指定のレスポンスは保存しない
+NO_STORE_DIRECTIVES = {"no-store", "private"}
+
+def cache_directives(headers):
+    """Cache-Control の指定名 (小文字・値は除く)"""
+    return {directive.split("=", 1)[0].strip().lower()
+            for directive in headers.get("Cache-Control", "").split(",") if directive.strip()}
+
+class HTTPCache:
+    def __init__(self, cache_dir="data/http_cache", max_bytes=100 * 1024 * 1024, save_every=50):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.save_every = save_every  # インデックスはこの件数の変更毎に書き出し (残りは flush で保存)
+        self.index_file = os.path.join(cache_dir, "index.json")
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        self._dirty = 0  # 未保存のインデックス変更数 (保存・LRU順の更新)
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self.entries = self._load_index()  # URL → メタデータ (古い順 = LRU順)
+        self._remove_orphans()
+
+    def _load_index(self):
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                return OrderedDict(json.load(f))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return OrderedDict()
+
+    def _save_index(self):
+        self._dirty = 0
+        tmp_file = self.index_file + ".tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(list(self.entries.items()), f)
+        os.replace(tmp_file, self.index_file)
+
+    def _remove_orphans(self):
+        """インデックスにない本文ファイルを削除 (インデックス保存前に終了した分)"""
+        known = {os.path.basename(self._body_path(url)) for url in self.entries}
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".body") and name not in known:
+                os.remove(os.path.join(self.cache_dir, name))
+
+    def _body_path(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".body")
+
+    @property
+    def total_bytes(self):
+        return sum(entry['size'] for entry in self.entries.values())
+
+    def validators(self, url):
+        """条件付きリクエスト用ヘッダー"""
+        with self._lock:
+            entry = self.entries.get(url)
+        if not entry:
+            return {}
+
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def load(self, url):
+        """キャッシュ済みレスポンス (メタデータ, 本文) - 参照でLRU順を更新"""
+        with self._lock:
+            entry = self.entries.get(url)
+            if not entry:
+                return None
+            self.entries.move_to_end(url)
+            self._dirty += 1
+
+        try:
+            with open(self._body_path(url), 'rb') as f:
+                return entry, f.read()
+        except FileNotFoundError:
+            with self._lock:
+                self.entries.pop(url, None)
+                self._dirty += 1
+            return None
+
+    def store(self, url, response):
+        """検証子付きレスポンスの保存 (no-store/private は保存しない・容量超過分は古い順に削除)"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not (etag or last_modified) or len(response.content) > self.max_bytes:
+            return False
+        if cache_directives(response.headers) & NO_STORE_DIRECTIVES:
+            return False
+
+        with open(self._body_path(url), 'wb') as f:
+            f.write(response.content)
+
+        with self._lock:
+            self.entries[url] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "size": len(response.content),
+                "headers": {name: response.headers[name] for name in STORED_HEADERS if name in response.headers}
+            }
+            self.entries.move_to_end(url)
+            self.stats["stores"] += 1
+            self._dirty += 1
+            self._evict()
+            if self._dirty >= self.save_every:
+                self._save_index()
+        return True
+
+    def _evict(self):
+        total = self.total_bytes
+        while total > self.max_bytes and self.entries:
+            url, entry = self.entries.popitem(last=False)
+            total -= entry['size']
+            self.stats["evictions"] += 1
+            try:
+                os.remove(self._body_path(url))
+            except FileNotFoundError:
+                pass
+
+    def flush(self):
+        """LRU順を含めたインデックス保存 (未保存の変更がある場合のみ)"""
+        with self._lock:
+            if self._dirty:
+                self._save_index()
+
+    def record(self, hit):
+        with self._lock:
+            self.stats["hits" if hit else "misses"] += 1
+
+    def hit_rate(self):
+        requests_total = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / requests_total if requests_total else 0.0
+
+class CachingAdapter(HTTPAdapter):
+    def __init__(self, cache, **kwargs):
+        self.cache = cache
+        super().__init__(**kwargs)
+
+    def _cached_response(self, request, entry, body):
+        """キャッシュからレスポンス組み立て"""
+        response = requests.Response()
+        response.status_code = 200
+        response.headers = CaseInsensitiveDict({name: value for name, value in entry['headers'].items()
+                                                if name in STORED_HEADERS})
+        response._content = body
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.reason = "OK"
+        response.from_cache = True
+        return response
+
+    def send(self, request, **kwargs):
+        if request.method != 'GET':
+            return super().send(request, **kwargs)
+
+        added = []
+        for name, value in self.cache.validators(request.url).items():
+            if name not in request.headers:
+                request.headers[name] = value
+                added.append(name)
+
+        response = super().send(request, **kwargs)
+
+        if response.status_code == 304:
+            cached = self.cache.load(request.url)
+            if cached:
+                response.close()
+                self.cache.record(hit=True)
+                return self._cached_response(request, *cached)
+            if added:
+                # 本文ファイルが失われていれば検証子なしで取り直し (空の304を本文として返さない)
+                response.close()
+                for name in added:
+                    del request.headers[name]
+                response = super().send(request, **kwargs)
+
+        self.cache.record(hit=False)
+        if response.status_code == 200:
+            self.cache.store(request.url, response)
+        response.from_cache = False
+        return response
+
+def install_cache(session, cache_dir="data/http_cache", max_bytes=100 * 1024 * 1024, save_every=50,
+                  **adapter_kwargs):
+    """セッションにキャッシュ付きアダプターを設定 (終了時は cache.flush() でインデックスを保存)"""
+    cache = HTTPCache(cache_dir, max_bytes, save_every)
+    adapter = CachingAdapter(cache, **adapter_kwargs)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return cache
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+案件データ コンパクト列指向コンテナ
+__slots__ 版の案件レコードと、型付き配列・インターン済み語彙で保持する JobBatch (大量履歴のメモリ削減用)
+"""
+
+from dataclasses import fields
+
+import numpy as np
+import pandas as pd
+
+from scraper import UpworkJob
+
+JOB_FIELDS = [f.name for f in fields(UpworkJob)]
+
+class JobRecord:
+    """UpworkJob と同じ項目を __slots__ で保持 (インスタンス辞書なし)"""
+    __slots__ = JOB_FIELDS
+
+    def __init__(self, id, title, description, budget_type, budget_amount, skills, posted,
+                 proposals, client_rating, client_spent, client_location, takawasi_score=0.0):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.budget_type = budget_type
+        self.budget_amount = budget_amount
+        self.skills = skills
+        self.posted = posted
+        self.proposals = proposals
+        self.client_rating = client_rating
+        self.client_spent = client_spent
+        self.client_location = client_location
+        self.takawasi_score = takawasi_score
+
+    @classmethod
+    def from_job(cls, job):
+        return cls(*(getattr(job, name) for name in JOB_FIELDS))
+
+    def to_job(self):
+        return UpworkJob(*(getattr(self, name) for name in JOB_FIELDS))
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in JOB_FIELDS}
+
+class Vocabulary:
+    """文字列インターン (文字列 ↔ 整数コード)"""
+
+    def __init__(self, values=()):
+        self.values = []
+        self.codes = {}
+        for value in values:
+            self.code(value)
+
+    def code(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def __len__(self):
+        return len(self.values)
+
+class JobBatch:
+    # 数値列の型
+    NUMERIC = {
+        "budget_amount": np.float64,
+        "proposals": np.int32,
+        "client_rating": np.float64,
+        "client_spent": np.float64,
+        "takawasi_score": np.float64
+    }
+    # 語彙コードで保持する低カーディナリティ列
+    CATEGORICAL = ["budget_type", "posted", "client_location"]
+    # 文字列のまま保持する列
+    TEXT = ["id", "title", "description"]
+
+    def __init__(self, columns, vocabularies, skill_vocab, skill_ids, skill_offsets):
+        self.columns = columns              # 列名 → numpy配列
+        self.vocabularies = vocabularies    # 列名 → Vocabulary
+        self.skill_vocab = skill_vocab      # スキル語彙
+        self.skill_ids = skill_ids          # 全案件のスキルコードを連結 (int32)
+        self.skill_offsets = skill_offsets  # 案件iのスキル = skill_ids[offsets[i]:offsets[i+1]]
+
+    @classmethod
+    def from_jobs(cls, jobs):
+        """UpworkJob / JobRecord / 辞書 のリストから作成"""
+        jobs = [job if isinstance(job, dict) else {name: getattr(job, name) for name in JOB_FIELDS}
+                for job in jobs]
+        n = len(jobs)
+
+        columns = {}
+        for name in cls.TEXT:
+            columns[name] = np.array([job[name] for job in jobs], dtype=object)
+        for name, dtype in cls.NUMERIC.items():
+            columns[name] = np.fromiter((job[name] for job in jobs), dtype=dtype, count=n)
+
+        vocabularies = {}
+        for name in cls.CATEGORICAL:
+            vocab = Vocabulary()
+            columns[name] = np.fromiter((vocab.code(job[name]) for job in jobs), dtype=np.int32, count=n)
+            vocabularies[name] = vocab
+
+        skill_vocab = Vocabulary()
+        skill_offsets = np.zeros(n + 1, dtype=np.int64)
+        skill_ids = []
+        for i, job in enumerate(jobs):
+            skill_ids.extend(skill_vocab.code(skill) for skill in job['skills'])
+            skill_offsets[i + 1] = len(skill_ids)
+
+        return cls(columns, vocabularies, skill_vocab,
+                   np.array(skill_ids, dtype=np.int32), skill_offsets)
+
+    @classmethod
+    def from_dataframe(cls, df):
+        """DataFrameから作成 (数値列・カテゴリ列のコードは可能な限りコピーせず参照)"""
+        columns, vocabularies = {}, {}
+        for name in cls.TEXT:
+            columns[name] = df[name].to_numpy(dtype=object)
+        for name, dtype in cls.NUMERIC.items():
+            columns[name] = df[name].to_numpy(dtype=dtype, copy=False)
+
+        for name in cls.CATEGORICAL:
+            series = df[name]
+            if not isinstance(series.dtype, pd.CategoricalDtype):
+                series = series.astype("category")
+            columns[name] = series.cat.codes.to_numpy(dtype=np.int32, copy=False)
+            vocabularies[name] = Vocabulary(series.cat.categories.tolist())
+
+        skill_vocab = Vocabulary()
+        skill_offsets = np.zeros(len(df) + 1, dtype=np.int64)
+        skill_ids = []
+        if 'skills' in df.columns:
+            for i, skills in enumerate(df['skills']):
+                skill_ids.extend(skill_vocab.code(skill) for skill in skills)
+                skill_offsets[i + 1] = len(skill_ids)
+
+        return cls(columns, vocabularies, skill_vocab,
+                   np.array(skill_ids, dtype=np.int32), skill_offsets)
+
+    def __len__(self):
+        return len(self.columns["id"])
+
+    def skills(self, i):
+        start, end = self.skill_offsets[i], self.skill_offsets[i + 1]
+        return [self.skill_vocab.values[code] for code in self.skill_ids[start:end]]
+
+    def record(self, i):
+        """i番目の案件を JobRecord として取得"""
+        values = {}
+        for name in self.TEXT:
+            values[name] = self.columns[name][i]
+        for name in self.NUMERIC:
+            values[name] = self.columns[name][i].item()
+        for name in self.CATEGORICAL:
+            values[name] = self.vocabularies[name].values[self.columns[name][i]]
+        values['skills'] = self.skills(i)
+        return JobRecord(**values)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.record(i)
+
+    def to_jobs(self):
+        return [record.to_job() for record in self]
+
+    def to_dataframe(self, include_skills=True):
+        """DataFrame化 (数値列は配列を共有・語彙列はCategorical)"""
+        data = {}
+        for name in JOB_FIELDS:
+            if name in self.CATEGORICAL:
+                data[name] = pd.Categorical.from_codes(self.columns[name],
+                                                       categories=self.vocabularies[name].values)
+            elif name == 'skills':
+                if include_skills:
+                    data[name] = [self.skills(i) for i in range(len(self))]
+            else:
+                data[name] = self.columns[name]
+        return pd.DataFrame(data, copy=False)
+
+    def nbytes(self):
+        """列データのメモリ使用量 (文字列本体を除く)"""
+        return (sum(column.nbytes for column in self.columns.values())
+                + self.skill_ids.nbytes + self.skill_offsets.nbytes)
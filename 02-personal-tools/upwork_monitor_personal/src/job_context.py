@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+案件データ共有コンテキスト
+収集・分析・通知の各ステージで読み込み結果をプロセス内共有 (データ版数が変わったら無効)
+"""
+
+import os
+
+def file_version(filename):
+    """ファイルの版数 (更新時刻・サイズ)・存在しなければNone"""
+    try:
+        stat = os.stat(filename)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+class JobContext:
+    def __init__(self):
+        self._entries = {}  # 種類 ("jobs" / "frame") → (版数, 値)
+        self.stats = {"hits": 0, "loads": 0, "publishes": 0}
+
+    def publish(self, key, version, value):
+        """書き込み側 (収集) が手元のデータを登録"""
+        if version is None:
+            return
+        self._entries[key] = (version, value)
+        self.stats["publishes"] += 1
+
+    def get_or_load(self, key, version, loader):
+        """版数が一致すれば共有データ、違えば loader で読み込んで登録"""
+        entry = self._entries.get(key)
+        if entry is not None and version is not None and entry[0] == version:
+            self.stats["hits"] += 1
+            return entry[1]
+
+        value = loader()
+        self.stats["loads"] += 1
+        if version is not None:
+            self._entries[key] = (version, value)
+        return value
+
+    def invalidate(self, key=None):
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Upwork案件ストア (SQLite)
+案件ID単位のupsertで差分書き込み・インデックス付き検索 (data/jobs.json全体書き換えの置き換え)
+"""
+
+import json
+import os
+import sqlite3
+from dataclasses import asdict
+from datetime import datetime
+
+import pandas as pd
+
+from fingerprint import job_fingerprint
+from job_stream import iter_jobs
+
+JOB_COLUMNS = ["id", "title", "description", "budget_type", "budget_amount", "skills",
+               "posted", "proposals", "client_rating", "client_spent", "client_location",
+               "takawasi_score"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    budget_type TEXT NOT NULL,
+    budget_amount REAL NOT NULL,
+    skills TEXT NOT NULL,
+    posted TEXT NOT NULL,
+    proposals INTEGER NOT NULL,
+    client_rating REAL NOT NULL,
+    client_spent REAL NOT NULL,
+    client_location TEXT NOT NULL,
+    takawasi_score REAL NOT NULL DEFAULT 0,
+    fingerprint TEXT,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_score ON jobs(takawasi_score);
+CREATE INDEX IF NOT EXISTS idx_jobs_posted ON jobs(posted);
+CREATE INDEX IF NOT EXISTS idx_jobs_budget_type ON jobs(budget_type);
+CREATE INDEX IF NOT EXISTS idx_jobs_updated ON jobs(updated_at);
+"""
+
+class JobStore:
+    def __init__(self, db_file="data/jobs.db"):
+        self.db_file = db_file
+        if os.path.dirname(db_file):
+            os.makedirs(os.path.dirname(db_file), exist_ok=True)
+
+        self.conn = sqlite3.connect(db_file)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        """旧スキーマへの列追加"""
+        columns = {row['name'] for row in self.conn.execute("PRAGMA table_info(jobs)")}
+        if 'fingerprint' not in columns:
+            with self.conn:
+                self.conn.execute("ALTER TABLE jobs ADD COLUMN fingerprint TEXT")
+
+    def _row_to_job(self, row):
+        """行データ → 案件辞書 (asdict(UpworkJob) と同じ形式)"""
+        job = {key: row[key] for key in JOB_COLUMNS}
+        job['skills'] = json.loads(job['skills'])
+        return job
+
+    def upsert_jobs(self, jobs):
+        """案件upsert (新規・更新分のみ書き込み)"""
+        now = datetime.now().isoformat()
+        rows = []
+        for job in jobs:
+            data = asdict(job) if not isinstance(job, dict) else dict(job)
+            fingerprint = job_fingerprint(data)
+            data['skills'] = json.dumps(data['skills'], ensure_ascii=False)
+            rows.append([data[key] for key in JOB_COLUMNS] + [fingerprint, now])
+
+        extra = ["fingerprint", "updated_at"]
+        columns = ", ".join(JOB_COLUMNS + extra)
+        placeholders = ", ".join("?" * (len(JOB_COLUMNS) + len(extra)))
+        updates = ", ".join(f"{key} = excluded.{key}" for key in JOB_COLUMNS[1:] + extra)
+
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT INTO jobs ({columns}) VALUES ({placeholders}) "
+                f"ON CONFLICT(id) DO UPDATE SET {updates}", rows)
+        return len(rows)
+
+    def query_jobs(self, min_score=None, budget_type=None, posted_since=None,
+                   updated_since=None, order_by_score=False, limit=None):
+        """条件付き案件検索 (スコア・投稿日・予算タイプのインデックス使用)"""
+        conditions, params = [], []
+        if min_score is not None:
+            conditions.append("takawasi_score >= ?")
+            params.append(min_score)
+        if budget_type is not None:
+            conditions.append("budget_type = ?")
+            params.append(budget_type)
+        if posted_since is not None:
+            conditions.append("posted >= ?")
+            params.append(posted_since)
+        if updated_since is not None:
+            conditions.append("updated_at > ?")
+            params.append(updated_since)
+
+        sql = "SELECT * FROM jobs"
+        if updated_since is not None:
+            # 更新時刻の範囲が最も絞り込めるため (スコアインデックスだと高スコア全件を走査)
+            sql += " INDEXED BY idx_jobs_updated"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY takawasi_score DESC" if order_by_score else " ORDER BY rowid"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        return [self._row_to_job(row) for row in self.conn.execute(sql, params)]
+
+    def fingerprints(self, ids):
+        """保存済みフィンガープリント・スコア (案件ID → (fingerprint, score))"""
+        known = {}
+        ids = list(ids)
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            rows = self.conn.execute(
+                f"SELECT id, fingerprint, takawasi_score FROM jobs "
+                f"WHERE id IN ({', '.join('?' * len(chunk))})", chunk)
+            for row in rows:
+                known[row['id']] = (row['fingerprint'], row['takawasi_score'])
+        return known
+
+    def high_score_jobs(self, threshold, limit=None, updated_since=None):
+        """高スコア案件 (スコア降順・updated_since指定時はそれ以降の更新分のみ)"""
+        return self.query_jobs(min_score=threshold, updated_since=updated_since,
+                               order_by_score=True, limit=limit)
+
+    def load_jobs(self):
+        """全案件読み込み"""
+        return self.query_jobs()
+
+    def count(self, min_score=None):
+        """案件数"""
+        if min_score is None:
+            return self.conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+        return self.conn.execute("SELECT COUNT(*) FROM jobs WHERE takawasi_score >= ?",
+                                 (min_score,)).fetchone()[0]
+
+    def version(self):
+        """データ版数 (件数・最終更新時刻) - 集計キャッシュの判定用"""
+        return tuple(self.conn.execute("SELECT COUNT(*), MAX(updated_at) FROM jobs").fetchone())
+
+    def to_dataframe(self, columns=None):
+        """DataFrame化 (必要な列のみ読み込み可)"""
+        columns = columns or JOB_COLUMNS
+        df = pd.read_sql_query(f"SELECT {', '.join(columns)} FROM jobs ORDER BY rowid", self.conn)
+        if 'skills' in df.columns:
+            df['skills'] = df['skills'].map(json.loads)
+        return df
+
+    def import_json(self, filename):
+        """既存 data/jobs.json の取り込み (移行用)"""
+        imported, batch = 0, []
+        for job in iter_jobs(filename):
+            batch.append(job)
+            if len(batch) >= 1000:
+                imported += self.upsert_jobs(batch)
+                batch = []
+        return imported + self.upsert_jobs(batch)
+
+    def close(self):
+        self.conn.close()
+
+def open_job_store(settings):
+    """設定に応じた案件ストア作成 (backend: json の場合はNone)"""
+    storage = settings.get("storage", {})
+    if storage.get("backend", "json") != "sqlite":
+        return None
+
+    store = JobStore(storage.get("db_file", "data/jobs.db"))
+
+    # 初回起動時は既存JSONを取り込み
+    json_file = storage.get("json_file", "data/jobs.json")
+    if store.count() == 0 and os.path.exists(json_file):
+        imported = store.import_json(json_file)
+        print(f"📦 {json_file} から {imported} 件を取り込みました")
+
+    return store
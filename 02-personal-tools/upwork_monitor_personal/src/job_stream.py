@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+案件データのストリーミング読み書き
+data/jobs.json (整形JSON) / JSON Lines のどちらも全体を読み込まず1件ずつ処理
+"""
+
+import json
+import re
+from dataclasses import asdict
+from datetime import datetime
+
+CHUNK_SIZE = 64 * 1024
+WHITESPACE = " \t\r\n"
+HEAD_SIZE = 256  # 形式判別に読む先頭の文字数
+
+# jobs.json の最上位キー (JSON Lines の1件目は "id" で始まる)
+WRAPPER_KEYS = {"last_updated", "total_jobs", "jobs"}
+FIRST_KEY = re.compile(r'\s*\{\s*"((?:[^"\\]|\\.)*)"')
+
+class JobStreamReader:
+    """{"last_updated": ..., "jobs": [...]} 形式のjobs配列を1件ずつ取り出す"""
+
+    def __init__(self, f, chunk_size=CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+
+    def _fill(self):
+        """バッファ追加読み込み (消費済み部分は破棄)"""
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def _peek(self):
+        """空白を飛ばして次の1文字 (終端ならNone)"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return None
+
+    def _expect(self, char):
+        found = self._peek()
+        if found != char:
+            raise ValueError(f"jobs.json 形式エラー: '{char}' が必要です (位置 {self.pos}: {found!r})")
+        self.pos += 1
+
+    def _decode(self):
+        """次のJSON値1つ (チャンク境界をまたぐ場合は追加読み込みして再試行)"""
+        self._peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # 数値・リテラルはバッファ末尾で途切れている可能性がある
+            if end == len(self.buffer) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def __iter__(self):
+        self._expect("{")
+        if self._peek() == "}":
+            return
+        while True:
+            key = self._decode()
+            self._expect(":")
+            if key == "jobs":
+                yield from self._iter_array()
+            else:
+                self._decode()  # last_updated / total_jobs などは読み飛ばし
+
+            if self._peek() == ",":
+                self.pos += 1
+                continue
+            self._expect("}")
+            return
+
+    def _iter_array(self):
+        self._expect("[")
+        if self._peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self._decode()
+            if self._peek() == ",":
+                self.pos += 1
+                continue
+            self._expect("]")
+            return
+
+def _is_jsonl(head):
+    """先頭オブジェクトの最初のキーで判別 (1行の整形なしJSONでも全体をパースしない)"""
+    m = FIRST_KEY.match(head)
+    return m is not None and m.group(1) not in WRAPPER_KEYS
+
+def iter_jobs(filename, chunk_size=CHUNK_SIZE):
+    """案件辞書を1件ずつ返す (整形JSON / JSON Lines は自動判別)"""
+    with open(filename, 'r', encoding='utf-8') as f:
+        head = f.read(HEAD_SIZE)
+        if not head.strip() and not f.read().strip():
+            return  # 空ファイル (0件の JSON Lines) は空のストリーム
+        f.seek(0)
+        if _is_jsonl(head):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+            return
+
+        yield from JobStreamReader(f, chunk_size)
+
+def write_jobs(jobs, filename, fmt="json"):
+    """案件書き込み (json: 従来の整形JSON / jsonl: 1行1件)"""
+    with open(filename, 'w', encoding='utf-8') as f:
+        if fmt == "jsonl":
+            for job in jobs:
+                f.write(json.dumps(asdict(job), ensure_ascii=False))
+                f.write("\n")
+            return
+
+        jobs_data = {
+            "last_updated": datetime.now().isoformat(),
+            "total_jobs": len(jobs),
+            "jobs": [asdict(job) for job in jobs]
+        }
+        json.dump(jobs_data, f, indent=2, ensure_ascii=False)
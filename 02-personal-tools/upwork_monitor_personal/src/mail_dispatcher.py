@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+メール通知ディスパッチャー
+通知をキューに積んで即座に戻り、ワーカースレッドが集約期間内のアラートを1通のダイジェストにまとめて送信
+(SMTP接続は使い回し・一時エラーは指数バックオフで再送)
+"""
+
+import os
+import queue
+import smtplib
+import ssl
+import threading
+import time
+from datetime import datetime
+from email.header import Header
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+_STOP = object()
+WAIT_SLICE = 1.0  # flush 待機中にワーカーの生存を確認する間隔 (秒)
+
+class MailDispatcher:
+    def __init__(self, config, sleep=time.sleep):
+        self.host = config.get("smtp_host", "localhost")
+        self.port = config.get("smtp_port", 587)
+        self.starttls = config.get("starttls", True)
+        self.username = config.get("username", "")
+        self.password = config.get("password") or os.environ.get(
+            config.get("password_env", "UPWORK_SMTP_PASSWORD"), "")
+        self.from_addr = config.get("from_addr", "upwork-monitor@localhost")
+        self.to_addrs = config.get("to_addrs", [])
+        self.digest_window = config.get("digest_window", 60)  # アラート集約期間 (秒)
+        self.max_batch = config.get("max_batch", 20)          # 1ダイジェストの最大アラート数
+        self.max_retries = config.get("max_retries", 5)
+        self.retry_base = config.get("retry_base", 5)
+        self.max_backoff = config.get("max_backoff", 300)
+        self.idle_timeout = config.get("idle_timeout", 120)   # この秒数アラートがなければ切断
+        self.timeout = config.get("timeout", 30)
+        self.sleep = sleep
+
+        self.stats = {"submitted": 0, "digests": 0, "alerts_sent": 0,
+                      "retries": 0, "failed": 0, "connections": 0}
+        self.latencies = []  # アラート投入 → 送信完了 (秒)
+
+        self.queue = queue.Queue()
+        self._smtp = None
+        self._last_used = 0.0
+        self._pending = 0
+        self._idle = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="mail-dispatcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, message, count=1):
+        """アラート投入 (送信を待たずに戻る)"""
+        if self._closed:
+            raise RuntimeError("MailDispatcher は停止済みです")
+        self._check_worker()
+        with self._idle:
+            self._pending += 1
+            self.stats["submitted"] += 1
+        self.queue.put((time.perf_counter(), datetime.now(), message, count))
+
+    def _check_worker(self):
+        if not self._thread.is_alive() and not self._closed:
+            raise RuntimeError("MailDispatcher のワーカーが異常終了しています")
+
+    def flush(self, timeout=None):
+        """投入済みアラートの送信完了 (または失敗確定) まで待機 (ワーカー停止時は即座に例外)"""
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        with self._idle:
+            while self._pending:
+                if not self._thread.is_alive():
+                    raise RuntimeError(f"MailDispatcher のワーカーが停止しています (未送信 {self._pending}件)")
+                wait = WAIT_SLICE
+                if deadline is not None:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        return False
+                    wait = min(wait, remaining)
+                self._idle.wait(wait)
+            return True
+
+    def close(self, timeout=None):
+        """集約待ちを打ち切って残りを送信し、ワーカーと接続を終了"""
+        if self._closed:
+            return
+        self._closed = True
+        self.queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _run(self):
+        try:
+            while True:
+                try:
+                    item = self.queue.get(timeout=self.idle_timeout)
+                except queue.Empty:
+                    self._disconnect()
+                    continue
+                if item is _STOP:
+                    break
+
+                batch, stop = self._collect_batch(item)
+                try:
+                    self._deliver(batch)
+                except Exception as e:
+                    # 想定外のエラーでもワーカーは止めない (そのダイジェストは破棄)
+                    self.stats["failed"] += 1
+                    print(f"⚠️  メール送信エラー ({len(batch)}件のアラートを破棄): {type(e).__name__}: {e}")
+                if stop:
+                    break
+            self._disconnect()
+        finally:
+            with self._idle:
+                self._idle.notify_all()
+
+    def _collect_batch(self, first):
+        """集約期間内に届いたアラートをまとめる (期間終了後もキュー済みの分は同梱)"""
+        batch = [first]
+        deadline = time.perf_counter() + self.digest_window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def build_digest(self, batch):
+        """ダイジェストメール作成"""
+        total = sum(count for _, _, _, count in batch)
+        first, last = batch[0][1], batch[-1][1]
+
+        body = (f"🚨 高スコア案件ダイジェスト: {len(batch)}回のアラート / {total}件\n"
+                f"期間: {first.strftime('%Y-%m-%d %H:%M:%S')} - {last.strftime('%H:%M:%S')}\n")
+        for _, _, message, _ in batch:
+            body += f"\n{'=' * 50}\n{message}\n"
+
+        msg = MIMEMultipart()
+        msg['Subject'] = Header(f"🚨 Upwork高スコア案件 {total}件", 'utf-8')
+        msg['From'] = self.from_addr
+        msg['To'] = ", ".join(self.to_addrs)
+        msg.attach(MIMEText(body, 'plain', 'utf-8'))
+        return msg
+
+    def _connection(self):
+        """SMTP接続 (既存接続を再利用・しばらく未使用ならNOOPで生存確認)"""
+        if self._smtp is not None and time.perf_counter() - self._last_used > 10:
+            try:
+                self._smtp.noop()
+            except (smtplib.SMTPException, OSError):
+                self._disconnect()
+
+        if self._smtp is None:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.starttls:
+                smtp.starttls(context=ssl.create_default_context())
+            if self.username:
+                smtp.login(self.username, self.password)
+            self._smtp = smtp
+            self.stats["connections"] += 1
+        return self._smtp
+
+    def _disconnect(self):
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+        self._smtp = None
+
+    def _deliver(self, batch):
+        """ダイジェスト送信 (一時エラーは指数バックオフで再送・恒久エラーは破棄)"""
+        try:
+            msg = self.build_digest(batch)
+            for attempt in range(self.max_retries + 1):
+                try:
+                    self._connection().send_message(msg, self.from_addr, self.to_addrs)
+                    self._last_used = time.perf_counter()
+                    break
+                except (smtplib.SMTPException, OSError) as e:
+                    self._disconnect()
+                    permanent = isinstance(e, smtplib.SMTPResponseException) and e.smtp_code >= 500
+                    if permanent or attempt == self.max_retries:
+                        self.stats["failed"] += 1
+                        print(f"⚠️  メール送信失敗 ({len(batch)}件のアラートを破棄): {e}")
+                        return
+                    self.stats["retries"] += 1
+                    self.sleep(min(self.retry_base * 2 ** attempt, self.max_backoff))
+
+            now = time.perf_counter()
+            self.stats["digests"] += 1
+            self.stats["alerts_sent"] += len(batch)
+            self.latencies.extend(now - submitted for submitted, _, _, _ in batch)
+        finally:
+            with self._idle:
+                self._pending -= len(batch)
+                self._idle.notify_all()
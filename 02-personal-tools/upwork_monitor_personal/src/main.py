@@ -6,45 +6,86 @@ Upwork案件監視システム メインコントローラー
 
 import sys
 import os
-from scraper import UpworkScraper
+import time
+from scraper import UpworkScraper, load_settings
 from analyzer import UpworkAnalyzer
 from notifier import UpworkNotifier
+from job_store import open_job_store
+from job_context import JobContext
+from report_renderer import ReportRenderer
+from scoring_rules import ScoringRulesLoader
 from datetime import datetime
+from dataclasses import asdict
 
 class UpworkTracker:
-    def __init__(self):
-        self.scraper = UpworkScraper()
-        self.analyzer = UpworkAnalyzer()
-        self.notifier = UpworkNotifier()
+    def __init__(self, settings_file="config/settings.json"):
+        settings = load_settings(settings_file)
+        self.store = open_job_store(settings)
+        # 収集結果を分析・通知で再利用 (データ版数が変わるまで有効)
+        self.context = JobContext()
+        # 採点ルール・閾値は全ステージで共有 (設定ファイル更新時は各ステージ開始時に再読み込み)
+        self.scoring = ScoringRulesLoader(settings_file)
+        self.scraper = UpworkScraper(settings_file, store=self.store, context=self.context,
+                                     scoring=self.scoring)
+        analysis = settings.get("analysis", {})
+        self.analyzer = UpworkAnalyzer(store=self.store,
+                                       stats_mode=analysis.get("stats_mode", "exact"),
+                                       context=self.context, scoring=self.scoring,
+                                       sketch_k=analysis.get("sketch_k", 200))
+        self.notifier = UpworkNotifier(store=self.store, settings=settings, context=self.context,
+                                       scoring=self.scoring)
+        reports = settings.get("reports", {})
+        self.renderer = ReportRenderer(self.analyzer,
+                                       formats=reports.get("formats", ["text"]),
+                                       output_dir=reports.get("output_dir", "reports"))
         
     def run_full_cycle(self):
         """完全サイクル実行"""
         print("🚀 Upwork案件監視システム開始")
         print(f"⏰ 実行時刻: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        context_before = dict(self.context.stats)
+        timings = {}
         
         # Step 1: 案件収集
         print("\n📡 Step 1: 案件データ収集")
+        start = time.perf_counter()
         jobs = self.scraper.run_collection()
+        timings["collection"] = time.perf_counter() - start
         
         # Step 2: データ分析
         print("\n📊 Step 2: データ分析・レポート生成")
-        report = self.analyzer.generate_report()
-        self.analyzer.save_report(report)
+        start = time.perf_counter()
+        self.write_reports()
+        timings["analysis"] = time.perf_counter() - start
         
         # Step 3: 高スコア案件通知
         print("\n🔔 Step 3: 高スコア案件チェック・通知")
-        notification_sent = self.notifier.run_notification_check()
+        start = time.perf_counter()
+        changed = [asdict(job) for job in self.scraper.last_changed]
+        notification_sent = self.notifier.run_notification_check(changed)
+        timings["notification"] = time.perf_counter() - start
+        
+        context_stats = {key: self.context.stats[key] - context_before[key] for key in context_before}
+        high_score = self.scoring.current().high_priority
         
         # 完了サマリー
         print(f"\n✅ 監視サイクル完了")
         print(f"📈 収集案件数: {len(jobs)}")
-        print(f"🎯 高スコア案件: {len([j for j in jobs if j.takawasi_score >= 70])}")
+        print(f"🎯 高スコア案件: {len([j for j in jobs if j.takawasi_score >= high_score])}")
+        print(f"🔁 処理/スキップ: {self.scraper.cycle_stats['processed']}/{self.scraper.cycle_stats['skipped']}")
         print(f"🔔 通知送信: {'あり' if notification_sent else 'なし'}")
+        print(f"⏱  所要時間: 収集 {timings['collection']:.2f}秒 / 分析 {timings['analysis']:.2f}秒 / "
+              f"通知 {timings['notification']:.2f}秒")
+        print(f"💾 共有データ: 再利用 {context_stats['hits']}回 / 読み込み・構築 {context_stats['loads']}回")
         
         return {
             "jobs_collected": len(jobs),
-            "high_score_jobs": len([j for j in jobs if j.takawasi_score >= 70]),
-            "notification_sent": notification_sent
+            "jobs_processed": self.scraper.cycle_stats['processed'],
+            "jobs_skipped": self.scraper.cycle_stats['skipped'],
+            "high_score_jobs": len([j for j in jobs if j.takawasi_score >= high_score]),
+            "notification_sent": notification_sent,
+            "timings": timings,
+            "context": context_stats
         }
     
     def run_quick_check(self):
@@ -58,10 +99,41 @@ class UpworkTracker:
         # 通知チェック
         self.notifier.run_notification_check()
 
+    def write_reports(self):
+        """日次レポートを設定された全形式で出力 (データ更新がなければスキップ)"""
+        return self.renderer.write()
+
+    def run_trend_report(self):
+        """長期トレンドレポート (日次・週次ロールアップから生成)"""
+        report = self.analyzer.generate_trend_report()
+        print(report)
+        self.analyzer.save_report(report, "reports/trend_report.txt")
+
+    def close(self):
+        """終了処理 (未送信のメール通知を送信・HTTPキャッシュのインデックス保存)"""
+        self.notifier.close()
+        self.scraper.close()
+
+    def run_daemon(self, settings_file="config/settings.json"):
+        """常駐モード (収集・分析・通知を設定間隔で実行)"""
+        from monitor_daemon import MonitorDaemon, DaemonAlreadyRunning
+        
+        try:
+            MonitorDaemon(self, load_settings(settings_file)).run_forever()
+        except DaemonAlreadyRunning as e:
+            print(f"⚠️  {e}")
+            sys.exit(1)
+
 if __name__ == "__main__":
     tracker = UpworkTracker()
     
     if len(sys.argv) > 1 and sys.argv[1] == "--quick":
         tracker.run_quick_check()
+    elif len(sys.argv) > 1 and sys.argv[1] == "--trends":
+        tracker.run_trend_report()
+    elif len(sys.argv) > 1 and sys.argv[1] == "--daemon":
+        tracker.run_daemon()
     else:
         tracker.run_full_cycle()
+    
+    tracker.close()
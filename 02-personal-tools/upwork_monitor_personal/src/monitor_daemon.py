@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Upwork案件監視 常駐デーモン
+1プロセスを起動したまま 収集・分析・通知 を個別の間隔で実行 (ジッター・失敗時バックオフ・多重起動防止)
+"""
+
+import fcntl
+import json
+import os
+import random
+import signal
+import threading
+import time
+from dataclasses import asdict
+from datetime import datetime
+
+STAGES = ("collection", "analysis", "notification")
+
+class DaemonAlreadyRunning(RuntimeError):
+    pass
+
+class MonitorDaemon:
+    def __init__(self, tracker, settings, clock=time.time):
+        config = settings.get("daemon", {})
+        self.tracker = tracker
+        self.clock = clock
+        self.intervals = {
+            "collection": config.get("collection_interval", 900),
+            "analysis": config.get("analysis_interval", 3600),
+            "notification": config.get("notification_interval", 300)
+        }
+        self.jitter = config.get("jitter", 0.1)          # 間隔に対する揺らぎ幅 (割合)
+        self.retry_base = config.get("retry_base", 60)    # 初回リトライ待ち (秒)
+        self.max_backoff = config.get("max_backoff", 3600)
+        self.state_file = config.get("state_file", "data/daemon_state.json")
+        self.lock_file = config.get("lock_file", "data/daemon.lock")
+
+        # 収集済み・未通知の新規/変更案件 (案件ID → 案件辞書・状態ファイルに保存して再起動後も引き継ぐ)
+        self.pending_changes = {}
+        self.state = self._load_state()
+        self._stop = threading.Event()
+        self._lock_handle = None
+
+    def _load_state(self):
+        """スケジュール状態読み込み (再起動後も前回の予定を引き継ぐ)"""
+        state = {stage: {"next_run": 0, "failures": 0, "last_success": None,
+                         "last_error": None, "last_latency": None} for stage in STAGES}
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            for stage in STAGES:
+                state[stage].update(saved.get("stages", {}).get(stage, {}))
+            self.pending_changes = {job['id']: job for job in saved.get("pending_jobs", [])}
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+        return state
+
+    def save_state(self):
+        """スケジュール状態保存 (一時ファイル経由で置き換え)"""
+        if os.path.dirname(self.state_file):
+            os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+        tmp_file = self.state_file + ".tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({"updated": datetime.now().isoformat(), "stages": self.state,
+                       "pending_jobs": list(self.pending_changes.values())}, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_file, self.state_file)
+
+    def acquire_lock(self):
+        """多重起動防止ロック (別プロセスが実行中なら例外)"""
+        if os.path.dirname(self.lock_file):
+            os.makedirs(os.path.dirname(self.lock_file), exist_ok=True)
+        # 'w' だと起動を拒否された側も実行中デーモンのPIDを消してしまうため、ロック取得後に書き換え
+        handle = open(self.lock_file, 'a+')
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            handle.close()
+            raise DaemonAlreadyRunning(f"別のデーモンが実行中です ({self.lock_file})")
+        handle.seek(0)
+        handle.truncate()
+        handle.write(str(os.getpid()))
+        handle.flush()
+        self._lock_handle = handle
+
+    def release_lock(self):
+        if self._lock_handle:
+            fcntl.flock(self._lock_handle, fcntl.LOCK_UN)
+            self._lock_handle.close()
+            self._lock_handle = None
+
+    def _with_jitter(self, seconds):
+        return seconds * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def _run_collection(self):
+        self.tracker.scraper.run_collection()
+        for job in self.tracker.scraper.last_changed:
+            self.pending_changes[job.id] = asdict(job)
+        # 通知前に再起動しても未通知分を失わないよう即保存
+        self.save_state()
+
+    def _run_analysis(self):
+        self.tracker.write_reports()
+
+    def _run_notification(self):
+        candidates = list(self.pending_changes.values())
+        self.tracker.notifier.run_notification_check(candidates)
+        # 通知成功後に送った分のみ消去 (失敗時はバックオフ後の再試行で同じ案件を再送)
+        for job in candidates:
+            self.pending_changes.pop(job['id'], None)
+
+    def run_stage(self, stage):
+        """1ステージ実行 (成功時は通常間隔、失敗時は指数バックオフで再スケジュール)"""
+        stage_state = self.state[stage]
+        start = time.perf_counter()
+        try:
+            getattr(self, f"_run_{stage}")()
+        except Exception as e:
+            stage_state["failures"] += 1
+            stage_state["last_error"] = f"{type(e).__name__}: {e}"
+            delay = min(self.retry_base * 2 ** (stage_state["failures"] - 1), self.max_backoff)
+            print(f"⚠️  {stage} 失敗 ({stage_state['failures']}回連続): {e} → {delay:.0f}秒後に再試行")
+            ok = False
+        else:
+            stage_state["failures"] = 0
+            stage_state["last_error"] = None
+            stage_state["last_success"] = datetime.now().isoformat()
+            delay = self.intervals[stage]
+            ok = True
+
+        stage_state["last_latency"] = round(time.perf_counter() - start, 4)
+        stage_state["next_run"] = self.clock() + self._with_jitter(delay)
+        return ok
+
+    def run_due_stages(self):
+        """実行予定時刻を過ぎたステージを順に実行 (1サイクル)"""
+        now = self.clock()
+        due = [stage for stage in STAGES if self.state[stage]["next_run"] <= now]
+        if not due:
+            return {}
+
+        latencies = {}
+        for stage in due:
+            self.run_stage(stage)
+            latencies[stage] = self.state[stage]["last_latency"]
+
+        self.save_state()
+        print(f"⏱  サイクル完了 {datetime.now().strftime('%H:%M:%S')} | "
+              + " / ".join(f"{stage} {latency:.2f}秒" for stage, latency in latencies.items()))
+        return latencies
+
+    def seconds_until_next(self):
+        return max(0.0, min(self.state[stage]["next_run"] for stage in STAGES) - self.clock())
+
+    def stop(self, *args):
+        self._stop.set()
+
+    def run_forever(self):
+        """常駐実行 (SIGINT / SIGTERM で停止)"""
+        self.acquire_lock()
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+        print(f"🛰  デーモン起動 (PID {os.getpid()}) 間隔: "
+              + ", ".join(f"{stage} {seconds}秒" for stage, seconds in self.intervals.items()))
+
+        try:
+            while not self._stop.is_set():
+                self.run_due_stages()
+                self._stop.wait(self.seconds_until_next())
+        finally:
+            # 通知ディスパッチャー等の終了処理は呼び出し側 (main.py) の tracker.close() で実行
+            self.save_state()
+            self.release_lock()
+            print("🛑 デーモン停止")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+通知インデックス
+通知済み案件IDと確認時刻ウォーターマークを追記専用のJSON Linesで保持し、同じ案件の再通知を防止
+"""
+
+import json
+import os
+
+class NotificationIndex:
+    def __init__(self, index_file="data/notified_jobs.jsonl"):
+        self.index_file = index_file
+        self.notified = {}     # 案件ID → 通知時スコア
+        self.watermark = None  # 前回確認時刻 (ISO形式)
+        self._lines = 0
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    self._lines += 1
+                    if "watermark" in record:
+                        self.watermark = record["watermark"]
+                    else:
+                        self.notified[record["id"]] = record["score"]
+        except FileNotFoundError:
+            pass
+
+        # ウォーターマーク行が溜まったら圧縮
+        if self._lines > 2 * len(self.notified) + 1000:
+            self._compact()
+
+    def _compact(self):
+        """通知済みIDと最新ウォーターマークだけのファイルに置き換え"""
+        tmp_file = self.index_file + ".tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            for job_id, score in self.notified.items():
+                f.write(json.dumps({"id": job_id, "score": score}, ensure_ascii=False) + "\n")
+            if self.watermark:
+                f.write(json.dumps({"watermark": self.watermark}) + "\n")
+        os.replace(tmp_file, self.index_file)
+        self._lines = len(self.notified) + (1 if self.watermark else 0)
+
+    def select(self, jobs, threshold):
+        """未通知の高スコア案件 (同一IDは最後の1件・スコア降順)"""
+        new_jobs = {}
+        for job in jobs:
+            if job['takawasi_score'] >= threshold and job['id'] not in self.notified:
+                new_jobs[job['id']] = job
+        return sorted(new_jobs.values(), key=lambda job: job['takawasi_score'], reverse=True)
+
+    def record(self, jobs, watermark):
+        """通知済み案件とウォーターマークを追記 (今回分のみ書き込み)"""
+        if os.path.dirname(self.index_file):
+            os.makedirs(os.path.dirname(self.index_file), exist_ok=True)
+
+        with open(self.index_file, 'a', encoding='utf-8') as f:
+            for job in jobs:
+                self.notified[job['id']] = job['takawasi_score']
+                f.write(json.dumps({"id": job['id'], "score": job['takawasi_score']},
+                                   ensure_ascii=False) + "\n")
+            f.write(json.dumps({"watermark": watermark}) + "\n")
+        self._lines += len(jobs) + 1
+        self.watermark = watermark
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+通知ログ
+ファイルを開いたままバッファ書き込み (flush/fsync方針は設定可能)・サイズ/日付でローテーションしてgzip圧縮
+固定長インデックス (時刻・オフセット) の二分探索で時間範囲を読み出し (時刻はUTCで記録・日付ローテーションは現地の日付)
+"""
+
+import glob
+import gzip
+import os
+import shutil
+import threading
+from datetime import datetime, timezone
+
+SEPARATOR = "=" * 50
+TIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+INDEX_ENTRY = 26 + 1 + 16 + 1  # "時刻 オフセット\n" の固定長
+
+def utc_now():
+    """現在時刻 (UTC・tzinfoなし) - 夏時間の切り替えでも単調増加するためインデックスの二分探索が成り立つ"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+def _to_utc(timestamp):
+    """タイムゾーン付きはUTCに変換 (tzinfoなしはUTCとみなす)"""
+    if timestamp is not None and timestamp.tzinfo is not None:
+        return timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp
+
+def _local_date(timestamp, tz):
+    """UTC時刻 (tzinfoなし) の tz での日付 (tz=None はシステムの現地時刻)"""
+    return timestamp.replace(tzinfo=timezone.utc).astimezone(tz).date()
+
+def _compress_segment(path):
+    """ローテーション済みセグメントをgzip圧縮 (一時ファイル経由・完了後に元ファイルを削除)"""
+    with open(path, 'rb') as src, gzip.open(path + ".gz.tmp", 'wb') as dst:
+        shutil.copyfileobj(src, dst)
+    os.replace(path + ".gz.tmp", path + ".gz")
+    os.remove(path)
+
+def _format_record(message):
+    """従来の notifications.log と同じ区切り形式"""
+    return f"\n{SEPARATOR}\n{message}\n{SEPARATOR}\n".encode('utf-8')
+
+def _parse_record(data):
+    text = data.decode('utf-8')
+    prefix, suffix = f"\n{SEPARATOR}\n", f"\n{SEPARATOR}\n"
+    return text[len(prefix):len(text) - len(suffix)]
+
+class NotificationLog:
+    def __init__(self, log_file="logs/notifications.log", max_bytes=10 * 1024 * 1024,
+                 rotate_daily=True, compress=True, flush_records=20, flush_interval=5.0,
+                 fsync=False, clock=utc_now, tz=None):
+        self.log_file = log_file
+        self.index_file = log_file + ".idx"
+        self.max_bytes = max_bytes
+        self.rotate_daily = rotate_daily
+        self.compress = compress
+        self.flush_records = flush_records    # この件数溜まったら書き出し
+        self.flush_interval = flush_interval  # 最初の未書き出しからこの秒数で書き出し
+        self.fsync = fsync                    # 書き出し毎に fsync
+        self.clock = clock
+        self.tz = tz  # 日付ローテーションの基準タイムゾーン (Noneはシステムの現地時刻)
+
+        self._lock = threading.RLock()
+        self._log = None
+        self._index = None
+        self._size = 0
+        self._segment_start = None
+        self._buffer = []
+        self._timer = None
+        self._compressors = []  # 圧縮中のスレッド (close で完了待ち)
+        self._recovered = False
+
+    def _open(self):
+        """現在のセグメントを追記モードで開く (既存ファイルは続きから)"""
+        if os.path.dirname(self.log_file):
+            os.makedirs(os.path.dirname(self.log_file), exist_ok=True)
+        if not self._recovered:
+            self._recover_segments()
+            self._recovered = True
+        self._log = open(self.log_file, 'ab')
+        self._index = open(self.index_file, 'ab')
+        self._size = self._log.tell()
+        first = _read_entry(self.index_file, 0)
+        self._segment_start = first[0] if first else None
+
+    def write(self, message):
+        """通知1件をバッファに追加"""
+        with self._lock:
+            if self._log is None:
+                self._open()
+
+            now = _to_utc(self.clock())
+            record = _format_record(message)
+            if self._should_rotate(now, len(record)):
+                self.rotate()
+                self._open()
+
+            if self._segment_start is None:
+                self._segment_start = now
+            self._buffer.append((now, self._size, record))
+            self._size += len(record)
+
+            if len(self._buffer) >= self.flush_records:
+                self.flush()
+            elif self._timer is None and self.flush_interval is not None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _should_rotate(self, now, incoming):
+        if self._segment_start is None:
+            return False
+        if self.rotate_daily and _local_date(now, self.tz) != _local_date(self._segment_start, self.tz):
+            return True
+        return self._size + incoming > self.max_bytes
+
+    def flush(self):
+        """バッファ書き出し (ログ本体 → インデックスの順)"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._buffer:
+                return
+
+            self._log.write(b"".join(record for _, _, record in self._buffer))
+            self._log.flush()
+            self._index.write(b"".join(
+                f"{timestamp.strftime(TIME_FORMAT)} {offset:016d}\n".encode('ascii')
+                for timestamp, offset, _ in self._buffer))
+            self._index.flush()
+            if self.fsync:
+                os.fsync(self._log.fileno())
+                os.fsync(self._index.fileno())
+            self._buffer = []
+
+    def rotate(self):
+        """現在のセグメントを 開始時刻付きの名前に変更し、圧縮は別スレッドで実行 (書き込みを止めない)"""
+        with self._lock:
+            self.flush()
+            self._close_files()
+            if self._segment_start is None or not os.path.exists(self.log_file):
+                return
+
+            base = f"{self.log_file}.{self._segment_start.strftime('%Y%m%d-%H%M%S-%f')}"
+            os.replace(self.index_file, base + ".idx")
+            os.replace(self.log_file, base)
+            self._segment_start = None
+            if self.compress:
+                self._start_compression(base)
+
+    def _start_compression(self, base):
+        thread = threading.Thread(target=_compress_segment, args=(base,), daemon=True)
+        thread.start()
+        self._compressors = [t for t in self._compressors if t.is_alive()] + [thread]
+
+    def _recover_segments(self):
+        """圧縮途中で終了したセグメントの後始末 (一時ファイルを削除して未圧縮のセグメントを再圧縮)"""
+        pattern = glob.escape(self.log_file) + ".*"
+        for tmp_file in glob.glob(pattern + ".gz.tmp"):
+            os.remove(tmp_file)
+        for index_file in glob.glob(pattern + ".idx"):
+            base = index_file[:-len(".idx")]
+            if not os.path.exists(base):
+                continue
+            if os.path.exists(base + ".gz"):
+                os.remove(base)  # 圧縮完了後・元ファイル削除前に終了
+            elif self.compress:
+                self._start_compression(base)
+
+    def wait_compression(self):
+        """実行中の圧縮の完了待ち"""
+        for thread in self._compressors:
+            thread.join()
+        self._compressors = []
+
+    def _close_files(self):
+        if self._log is not None:
+            self._log.close()
+            self._index.close()
+            self._log = self._index = None
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            self._close_files()
+        self.wait_compression()
+
+    def segments(self):
+        """(ログファイル, インデックス) の一覧 (古い順・現在のセグメントは最後)"""
+        rotated = []
+        for index_file in sorted(glob.glob(glob.escape(self.log_file) + ".*.idx")):
+            base = index_file[:-len(".idx")]
+            rotated.append((base + ".gz" if os.path.exists(base + ".gz") else base, index_file))
+        if os.path.exists(self.index_file):
+            rotated.append((self.log_file, self.index_file))
+        return rotated
+
+    def read_range(self, start=None, end=None):
+        """時間範囲 [start, end] の通知 (時刻, メッセージ) を返す (時刻はUTC・tzinfoなしはUTCとみなす)"""
+        start, end = _to_utc(start), _to_utc(end)
+        self.flush()
+        results = []
+        for log_file, index_file in self.segments():
+            entries = os.path.getsize(index_file) // INDEX_ENTRY
+            if entries == 0:
+                continue
+            # 範囲外のセグメントは開かない
+            if start is not None and _read_entry(index_file, entries - 1)[0] < start:
+                continue
+            if end is not None and _read_entry(index_file, 0)[0] > end:
+                continue
+            try:
+                results.extend(_read_segment(log_file, index_file, entries, start, end))
+            except FileNotFoundError:
+                # 読み出し直前に圧縮が完了したセグメント
+                results.extend(_read_segment(log_file + ".gz", index_file, entries, start, end))
+        return results
+
+def _entry(index, i):
+    """インデックスのi番目 (時刻, オフセット)・範囲外はNone"""
+    index.seek(i * INDEX_ENTRY)
+    line = index.read(INDEX_ENTRY)
+    if len(line) < INDEX_ENTRY:
+        return None
+    timestamp, offset = line.decode('ascii').split()
+    return datetime.strptime(timestamp, TIME_FORMAT), int(offset)
+
+def _read_entry(index_file, i):
+    try:
+        with open(index_file, 'rb') as index:
+            return _entry(index, i)
+    except FileNotFoundError:
+        return None
+
+def _read_segment(log_file, index_file, entries, start, end):
+    opener = gzip.open if log_file.endswith(".gz") else open
+    records = []
+    with open(index_file, 'rb') as index, opener(log_file, 'rb') as log:
+        # start 以上の最初のエントリを二分探索
+        lo, hi = 0, entries
+        while start is not None and lo < hi:
+            mid = (lo + hi) // 2
+            if _entry(index, mid)[0] < start:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        entry = _entry(index, lo)
+        while entry is not None:
+            timestamp, offset = entry
+            if end is not None and timestamp > end:
+                break
+            lo += 1
+            entry = _entry(index, lo)
+            log.seek(offset)
+            data = log.read(entry[1] - offset) if entry else log.read()
+            records.append((timestamp, _parse_record(data)))
+    return records
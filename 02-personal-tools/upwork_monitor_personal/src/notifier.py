@@ -4,29 +4,86 @@ Upwork案件通知システム
 高スコア案件発見時の自動通知
 """
 
-import json
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 import os
 from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from template_selector import TemplateSelector
+from job_stream import iter_jobs
+from job_context import file_version
+from notification_index import NotificationIndex
+from mail_dispatcher import MailDispatcher
+from notification_log import NotificationLog
+from scoring_rules import ScoringRulesLoader
 
 class UpworkNotifier:
-    def __init__(self):
-        self.notification_threshold = 80  # 80点以上で通知
+    def __init__(self, store=None, index_file=None, settings=None, context=None, scoring=None):
+        # 通知閾値は score_thresholds.notification (既定80点・設定更新時は次回チェックで反映)
+        self.scoring = scoring or ScoringRulesLoader(settings=settings)
+        self.rules = self.scoring.current()
+        self.notification_threshold = self.rules.notification_threshold
+        self.template_selector = TemplateSelector()
+        self.store = store
+        self.context = context
+        self.data_file = "data/jobs.json"
         
-    def check_high_score_jobs(self):
-        """高スコア案件チェック"""
-        try:
-            with open("data/jobs.json", 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
-            high_score_jobs = [job for job in data['jobs'] 
-                             if job['takawasi_score'] >= self.notification_threshold]
-            
-            return high_score_jobs
-        except FileNotFoundError:
+        # 通知済みIDとウォーターマーク (ストア使用時はDBと同じ場所)
+        if index_file is None:
+            data_dir = os.path.dirname(store.db_file) if store is not None else "data"
+            index_file = os.path.join(data_dir, "notified_jobs.jsonl")
+        self.index = NotificationIndex(index_file)
+        self.checked_at = None
+        
+        # 通知ログ (サイズ・日付でローテーション・日付は timezone 指定時はその現地日付)
+        log_settings = (settings or {}).get("notification_settings", {}).get("log", {})
+        self.notification_log = NotificationLog(
+            log_settings.get("file", "logs/notifications.log"),
+            max_bytes=log_settings.get("max_mb", 10) * 1024 * 1024,
+            rotate_daily=log_settings.get("rotate_daily", True),
+            compress=log_settings.get("compress", True),
+            flush_records=log_settings.get("flush_records", 20),
+            flush_interval=log_settings.get("flush_interval", 5.0),
+            fsync=log_settings.get("fsync", False),
+            tz=ZoneInfo(log_settings["timezone"]) if log_settings.get("timezone") else None)
+        
+        # メール通知 (methods に email を指定した場合のみ)
+        self.dispatcher = None
+        notification_settings = (settings or {}).get("notification_settings", {})
+        if "email" in notification_settings.get("methods", []):
+            self.dispatcher = MailDispatcher(notification_settings.get("email", {}))
+        
+    def check_high_score_jobs(self, candidates=None):
+        """未通知の高スコア案件チェック (candidates指定時は今回の新規・変更案件のみ対象)"""
+        self.checked_at = datetime.now().isoformat()
+        rules = self.scoring.current()
+        if rules is not self.rules:
+            self.rules = rules
+            self.notification_threshold = rules.notification_threshold
+        
+        if candidates is not None:
+            return self.index.select(candidates, self.notification_threshold)
+        
+        if self.store is not None:
+            # 前回確認以降に更新された案件のみ検索
+            return self.index.select(
+                self.store.high_score_jobs(self.notification_threshold,
+                                           updated_since=self.index.watermark),
+                self.notification_threshold)
+        
+        version = file_version(self.data_file)
+        if version is None:
             return []
+        
+        # 前回確認以降にファイル更新がなければ読み込み不要
+        modified = datetime.fromtimestamp(version[0] / 1e9).isoformat()
+        if self.index.watermark is not None and modified <= self.index.watermark:
+            return []
+        
+        if self.context is not None:
+            jobs = self.context.get_or_load("jobs", version, lambda: list(iter_jobs(self.data_file)))
+        else:
+            jobs = iter_jobs(self.data_file)
+        return self.index.select(jobs, self.notification_threshold)
     
     def format_notification_message(self, jobs):
         """通知メッセージ作成"""
@@ -39,13 +96,16 @@ class UpworkNotifier:
 
 """
         
-        for job in sorted(jobs, key=lambda x: x['takawasi_score'], reverse=True):
+        # check_high_score_jobs の結果はスコア降順
+        for job in jobs:
+            selected = self.template_selector.select(job)
             message += f"""
 🎯 [{job['takawasi_score']:.1f}点] {job['title']}
 💰 予算: ${job['budget_amount']:.0f}/{job['budget_type']}
 👥 提案数: {job['proposals']}件
 ⭐ クライアント: {job['client_rating']:.1f}★ ({job['client_location']})
 📝 説明: {job['description'][:100]}...
+📄 推奨テンプレート: {selected[1]['name'] if selected else 'なし'}
 
 """
         
@@ -57,28 +117,42 @@ class UpworkNotifier:
         print(message)
         print("=" * 50)
     
-    def send_file_notification(self, message, filename="logs/notifications.log"):
-        """ファイル通知ログ"""
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
-        
-        with open(filename, 'a', encoding='utf-8') as f:
-            f.write(f"\n{'='*50}\n")
-            f.write(message)
-            f.write(f"\n{'='*50}\n")
+    def send_file_notification(self, message):
+        """ファイル通知ログ (開いたままのハンドルにバッファ書き込み)"""
+        self.notification_log.write(message)
+    
+    def send_email_notification(self, message, count):
+        """メール通知 (キュー投入のみ・集約と送信はディスパッチャーが実行)"""
+        self.dispatcher.submit(message, count)
     
-    def run_notification_check(self):
+    def close(self):
+        """未書き出しの通知ログと未送信メールを処理して終了"""
+        self.notification_log.close()
+        if self.dispatcher is not None:
+            self.dispatcher.close()
+    
+    def run_notification_check(self, candidates=None):
         """通知チェック実行"""
-        high_score_jobs = self.check_high_score_jobs()
+        high_score_jobs = self.check_high_score_jobs(candidates)
         
         if high_score_jobs:
             message = self.format_notification_message(high_score_jobs)
             self.send_terminal_notification(message)
             self.send_file_notification(message)
+            if self.dispatcher is not None:
+                self.send_email_notification(message, len(high_score_jobs))
+            self.index.record(high_score_jobs, self.checked_at)
             return True
         else:
+            self.index.record([], self.checked_at)
             print("📋 現在、通知対象の高スコア案件はありません")
             return False
 
 if __name__ == "__main__":
-    notifier = UpworkNotifier()
+    from scraper import load_settings
+    from job_store import open_job_store
+    
+    settings = load_settings()
+    notifier = UpworkNotifier(store=open_job_store(settings), settings=settings)
     notifier.run_notification_check()
+    notifier.close()
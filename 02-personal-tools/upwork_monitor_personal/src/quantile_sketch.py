@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+KLL分位点スケッチ
+件数によらず O(k) の記憶量で分位点を近似 (マージ可能・JSON保存可能)
+
+誤差 (Apache DataSketches KLL の経験式・99%信頼): 単一分位点の順位誤差 2.296 / k^0.9723
+      (k=200 で約1.33%)、全分位点同時では 2.446 / k^0.9433 (k=200 で約1.65%)
+      k を2倍にすると誤差はおよそ半分。件数が k 未満のうちは全値を保持するため厳密値
+      件数・合計・最小・最大は常に厳密
+"""
+
+import math
+import random
+from bisect import bisect_right
+from itertools import accumulate
+
+DEFAULT_K = 200
+
+def rank_error(k=DEFAULT_K, all_quantiles=False):
+    """順位誤差の上限目安 (割合)"""
+    if all_quantiles:
+        return 2.446 / k ** 0.9433
+    return 2.296 / k ** 0.9723
+
+class KLLSketch:
+    def __init__(self, k=DEFAULT_K, seed=None, c=2 / 3):
+        self.k = k
+        self.c = c
+        self.rng = random.Random(seed)
+        self.compactors = [[]]
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self._size = 0
+        self._max_size = self._capacity(0)
+
+    def _capacity(self, height):
+        """高さごとの容量 (上位ほど大きく、下位は k·c^depth)"""
+        depth = len(self.compactors) - height - 1
+        return max(int(math.ceil(self.k * self.c ** depth)), 2)
+
+    def _grow(self):
+        self.compactors.append([])
+        self._max_size = sum(self._capacity(h) for h in range(len(self.compactors)))
+
+    def update(self, value):
+        value = float(value)
+        self.compactors[0].append(value)
+        self._size += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        if self._size >= self._max_size:
+            self._compress()
+
+    def update_many(self, values):
+        for value in values:
+            self.update(value)
+        return self
+
+    def _compress(self):
+        """容量超過の段を整列して1つおきに上の段へ送る (重み2倍)"""
+        for height in range(len(self.compactors)):
+            items = self.compactors[height]
+            if len(items) >= self._capacity(height):
+                if height + 1 >= len(self.compactors):
+                    self._grow()
+                items.sort()
+                # 奇数個なら最大値を残す
+                keep = [items.pop()] if len(items) % 2 else []
+                offset = self.rng.random() < 0.5
+                self.compactors[height + 1].extend(items[offset::2])
+                self.compactors[height] = keep
+                self._size = sum(len(c) for c in self.compactors)
+                if self._size < self._max_size:
+                    break
+
+    def merge(self, other):
+        """別スケッチを取り込み (日別スケッチの期間合算用)"""
+        while len(self.compactors) < len(other.compactors):
+            self._grow()
+        for height, items in enumerate(other.compactors):
+            self.compactors[height].extend(items)
+        self._size = sum(len(c) for c in self.compactors)
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        while self._size >= self._max_size:
+            self._compress()
+        return self
+
+    def _weighted(self):
+        items = sorted((value, 1 << height)
+                       for height, compactor in enumerate(self.compactors)
+                       for value in compactor)
+        values = [value for value, _ in items]
+        cumulative = list(accumulate(weight for _, weight in items))
+        return values, cumulative
+
+    def quantiles(self, qs):
+        """複数分位点 (0〜1) を一括計算"""
+        if self.count == 0:
+            return [None for _ in qs]
+        values, cumulative = self._weighted()
+        total = cumulative[-1]
+        results = []
+        for q in qs:
+            if q <= 0:
+                results.append(self.min)
+            elif q >= 1:
+                results.append(self.max)
+            else:
+                i = bisect_right(cumulative, q * total - 1e-9)
+                results.append(values[min(i, len(values) - 1)])
+        return results
+
+    def quantile(self, q):
+        return self.quantiles([q])[0]
+
+    def rank(self, value):
+        """value 以下の割合 (0〜1)"""
+        if self.count == 0:
+            return 0.0
+        values, cumulative = self._weighted()
+        i = bisect_right(values, value)
+        return cumulative[i - 1] / cumulative[-1] if i else 0.0
+
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    @property
+    def exact(self):
+        """圧縮前 (全値保持) なら分位点は厳密"""
+        return len(self.compactors) == 1
+
+    def to_dict(self):
+        return {"k": self.k, "count": self.count, "total": self.total,
+                "min": self.min, "max": self.max, "compactors": self.compactors}
+
+    @classmethod
+    def from_dict(cls, data, seed=None):
+        sketch = cls(data["k"], seed=seed)
+        sketch.compactors = [list(items) for items in data["compactors"]]
+        sketch.count = data["count"]
+        sketch.total = data["total"]
+        sketch.min = data["min"]
+        sketch.max = data["max"]
+        sketch._size = sum(len(c) for c in sketch.compactors)
+        sketch._max_size = sum(sketch._capacity(h) for h in range(len(sketch.compactors)))
+        return sketch
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+レポート集計エンジン
+予算タイプ別のグループ集計1回で全レポート指標を算出し、データ版数ごとに結果をキャッシュ
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+import numpy as np
+
+@dataclass
+class ReportStats:
+    total_jobs: int
+    high_score_jobs: int
+    avg_score: float
+    hourly_stats: Dict
+    fixed_stats: Dict
+    competition: Dict
+    top_opportunities: List[Dict] = field(default_factory=list)
+    high_score_threshold: float = 70
+
+    def price_trends(self):
+        """analyze_price_trends と同じ形式"""
+        return {"hourly_stats": self.hourly_stats, "fixed_stats": self.fixed_stats}
+
+class ReportAggregator:
+    def __init__(self, high_score=70, low_competition=5, high_competition=20):
+        self.high_score = high_score
+        self.low_competition = low_competition
+        self.high_competition = high_competition
+        self._cache_key = None
+        self._cache = None
+
+    def cached(self, version):
+        """同じデータ版数の集計結果 (なければNone)"""
+        if version is not None and version == self._cache_key:
+            return self._cache
+        return None
+
+    def compute(self, df, version=None):
+        """全指標を1回のグループ集計で算出"""
+        grouped = df.assign(
+            _high_score=df['takawasi_score'] >= self.high_score,
+            _low=df['proposals'] < self.low_competition,
+            _high=df['proposals'] > self.high_competition
+        ).groupby('budget_type', observed=True).agg(
+            count=('budget_amount', 'size'),
+            mean=('budget_amount', 'mean'),
+            median=('budget_amount', 'median'),
+            max=('budget_amount', 'max'),
+            min=('budget_amount', 'min'),
+            score_sum=('takawasi_score', 'sum'),
+            high_score=('_high_score', 'sum'),
+            proposals_sum=('proposals', 'sum'),
+            low=('_low', 'sum'),
+            high=('_high', 'sum')
+        )
+
+        def budget_stats(budget_type, prefix):
+            if budget_type not in grouped.index:
+                return {"count": 0, f"avg_{prefix}": 0, f"median_{prefix}": 0,
+                        f"max_{prefix}": 0, f"min_{prefix}": 0}
+            row = grouped.loc[budget_type]
+            return {"count": int(row['count']), f"avg_{prefix}": row['mean'],
+                    f"median_{prefix}": row['median'], f"max_{prefix}": row['max'],
+                    f"min_{prefix}": row['min']}
+
+        total = int(grouped['count'].sum())
+        stats = ReportStats(
+            total_jobs=total,
+            high_score_jobs=int(grouped['high_score'].sum()),
+            high_score_threshold=self.high_score,
+            avg_score=grouped['score_sum'].sum() / total if total else 0.0,
+            hourly_stats=budget_stats('hourly', 'rate'),
+            fixed_stats=budget_stats('fixed', 'budget'),
+            competition={
+                "avg_proposals": grouped['proposals_sum'].sum() / total if total else 0.0,
+                "median_proposals": np.median(df['proposals'].to_numpy()) if total else 0.0,
+                "low_competition": int(grouped['low'].sum()),
+                "high_competition": int(grouped['high'].sum()),
+                "total_jobs": total
+            }
+        )
+
+        self._cache_key, self._cache = version, stats
+        return stats
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+レポート出力 (テキスト・Markdown・HTML・JSON)
+集計結果からレポートデータを1回だけ作成し、解析済みテンプレート (プロセス内で1回だけ解析) で各形式を並行出力
+"""
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from html import escape
+from string import Formatter
+
+FORMAT_EXTENSIONS = {"text": ".txt", "markdown": ".md", "html": ".html", "json": ".json"}
+
+# Markdownの表セルを壊す文字 (区切り・コード・改行)
+MARKDOWN_ESCAPES = str.maketrans({"\\": "\\\\", "|": "\\|", "`": "\\`", "\r": "", "\n": "<br>"})
+
+# 形式ごとの (本体, 注目案件1件分) テンプレート ({a.b} はレポートデータの入れ子参照)
+TEMPLATES = {
+    "text": ("""
+🎯 Upwork案件分析レポート
+Generated: {generated}
+
+📊 概要
+- 総案件数: {summary.total_jobs}
+- 高スコア案件 ({summary.high_score_threshold:g}点以上): {summary.high_score_jobs}
+- 平均スコア: {summary.avg_score:.1f}点
+
+💰 価格動向
+時間単価案件 ({hourly.count}件):
+- 平均時給: ${hourly.avg_rate:.0f}
+- 中央値: ${hourly.median_rate:.0f}
+- 範囲: ${hourly.min_rate:.0f} - ${hourly.max_rate:.0f}
+
+固定価格案件 ({fixed.count}件):
+- 平均予算: ${fixed.avg_budget:.0f}
+- 中央値: ${fixed.median_budget:.0f}
+
+🏁 競合状況
+- 平均提案数: {competition.avg_proposals:.1f}件
+- 低競合案件 (<5提案): {competition.low_competition}件
+- 高競合案件 (>20提案): {competition.high_competition}件
+
+🎯 注目案件 TOP 5:
+{items}""", """{rank}. [{takawasi_score:.1f}点] {title}
+   ${budget_amount:.0f}/{budget_type} | {proposals}提案 | {client_location}
+
+"""),
+    "markdown": ("""# 🎯 Upwork案件分析レポート
+
+Generated: {generated}
+
+## 📊 概要
+
+- 総案件数: {summary.total_jobs}
+- 高スコア案件 ({summary.high_score_threshold:g}点以上): {summary.high_score_jobs}
+- 平均スコア: {summary.avg_score:.1f}点
+
+## 💰 価格動向
+
+| 予算タイプ | 件数 | 平均 | 中央値 | 最小 | 最大 |
+|---|---:|---:|---:|---:|---:|
+| 時間単価 | {hourly.count} | ${hourly.avg_rate:.0f} | ${hourly.median_rate:.0f} | ${hourly.min_rate:.0f} | ${hourly.max_rate:.0f} |
+| 固定価格 | {fixed.count} | ${fixed.avg_budget:.0f} | ${fixed.median_budget:.0f} | ${fixed.min_budget:.0f} | ${fixed.max_budget:.0f} |
+
+## 🏁 競合状況
+
+- 平均提案数: {competition.avg_proposals:.1f}件
+- 低競合案件 (<5提案): {competition.low_competition}件
+- 高競合案件 (>20提案): {competition.high_competition}件
+
+## 🎯 注目案件 TOP 5
+
+| # | スコア | 案件 | 予算 | 提案数 | クライアント所在地 |
+|---:|---:|---|---|---:|---|
+{items}""", """| {rank} | {takawasi_score:.1f} | {title} | ${budget_amount:.0f}/{budget_type} | {proposals} | {client_location} |
+"""),
+    "html": ("""<!DOCTYPE html>
+<html lang="ja">
+<head>
+<meta charset="utf-8">
+<title>Upwork案件分析レポート</title>
+</head>
+<body>
+<h1>🎯 Upwork案件分析レポート</h1>
+<p>Generated: {generated}</p>
+<h2>📊 概要</h2>
+<ul>
+<li>総案件数: {summary.total_jobs}</li>
+<li>高スコア案件 ({summary.high_score_threshold:g}点以上): {summary.high_score_jobs}</li>
+<li>平均スコア: {summary.avg_score:.1f}点</li>
+</ul>
+<h2>💰 価格動向</h2>
+<table>
+<tr><th>予算タイプ</th><th>件数</th><th>平均</th><th>中央値</th><th>最小</th><th>最大</th></tr>
+<tr><td>時間単価</td><td>{hourly.count}</td><td>${hourly.avg_rate:.0f}</td><td>${hourly.median_rate:.0f}</td><td>${hourly.min_rate:.0f}</td><td>${hourly.max_rate:.0f}</td></tr>
+<tr><td>固定価格</td><td>{fixed.count}</td><td>${fixed.avg_budget:.0f}</td><td>${fixed.median_budget:.0f}</td><td>${fixed.min_budget:.0f}</td><td>${fixed.max_budget:.0f}</td></tr>
+</table>
+<h2>🏁 競合状況</h2>
+<ul>
+<li>平均提案数: {competition.avg_proposals:.1f}件</li>
+<li>低競合案件 (&lt;5提案): {competition.low_competition}件</li>
+<li>高競合案件 (&gt;20提案): {competition.high_competition}件</li>
+</ul>
+<h2>🎯 注目案件 TOP 5</h2>
+<table>
+<tr><th>#</th><th>スコア</th><th>案件</th><th>予算</th><th>提案数</th><th>クライアント所在地</th></tr>
+{items}</table>
+</body>
+</html>
+""", """<tr><td>{rank}</td><td>{takawasi_score:.1f}</td><td>{title}</td><td>${budget_amount:.0f}/{budget_type}</td><td>{proposals}</td><td>{client_location}</td></tr>
+"""),
+}
+
+# 表示する注目案件の項目
+TOP_FIELDS = ("takawasi_score", "title", "budget_amount", "budget_type", "proposals", "client_location")
+
+def _plain(value):
+    """numpyスカラー → Python標準の数値 (JSON出力用)"""
+    return value.item() if hasattr(value, "item") else value
+
+def report_data(stats, generated=None, top=5):
+    """集計結果 → 全形式共通のレポートデータ"""
+    generated = generated or datetime.now()
+    return {
+        "generated": generated.strftime('%Y-%m-%d %H:%M:%S'),
+        "summary": {"total_jobs": stats.total_jobs, "high_score_jobs": stats.high_score_jobs,
+                    "high_score_threshold": stats.high_score_threshold,
+                    "avg_score": _plain(stats.avg_score)},
+        "hourly": {key: _plain(value) for key, value in stats.hourly_stats.items()},
+        "fixed": {key: _plain(value) for key, value in stats.fixed_stats.items()},
+        "competition": {key: _plain(value) for key, value in stats.competition.items()},
+        "top_opportunities": [dict({key: _plain(job[key]) for key in TOP_FIELDS}, rank=rank)
+                              for rank, job in enumerate(stats.top_opportunities[:top], 1)],
+    }
+
+def _compile(source):
+    """テンプレート → (固定文字列, 参照キー列, 書式) の部品列"""
+    parts = []
+    for literal, field, spec, _ in Formatter().parse(source):
+        parts.append((literal, tuple(field.split(".")) if field else None, spec))
+    return parts
+
+@lru_cache(maxsize=None)
+def compile_template(fmt):
+    """形式ごとのテンプレートを解析 (プロセス内で1回)"""
+    body, item = TEMPLATES[fmt]
+    return _compile(body), _compile(item)
+
+def _fill(parts, data, quote):
+    out = []
+    for literal, path, spec in parts:
+        out.append(literal)
+        if path is None:
+            continue
+        value = data
+        for key in path:
+            value = value[key]
+        text = format(value, spec)
+        out.append(text if path == ("items",) else quote(text))
+    return "".join(out)
+
+def render_report(data, fmt="text"):
+    """レポートデータ → 指定形式の文字列"""
+    if fmt == "json":
+        return json.dumps(data, ensure_ascii=False, indent=2)
+
+    body, item = compile_template(fmt)
+    if fmt == "html":
+        quote = escape
+    elif fmt == "markdown":
+        quote = lambda text: text.translate(MARKDOWN_ESCAPES)
+    else:
+        quote = str
+    items = "".join(_fill(item, job, quote) for job in data["top_opportunities"])
+    return _fill(body, dict(data, items=items), quote)
+
+class ReportRenderer:
+    def __init__(self, analyzer, formats=("text",), output_dir="reports", basename="daily_report"):
+        if not formats:
+            raise ValueError("レポート形式が指定されていません (reports.formats)")
+        unknown = set(formats) - set(FORMAT_EXTENSIONS)
+        if unknown:
+            raise ValueError(f"未対応のレポート形式: {', '.join(sorted(unknown))}")
+        self.analyzer = analyzer
+        self.formats = list(formats)
+        self.output_dir = output_dir
+        self.basename = basename
+        self.stats = {"renders": 0, "skipped": 0}
+        self._rendered_version = None
+
+    def paths(self):
+        return {fmt: os.path.join(self.output_dir, self.basename + FORMAT_EXTENSIONS[fmt])
+                for fmt in self.formats}
+
+    def write(self, force=False):
+        """全形式を並行出力 (前回出力からデータ版数が変わっていなければ何もしない)"""
+        paths = self.paths()
+        # 採点ルール (閾値) が再読み込みされた場合も出力し直す
+        version = (self.analyzer.data_version(), self.analyzer.refresh_rules())
+        if (not force and version[0] is not None and version == self._rendered_version
+                and all(os.path.exists(path) for path in paths.values())):
+            self.stats["skipped"] += 1
+            print("⏭️  データ更新なし: レポート出力をスキップ")
+            return paths
+
+        stats = self.analyzer.compute_stats()
+        if stats is None:
+            print("⚠️  データが見つかりません: レポート出力をスキップ")
+            return {}
+
+        data = report_data(stats)
+        os.makedirs(self.output_dir, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=len(paths)) as pool:
+            list(pool.map(lambda fmt: _write_atomic(paths[fmt], render_report(data, fmt)), paths))
+
+        self._rendered_version = version
+        self.stats["renders"] += 1
+        print(f"✅ レポート保存完了: {', '.join(paths.values())}")
+        return paths
+
+def _write_atomic(filename, content):
+    """一時ファイルに書いてから置き換え (読み手が書きかけを見ない)"""
+    tmp = filename + ".tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp, filename)
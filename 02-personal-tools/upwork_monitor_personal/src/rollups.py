@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+日次・週次ロールアップ
+投稿日×キーワード×予算タイプ単位の集計表をSQLiteに保持し、収集サイクル毎に影響した期間だけ再集計
+"""
+
+import json
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from skill_matcher import SkillMatcher
+from quantile_sketch import KLLSketch, DEFAULT_K
+
+ALL_KEYWORDS = "*"  # キーワード横断の集計行
+
+ROLLUP_TABLES = {"daily": "daily_rollups", "weekly": "weekly_rollups"}
+
+ROLLUP_COLUMNS = ["period_start", "keyword", "budget_type", "jobs",
+                  "amount_avg", "amount_p25", "amount_p50", "amount_p75", "amount_p90",
+                  "proposals_avg", "score_avg",
+                  "score_low", "score_medium", "score_high", "score_notify", "updated_at"]
+
+ROLLUP_SCHEMA = """
+CREATE TABLE IF NOT EXISTS {table} (
+    period_start TEXT NOT NULL,
+    keyword TEXT NOT NULL,
+    budget_type TEXT NOT NULL,
+    jobs INTEGER NOT NULL,
+    amount_avg REAL NOT NULL,
+    amount_p25 REAL NOT NULL,
+    amount_p50 REAL NOT NULL,
+    amount_p75 REAL NOT NULL,
+    amount_p90 REAL NOT NULL,
+    proposals_avg REAL NOT NULL,
+    score_avg REAL NOT NULL,
+    score_low INTEGER NOT NULL,
+    score_medium INTEGER NOT NULL,
+    score_high INTEGER NOT NULL,
+    score_notify INTEGER NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (period_start, keyword, budget_type)
+);
+"""
+
+# 日別スケッチの指標 (時給・固定予算・提案数)
+SKETCH_METRICS = ("hourly_rate", "fixed_budget", "proposals")
+
+SKETCH_SCHEMA = """
+CREATE TABLE IF NOT EXISTS daily_sketches (
+    day TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    sketch TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (day, metric)
+);
+"""
+
+# 集計方法を変えた場合は上げる (記録済みの版と異なれば起動時に全期間を再構築)
+ROLLUP_VERSION = 1
+
+META_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rollup_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+def posted_date(posted):
+    """投稿日文字列 → date (日付として読めなければNone)"""
+    try:
+        return date.fromisoformat(str(posted)[:10])
+    except ValueError:
+        return None
+
+def week_start(day):
+    """週の開始日 (月曜日)"""
+    return day - timedelta(days=day.weekday())
+
+class JobRollups:
+    def __init__(self, store, keywords=(), thresholds=None, sketch_k=DEFAULT_K):
+        self.conn = store.conn
+        self.sketch_k = sketch_k
+        self.matcher = SkillMatcher(keywords)
+        self.set_thresholds(thresholds)
+
+        for table in ROLLUP_TABLES.values():
+            self.conn.executescript(ROLLUP_SCHEMA.format(table=table))
+        self.conn.executescript(SKETCH_SCHEMA)
+        self.conn.executescript(META_SCHEMA)
+
+    def set_thresholds(self, thresholds):
+        """スコア分布の区切り (以降に再集計する期間から反映)"""
+        thresholds = thresholds or {}
+        self.medium_score = thresholds.get("medium_priority", 50)
+        self.high_score = thresholds.get("high_priority", 70)
+        self.notify_score = thresholds.get("notification", 80)
+
+    def needs_rebuild(self):
+        """未構築または集計の版が古い (集計表が空かどうかでは判定しない・日付のない案件だけでも空のため)"""
+        row = self.conn.execute("SELECT value FROM rollup_meta WHERE key = 'version'").fetchone()
+        return row is None or int(row[0]) != ROLLUP_VERSION
+
+    def update(self, jobs):
+        """新規・変更案件の投稿日を含む日・週のみ再集計"""
+        days = set()
+        for job in jobs:
+            day = posted_date(job['posted'] if isinstance(job, dict) else job.posted)
+            if day is not None:
+                days.add(day)
+        return self._refresh_days(days)
+
+    def rebuild(self):
+        """全期間の再構築 (初回・移行用)"""
+        days = {posted_date(row[0]) for row in self.conn.execute("SELECT DISTINCT posted FROM jobs")}
+        days.discard(None)
+        with self.conn:
+            for table in list(ROLLUP_TABLES.values()) + ["daily_sketches"]:
+                self.conn.execute(f"DELETE FROM {table}")
+        refreshed = self._refresh_days(days)
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO rollup_meta (key, value) VALUES ('version', ?)",
+                              (str(ROLLUP_VERSION),))
+        return refreshed
+
+    def _refresh_days(self, days):
+        weeks = {week_start(day) for day in days}
+        now = datetime.now().isoformat()
+        with self.conn:
+            for day in sorted(days):
+                self._refresh("daily_rollups", day, day + timedelta(days=1), now)
+                self._refresh_sketches(day, now)
+            for week in sorted(weeks):
+                self._refresh("weekly_rollups", week, week + timedelta(days=7), now)
+        return len(days) + len(weeks)
+
+    def _refresh(self, table, start, end, now):
+        """1期間分の集計行を案件テーブルから作り直す"""
+        rows = self.conn.execute(
+            "SELECT title, description, skills, budget_type, budget_amount, proposals, takawasi_score "
+            "FROM jobs WHERE posted >= ? AND posted < ?", (start.isoformat(), end.isoformat()))
+
+        groups = defaultdict(list)
+        for row in rows:
+            text = f"{row['title']} {row['description']} {' '.join(json.loads(row['skills']))}"
+            values = (row['budget_amount'], row['proposals'], row['takawasi_score'])
+            groups[(ALL_KEYWORDS, row['budget_type'])].append(values)
+            for keyword in self.matcher.matches(text):
+                groups[(keyword, row['budget_type'])].append(values)
+
+        self.conn.execute(f"DELETE FROM {table} WHERE period_start = ?", (start.isoformat(),))
+        self.conn.executemany(
+            f"INSERT INTO {table} ({', '.join(ROLLUP_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(ROLLUP_COLUMNS))})",
+            [self._summarize(start, keyword, budget_type, values, now)
+             for (keyword, budget_type), values in groups.items()])
+
+    def _refresh_sketches(self, day, now):
+        """1日分の指標スケッチを案件テーブルから作り直す (同じ日なら同じ結果になるよう日付でシード固定)"""
+        seed = day.toordinal()
+        sketches = {metric: KLLSketch(self.sketch_k, seed=seed) for metric in SKETCH_METRICS}
+        rows = self.conn.execute(
+            "SELECT budget_type, budget_amount, proposals FROM jobs WHERE posted >= ? AND posted < ?",
+            (day.isoformat(), (day + timedelta(days=1)).isoformat()))
+        for row in rows:
+            metric = "hourly_rate" if row['budget_type'] == "hourly" else "fixed_budget"
+            sketches[metric].update(row['budget_amount'])
+            sketches["proposals"].update(row['proposals'])
+
+        self.conn.execute("DELETE FROM daily_sketches WHERE day = ?", (day.isoformat(),))
+        self.conn.executemany(
+            "INSERT INTO daily_sketches (day, metric, count, sketch, updated_at) VALUES (?, ?, ?, ?, ?)",
+            [(day.isoformat(), metric, sketch.count, json.dumps(sketch.to_dict()), now)
+             for metric, sketch in sketches.items() if sketch.count])
+
+    def merged_sketch(self, metric, since=None, until=None):
+        """期間内の日別スケッチを合算 (1行ずつ取り込むため記憶量は期間の長さによらず一定)"""
+        sql, params = "SELECT sketch FROM daily_sketches WHERE metric = ?", [metric]
+        if since is not None:
+            sql += " AND day >= ?"
+            params.append(since.isoformat())
+        if until is not None:
+            sql += " AND day <= ?"
+            params.append(until.isoformat())
+
+        merged = KLLSketch(self.sketch_k, seed=0)
+        for row in self.conn.execute(sql + " ORDER BY day", params):
+            merged.merge(KLLSketch.from_dict(json.loads(row['sketch'])))
+        return merged
+
+    def latest_day(self):
+        latest = self.conn.execute("SELECT MAX(day) FROM daily_sketches").fetchone()[0]
+        return date.fromisoformat(latest) if latest else None
+
+    def _summarize(self, start, keyword, budget_type, values, now):
+        amounts, proposals, scores = np.array(values, dtype=np.float64).T
+        p25, p50, p75, p90 = np.percentile(amounts, [25, 50, 75, 90])
+        return [start.isoformat(), keyword, budget_type, len(amounts),
+                float(amounts.mean()), float(p25), float(p50), float(p75), float(p90),
+                float(proposals.mean()), float(scores.mean()),
+                int((scores < self.medium_score).sum()),
+                int(((scores >= self.medium_score) & (scores < self.high_score)).sum()),
+                int(((scores >= self.high_score) & (scores < self.notify_score)).sum()),
+                int((scores >= self.notify_score).sum()), now]
+
+    def trends(self, period="weekly", since=None, keyword=ALL_KEYWORDS, budget_type=None):
+        """ロールアップ行の時系列 (期間開始日順のDataFrame)"""
+        conditions, params = ["keyword = ?"], [keyword]
+        if since is not None:
+            conditions.append("period_start >= ?")
+            params.append(since.isoformat())
+        if budget_type is not None:
+            conditions.append("budget_type = ?")
+            params.append(budget_type)
+
+        return pd.read_sql_query(
+            f"SELECT * FROM {ROLLUP_TABLES[period]} WHERE {' AND '.join(conditions)} "
+            f"ORDER BY period_start, budget_type", self.conn, params=params)
+
+    def keyword_totals(self, period="weekly", since=None):
+        """キーワード別の案件数合計"""
+        sql = f"SELECT keyword, SUM(jobs) AS jobs FROM {ROLLUP_TABLES[period]}"
+        params = []
+        if since is not None:
+            sql += " WHERE period_start >= ?"
+            params.append(since.isoformat())
+        sql += " GROUP BY keyword ORDER BY jobs DESC"
+        return {row['keyword']: row['jobs'] for row in self.conn.execute(sql, params)}
+
+    def latest_period(self, period="weekly"):
+        """最新の期間開始日"""
+        latest = self.conn.execute(f"SELECT MAX(period_start) FROM {ROLLUP_TABLES[period]}").fetchone()[0]
+        return date.fromisoformat(latest) if latest else None
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+takawasiスコア 採点ルール
+settings.json の閾値・価格帯・配点・重みを1回だけ評価表にコンパイルし、1件採点と一括採点で共有
+設定ファイルが更新されたら次の参照時に再コンパイル (常駐モードを止めずに反映)
+"""
+
+import copy
+import json
+from functools import lru_cache
+
+import numpy as np
+
+from skill_matcher import SkillMatcher
+from job_context import file_version
+
+# takawasiスコア対象スキル
+TARGET_SKILLS = ["python", "ai", "machine learning", "wsl", "linux", "automation", "data"]
+
+# 既定ルール (budget_preferences の希望価格帯が各予算タイプの先頭の帯になる)
+DEFAULT_SCORING = {
+    "skills": {"keywords": TARGET_SKILLS, "points_per_match": 6, "max_points": 40},
+    "hourly": {"preferred_points": 30,
+               "bands": [{"min": 50, "max": 250, "points": 20}], "default": 10},
+    "fixed": {"preferred_points": 25,
+              "bands": [{"min": 200, "points": 20}], "default": 10},
+    "competition": {"bands": [{"below": 5, "points": 20}, {"below": 15, "points": 15},
+                              {"below": 25, "points": 10}], "default": 5},
+    "client": {"bands": [{"min": 4.5, "points": 10}, {"min": 4.0, "points": 7}], "default": 3},
+    "weights": {"skill": 1, "price": 1, "competition": 1, "client": 1},
+    "max_score": 100
+}
+
+DEFAULT_THRESHOLDS = {"notification": 80, "high_priority": 70, "medium_priority": 50}
+DEFAULT_BUDGET = {"hourly_min": 65, "hourly_max": 200, "fixed_min": 500}
+
+def _compile_bands(section):
+    """帯の定義 → ((下限, 上限, 上限を含むか, 配点), ...) と該当なし時の配点"""
+    bands = []
+    for band in section.get("bands", []):
+        if "below" in band:
+            upper, inclusive = band["below"], False
+        else:
+            upper, inclusive = band.get("max", float("inf")), True
+        bands.append((band.get("min", float("-inf")), upper, inclusive, band["points"]))
+    return tuple(bands), section.get("default", 0)
+
+def _band_points(value, bands, default):
+    for lower, upper, inclusive, points in bands:
+        if lower <= value and (value <= upper if inclusive else value < upper):
+            return points
+    return default
+
+def _band_points_array(values, bands, default):
+    if not bands:
+        return np.full(len(values), default)
+    conditions = [(values >= lower) & ((values <= upper) if inclusive else (values < upper))
+                  for lower, upper, inclusive, _ in bands]
+    return np.select(conditions, [points for *_, points in bands], default=default)
+
+class ScoringRules:
+    def __init__(self, scoring=None, thresholds=None, budget=None):
+        # セクション単位で既定値とマージ (一部のキーだけの上書きでも他のキーは既定値)
+        overrides = scoring or {}
+        scoring = {key: ({**default, **overrides.get(key, {})} if isinstance(default, dict)
+                         else overrides.get(key, default))
+                   for key, default in copy.deepcopy(DEFAULT_SCORING).items()}
+        thresholds = dict(DEFAULT_THRESHOLDS, **(thresholds or {}))
+        budget = dict(DEFAULT_BUDGET, **(budget or {}))
+
+        self.notification_threshold = thresholds["notification"]
+        self.high_priority = thresholds["high_priority"]
+        self.medium_priority = thresholds["medium_priority"]
+        self.thresholds = thresholds
+
+        skills = scoring["skills"]
+        self.matcher = SkillMatcher(skills["keywords"])
+        self.points_per_match = skills["points_per_match"]
+        self.max_skill_points = skills["max_points"]
+
+        # 希望価格帯を先頭に追加してから帯を評価表に変換
+        hourly = dict(scoring["hourly"], bands=[
+            {"min": budget["hourly_min"], "max": budget["hourly_max"],
+             "points": scoring["hourly"]["preferred_points"]}] + scoring["hourly"].get("bands", []))
+        fixed = dict(scoring["fixed"], bands=[
+            {"min": budget["fixed_min"], "points": scoring["fixed"]["preferred_points"]}]
+            + scoring["fixed"].get("bands", []))
+        self.hourly = _compile_bands(hourly)
+        self.fixed = _compile_bands(fixed)
+        self.competition = _compile_bands(scoring["competition"])
+        self.client = _compile_bands(scoring["client"])
+
+        weights = scoring["weights"]
+        self.weights = tuple(weights.get(key, 1) for key in ("skill", "price", "competition", "client"))
+        self.max_score = scoring["max_score"]
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls(settings.get("scoring"), settings.get("score_thresholds"),
+                   settings.get("budget_preferences"))
+
+    def score(self, job):
+        """1件採点 (100点満点)"""
+        matches = self.matcher.count(f"{job.title} {job.description}")
+        skill = min(matches * self.points_per_match, self.max_skill_points)
+        price = _band_points(job.budget_amount, *(self.hourly if job.budget_type == "hourly" else self.fixed))
+        competition = _band_points(job.proposals, *self.competition)
+        client = _band_points(job.client_rating, *self.client)
+
+        w_skill, w_price, w_competition, w_client = self.weights
+        total = skill * w_skill + price * w_price + competition * w_competition + client * w_client
+        return min(total, self.max_score)
+
+    def score_components(self, texts, hourly, amount, proposals, rating):
+        """項目別スコアを配列で一括計算 (score と同じ評価表)"""
+        matches = np.fromiter((self.matcher.count(t) for t in texts), dtype=np.int64, count=len(texts))
+        w_skill, w_price, w_competition, w_client = self.weights
+        return {
+            "skill": np.minimum(matches * self.points_per_match, self.max_skill_points) * w_skill,
+            "price": np.where(hourly, _band_points_array(amount, *self.hourly),
+                              _band_points_array(amount, *self.fixed)) * w_price,
+            "competition": _band_points_array(proposals, *self.competition) * w_competition,
+            "client": _band_points_array(rating, *self.client) * w_client
+        }
+
+    def score_array(self, components):
+        return np.minimum(sum(components.values()), self.max_score).astype(np.float64)
+
+class ScoringRulesLoader:
+    def __init__(self, settings_file=None, settings=None):
+        """settings_file 指定時は更新を監視、未指定時は settings 固定のルール"""
+        self.settings_file = settings_file
+        self.version = file_version(settings_file) if settings_file else None
+        if settings is None and settings_file:
+            settings = self._read()
+        self.rules = ScoringRules.from_settings(settings or {})
+        self.reloads = 0
+
+    def _read(self):
+        try:
+            with open(self.settings_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def current(self):
+        """最新のルール (設定ファイルの更新時刻・サイズが変わっていれば再コンパイル)"""
+        if self.settings_file is None:
+            return self.rules
+
+        version = file_version(self.settings_file)
+        if version == self.version:
+            return self.rules
+
+        self.version = version
+        try:
+            self.rules = ScoringRules.from_settings(self._read())
+        except (ValueError, KeyError, TypeError) as e:
+            # 書きかけ・記述ミスは現在のルールを維持
+            print(f"⚠️  採点ルールの再読み込みに失敗 (現在のルールを継続): {e}")
+            return self.rules
+        self.reloads += 1
+        print(f"🔄 採点ルール再読み込み: {self.settings_file}")
+        return self.rules
+
+@lru_cache(maxsize=None)
+def default_rules():
+    """既定ルール (設定なし)"""
+    return ScoringRules()
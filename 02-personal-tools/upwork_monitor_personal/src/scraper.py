@@ -14,6 +14,21 @@ from dataclasses import dataclass, asdict
 from typing import List, Dict
 import os
 
+from scoring_rules import ScoringRulesLoader
+from fingerprint import ChangeDetector
+from http_cache import install_cache
+from rollups import JobRollups
+from job_stream import iter_jobs, write_jobs
+from job_context import file_version
+
+def load_settings(settings_file: str = "config/settings.json") -> Dict:
+    """設定ファイル読み込み (存在しない場合は空設定)"""
+    try:
+        with open(settings_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
 @dataclass
 class UpworkJob:
     id: str
@@ -30,60 +45,81 @@ class UpworkJob:
     takawasi_score: float = 0.0
     
 class UpworkScraper:
-    def __init__(self):
-        self.search_keywords = ["python", "ai", "machine learning", "automation", "wsl", "linux", "data analysis"]
+    SEARCH_URL = "https://www.upwork.com/nx/search/jobs/"
+    
+    def __init__(self, settings_file: str = "config/settings.json", store=None, context=None, scoring=None):
+        self.settings = load_settings(settings_file)
+        self.store = store
+        self.context = context
+        # 採点ルール (設定ファイル更新時は収集サイクル開始時に再読み込み)
+        self.scoring = scoring or ScoringRulesLoader(settings_file)
+        self.rules = self.scoring.current()
+        self.change_detector = ChangeDetector(store)
+        self.last_changed = []
+        self.cycle_stats = {"processed": 0, "skipped": 0}
+        self.search_keywords = self.settings.get(
+            "search_keywords",
+            ["python", "ai", "machine learning", "automation", "wsl", "linux", "data analysis"])
+        
+        # 収集設定 (mode: sample / serial / async)
+        collection = self.settings.get("collection", {})
+        self.collection_mode = collection.get("mode", "sample")
+        self.search_url = collection.get("search_url", self.SEARCH_URL)
+        self.pages_per_keyword = collection.get("pages_per_keyword", 2)
+        self.request_timeout = collection.get("timeout", 15)
+        self.max_connections = collection.get("max_connections", 16)
+        self.per_host_limit = collection.get("per_host_limit", 8)
+        
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
         
+        # HTTPキャッシュ (ETag/Last-Modified 条件付きリクエスト)
+        self.http_cache = None
+        cache_settings = self.settings.get("http_cache", {})
+        if cache_settings.get("enabled", False):
+            self.http_cache = install_cache(self.session,
+                                            cache_settings.get("cache_dir", "data/http_cache"),
+                                            cache_settings.get("max_mb", 100) * 1024 * 1024)
+        
+        # JSON保存形式 (json: 整形JSON / jsonl: 1行1件)
+        self.json_format = self.settings.get("storage", {}).get("json_format", "json")
+        
+        # 日次・週次ロールアップ (SQLiteストア使用時のみ)
+        self.rollups = None
+        if store is not None:
+            self.rollups = JobRollups(store, self.search_keywords,
+                                      self.rules.thresholds,
+                                      self.settings.get("analysis", {}).get("sketch_k", 200))
+            if self.rollups.needs_rebuild():
+                refreshed = self.rollups.rebuild()
+                if refreshed:
+                    print(f"📦 ロールアップ初期構築: {refreshed} 期間")
+        
     def calculate_takawasi_score(self, job: UpworkJob) -> float:
         """takawasi適合度スコア計算 (100点満点)"""
-        score = 0
-        
-        # スキル適合度 (40点満点)
-        target_skills = ["python", "ai", "machine learning", "wsl", "linux", "automation", "data"]
-        skill_matches = sum(1 for skill in target_skills 
-                          if any(s.lower() in job.title.lower() + job.description.lower() 
-                                for s in [skill]))
-        score += min(skill_matches * 6, 40)
-        
-        # 価格適合度 (30点満点) 
-        if job.budget_type == "hourly":
-            rate = job.budget_amount
-            if 65 <= rate <= 200:
-                score += 30
-            elif 50 <= rate < 65 or 200 < rate <= 250:
-                score += 20
-            else:
-                score += 10
-        else:  # fixed
-            if job.budget_amount >= 500:
-                score += 25
-            elif job.budget_amount >= 200:
-                score += 20
-            else:
-                score += 10
-                
-        # 競合状況 (20点満点)
-        if job.proposals < 5:
-            score += 20
-        elif job.proposals < 15:
-            score += 15
-        elif job.proposals < 25:
-            score += 10
-        else:
-            score += 5
-            
-        # クライアント品質 (10点満点)
-        if job.client_rating >= 4.5:
-            score += 10
-        elif job.client_rating >= 4.0:
-            score += 7
-        else:
-            score += 3
-            
-        return min(score, 100)
+        return self.rules.score(job)
+    
+    def refresh_rules(self):
+        """採点ルールの更新確認 (変更があればTrue)"""
+        rules = self.scoring.current()
+        if rules is self.rules:
+            return False
+        self.rules = rules
+        if self.rollups is not None:
+            self.rollups.set_thresholds(rules.thresholds)
+        return True
+    
+    def rescore_store(self):
+        """保存済み全案件を現在のルールで再採点し、ロールアップを全期間再構築"""
+        from batch_scorer import apply_scores  # batch_scorer → job_batch → scraper の循環を避ける
+        
+        jobs = apply_scores(self.load_jobs(), self.rules)
+        self.store.upsert_jobs(jobs)
+        refreshed = self.rollups.rebuild()
+        print(f"♻️  採点ルール変更: 保存済み {len(jobs)} 件を再採点・ロールアップ {refreshed} 期間を再構築")
+        return len(jobs)
     
     def create_sample_jobs(self) -> List[UpworkJob]:
         """サンプル案件データ生成 (デモ・テスト用)"""
@@ -161,31 +197,93 @@ class UpworkScraper:
             
         return sample_jobs
     
+    def parse_search_page(self, html) -> List[UpworkJob]:
+        """検索結果ページ解析 (job-tile単位で案件抽出)"""
+        soup = BeautifulSoup(html, 'html.parser')
+        jobs = []
+        
+        for tile in soup.select('article.job-tile'):
+            title = tile.select_one('.job-title')
+            description = tile.select_one('.job-description')
+            location = tile.select_one('.client-location')
+            
+            jobs.append(UpworkJob(
+                id=tile.get('data-job-id', ''),
+                title=title.get_text(strip=True) if title else "",
+                description=description.get_text(strip=True) if description else "",
+                budget_type=tile.get('data-budget-type', 'fixed'),
+                budget_amount=float(tile.get('data-budget-amount', 0) or 0),
+                skills=[s.get_text(strip=True) for s in tile.select('.job-skill')],
+                posted=tile.get('data-posted', ''),
+                proposals=int(tile.get('data-proposals', 0) or 0),
+                client_rating=float(tile.get('data-client-rating', 0) or 0),
+                client_spent=float(tile.get('data-client-spent', 0) or 0),
+                client_location=location.get_text(strip=True) if location else ""
+            ))
+            
+        return jobs
+    
+    def fetch_search_page(self, keyword: str, page: int, session=None) -> List[UpworkJob]:
+        """検索結果1ページ取得・解析"""
+        session = session or self.session
+        response = session.get(self.search_url,
+                               params={"q": keyword, "page": page},
+                               timeout=self.request_timeout)
+        response.raise_for_status()
+        return self.parse_search_page(response.content)
+    
+    def merge_jobs(self, pages: List[List[UpworkJob]]) -> List[UpworkJob]:
+        """ページ結果統合 (案件IDで重複除去・取得順維持)"""
+        merged = {}
+        for page_jobs in pages:
+            for job in page_jobs:
+                if job.id and job.id not in merged:
+                    merged[job.id] = job
+        return list(merged.values())
+    
+    def collect_jobs(self, keywords: List[str] = None) -> List[UpworkJob]:
+        """全キーワード逐次取得"""
+        pages = []
+        for keyword in keywords or self.search_keywords:
+            for page in range(1, self.pages_per_keyword + 1):
+                try:
+                    pages.append(self.fetch_search_page(keyword, page))
+                except requests.RequestException as e:
+                    print(f"⚠️  取得失敗: {keyword} p{page} ({e})")
+        return self.merge_jobs(pages)
+    
+    def collect_jobs_async(self, keywords: List[str] = None) -> List[UpworkJob]:
+        """全キーワード同時取得 (非同期収集エンジン)"""
+        from async_collector import AsyncCollector
+        
+        collector = AsyncCollector(self,
+                                   max_connections=self.max_connections,
+                                   per_host_limit=self.per_host_limit)
+        return collector.run(keywords or self.search_keywords)
+    
     def save_jobs(self, jobs: List[UpworkJob], filename: str = "data/jobs.json"):
-        """案件データ保存"""
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        """案件データ保存 (ストア設定時は案件単位upsert)"""
+        if self.store is not None:
+            saved = self.store.upsert_jobs(jobs)
+            print(f"✅ {saved} jobs saved to {self.store.db_file}")
+            return
         
-        jobs_data = {
-            "last_updated": datetime.datetime.now().isoformat(),
-            "total_jobs": len(jobs),
-            "jobs": [asdict(job) for job in jobs]
-        }
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        write_jobs(jobs, filename, self.json_format)
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(jobs_data, f, indent=2, ensure_ascii=False)
+        # 分析・通知が再読み込みしないよう手元のデータを共有
+        if self.context is not None:
+            self.context.publish("jobs", file_version(filename), [asdict(job) for job in jobs])
             
         print(f"✅ {len(jobs)} jobs saved to {filename}")
     
     def load_jobs(self, filename: str = "data/jobs.json") -> List[UpworkJob]:
         """保存済み案件データ読み込み"""
+        if self.store is not None:
+            return [UpworkJob(**job_data) for job_data in self.store.load_jobs()]
+        
         try:
-            with open(filename, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
-            jobs = []
-            for job_data in data['jobs']:
-                job = UpworkJob(**job_data)
-                jobs.append(job)
+            jobs = [UpworkJob(**job_data) for job_data in iter_jobs(filename)]
                 
             print(f"✅ {len(jobs)} jobs loaded from {filename}")
             return jobs
@@ -193,29 +291,68 @@ class UpworkScraper:
             print(f"⚠️  File {filename} not found")
             return []
     
-    def run_collection(self):
+    def run_collection(self, mode: str = None):
         """案件収集実行"""
-        print("🔍 Upwork案件収集開始...")
+        mode = mode or self.collection_mode
+        print(f"🔍 Upwork案件収集開始... (mode: {mode})")
+        rules_changed = self.refresh_rules()
         
-        # 現在はサンプルデータを使用 (実際のスクレイピングは後で実装)
-        jobs = self.create_sample_jobs()
+        if mode == "async":
+            jobs = self.collect_jobs_async()
+        elif mode == "serial":
+            jobs = self.collect_jobs()
+        else:
+            # サンプルデータ (デモ・テスト用)
+            jobs = self.create_sample_jobs()
+        
+        # 新規・変更案件のみ採点 (未変更案件は保存済みスコアを使用)
+        changed, unchanged = self.change_detector.split(jobs)
+        if rules_changed:
+            # 採点ルール変更時は未変更案件も再採点して保存し直す
+            changed, unchanged = changed + unchanged, []
+        for job in changed:
+            job.takawasi_score = self.calculate_takawasi_score(job)
+        self.last_changed = changed
+        self.cycle_stats = {"processed": len(changed), "skipped": len(unchanged)}
         
         # 高スコア案件のフィルタリング
-        high_score_jobs = [job for job in jobs if job.takawasi_score >= 70]
+        high_score = self.rules.high_priority
+        high_score_jobs = [job for job in jobs if job.takawasi_score >= high_score]
         
-        print(f"📊 収集結果: {len(jobs)} 案件中 {len(high_score_jobs)} 案件が高スコア (70点以上)")
+        print(f"📊 収集結果: {len(jobs)} 案件中 {len(high_score_jobs)} 案件が高スコア ({high_score}点以上)")
+        print(f"🔁 変更検知: 処理 {self.cycle_stats['processed']} 件 / スキップ {self.cycle_stats['skipped']} 件")
         
-        # データ保存
-        self.save_jobs(jobs)
+        # データ保存 (ストア使用時は差分のみ)
+        if self.store is not None:
+            if changed:
+                self.save_jobs(changed)
+            if rules_changed:
+                # 今回の検索結果に含まれない過去の案件・ロールアップも新ルールに揃える
+                self.rescore_store()
+            elif changed:
+                self.rollups.update(changed)
+        else:
+            self.save_jobs(jobs)
+        self.change_detector.commit(changed)
         
         return jobs
+    
+    def close(self):
+        """終了処理 (HTTPキャッシュのLRU順を保存・セッション解放)"""
+        if self.http_cache is not None:
+            self.http_cache.flush()
+        self.session.close()
 
 if __name__ == "__main__":
-    scraper = UpworkScraper()
+    from job_store import open_job_store
+    
+    scraper = UpworkScraper(store=open_job_store(load_settings()))
     jobs = scraper.run_collection()
     
     # 高スコア案件表示
-    high_score = [j for j in jobs if j.takawasi_score >= 70]
+    high_score = [j for j in jobs if j.takawasi_score >= scraper.rules.high_priority]
     print(f"\n🎯 注目案件 ({len(high_score)} 件):")
     for job in sorted(high_score, key=lambda x: x.takawasi_score, reverse=True):
         print(f"  {job.takawasi_score:.1f}点 - {job.title} (${job.budget_amount}/{job.budget_type})")
+    
+    scraper.close()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+スキル・キーワード一括マッチャー
+キーワード集合をAho-Corasickオートマトンに1回だけコンパイルし、テキスト1パスで全一致を検出
+"""
+
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Set, Tuple
+
+# 分かち書きしない文字 (かな・漢字・ハングル等) は1文字ずつのトークン
+# → 日本語キーワードは従来通り部分一致 (「Webスクレイピング案件」の「スクレイピング」)
+CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uff66-\uff9f\uac00-\ud7af"
+# 英字・数字の続け書きの境目に入れる印 ("skill12" の 12 は "skill 12" の 12 と別の記号になる)
+JOINED = "\x00"
+# 数字を起点に照合 (全位置で後読みするより速い)
+JOINED_AFTER_LETTER = re.compile(rf"\d(?<=[^\W\d_{CJK}]\d)")
+JOINED_BEFORE_LETTER = re.compile(rf"\d(?=[^\W\d_{CJK}])")
+# 単語境界モードのトークン (CJKの1文字 / 文字の連続 / 数字の連続 / 空白以外の1文字)
+# 数字は別トークンなので "WSL2" "Python3" はバージョン付きでも wsl / python に一致
+TOKEN_PATTERN = re.compile(rf"[{CJK}]|{JOINED}?(?:[^\W\d_{CJK}]+|\d+)|\S")
+
+def mark_joined(text: str) -> str:
+    """英字と数字の境目に印を挿入 ("skill12" → "skill\\x0012")"""
+    text = JOINED_AFTER_LETTER.sub(JOINED + r"\g<0>", text)
+    return JOINED_BEFORE_LETTER.sub(r"\g<0>" + JOINED, text)
+
+class SkillMatcher:
+    def __init__(self, keywords: Iterable[str], word_boundary: bool = True):
+        self.keywords = list(dict.fromkeys(k.lower() for k in keywords if k))
+        self.word_boundary = word_boundary
+        self._compile()
+
+    def _symbols(self, text: str):
+        """オートマトンの入力記号列 (単語境界モードはトークン列、それ以外は文字列)"""
+        if self.word_boundary:
+            return TOKEN_PATTERN.findall(mark_joined(text))
+        return text
+
+    def _compile(self):
+        """オートマトン構築 (goto / failure / output)"""
+        self._goto: List[Dict[str, int]] = [{}]
+        self._output: List[List[int]] = [[]]
+
+        for index, keyword in enumerate(self.keywords):
+            state = 0
+            for symbol in self._symbols(keyword):
+                if symbol not in self._goto[state]:
+                    self._goto.append({})
+                    self._output.append([])
+                    self._goto[state][symbol] = len(self._goto) - 1
+                state = self._goto[state][symbol]
+            self._output[state].append(index)
+
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())  # 深さ1のノードはfailure=ルート
+        while queue:
+            state = queue.popleft()
+            for symbol, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and symbol not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(symbol, 0)
+                self._output[nxt] = self._output[nxt] + self._output[self._fail[nxt]]
+
+        # キーワード長 (記号数) - 一致開始位置の逆算用
+        self._lengths = [len(self._symbols(k)) for k in self.keywords]
+
+    def _scan(self, symbols):
+        """記号列を1パス走査し (終了位置, キーワード番号) を返す"""
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+
+        for i, symbol in enumerate(symbols):
+            while state and symbol not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(symbol, 0)
+
+            for index in output[state]:
+                yield i, index
+
+    def find_all(self, text: str) -> List[Tuple[int, int, str]]:
+        """全一致位置 (start, end, keyword) を出現順で返す"""
+        text = text.lower()
+
+        if self.word_boundary:
+            # 印は直後のトークンに含まれるため、元のテキストのトークン位置と1対1に対応
+            spans = [m.span() for m in TOKEN_PATTERN.finditer(text)]
+            return [(spans[i + 1 - self._lengths[index]][0], spans[i][1], self.keywords[index])
+                    for i, index in self._scan(self._symbols(text))]
+
+        return [(i + 1 - self._lengths[index], i + 1, self.keywords[index])
+                for i, index in self._scan(text)]
+
+    def matches(self, text: str) -> Set[str]:
+        """一致したキーワード集合 (採点用ホットパスのため走査をインライン展開)"""
+        goto, fail, output = self._goto, self._fail, self._output
+        found = set()
+        state = 0
+
+        for symbol in self._symbols(text.lower()):
+            while state and symbol not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(symbol, 0)
+            if output[state]:
+                found.update(output[state])
+
+        return {self.keywords[index] for index in found}
+
+    def count(self, text: str) -> int:
+        """一致したキーワード種類数"""
+        return len(self.matches(text))
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+提案テンプレート選択
+templates.json の全キーワードを1つのマッチャーにまとめ、案件テキスト1パスで最適テンプレートを判定
+"""
+
+import json
+from collections import Counter
+
+from skill_matcher import SkillMatcher
+
+class TemplateSelector:
+    def __init__(self, templates_file="config/templates.json"):
+        try:
+            with open(templates_file, 'r', encoding='utf-8') as f:
+                self.templates = json.load(f)
+        except FileNotFoundError:
+            self.templates = {}
+
+        # キーワード → テンプレートキー (複数テンプレートで共有される場合あり)
+        self.keyword_map = {}
+        for key, template in self.templates.items():
+            for keyword in template.get('keywords', []):
+                self.keyword_map.setdefault(keyword.lower(), []).append(key)
+
+        self.matcher = SkillMatcher(self.keyword_map)
+
+    def match_counts(self, text):
+        """テンプレート別の一致キーワード数"""
+        counts = Counter()
+        for keyword in self.matcher.matches(text):
+            for key in self.keyword_map[keyword]:
+                counts[key] += 1
+        return counts
+
+    def select(self, job):
+        """最適テンプレート選択 (一致数最大、同数はtemplates.json順) - 一致なしはNone"""
+        if isinstance(job, dict):
+            text = f"{job['title']} {job['description']}"
+        else:
+            text = f"{job.title} {job.description}"
+
+        counts = self.match_counts(text)
+        if not counts:
+            return None
+
+        order = list(self.templates)
+        key = max(counts, key=lambda k: (counts[k], -order.index(k)))
+        return key, self.templates[key]
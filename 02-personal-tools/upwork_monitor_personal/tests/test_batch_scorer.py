@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+一括スコア計算テスト
+calculate_takawasi_score との結果一致確認
+"""
+
+import unittest
+import sys
+import os
+from dataclasses import replace
+
+# src・benchmarksディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from scraper import UpworkScraper
+from batch_scorer import score_batch, score_components, apply_scores
+from synthetic_jobs import generate_jobs
+
+class TestBatchScorer(unittest.TestCase):
+    def setUp(self):
+        self.scraper = UpworkScraper("missing_settings.json")
+
+    def test_parity_random_jobs(self):
+        """ランダム案件でのスコア一致テスト"""
+        jobs = generate_jobs(2000, seed=7)
+        expected = [self.scraper.calculate_takawasi_score(job) for job in jobs]
+        self.assertEqual(score_batch(jobs).tolist(), expected)
+
+    def test_parity_boundaries(self):
+        """価格・提案数・評価の境界値テスト"""
+        base = generate_jobs(1, seed=1)[0]
+        jobs = []
+        for budget_type, amount in [("hourly", 50), ("hourly", 65), ("hourly", 200), ("hourly", 250),
+                                    ("hourly", 250.5), ("fixed", 200), ("fixed", 500), ("fixed", 199)]:
+            for proposals in (4, 5, 15, 25):
+                for rating in (3.9, 4.0, 4.5):
+                    jobs.append(replace(base, budget_type=budget_type, budget_amount=float(amount),
+                                        proposals=proposals, client_rating=rating))
+
+        expected = [self.scraper.calculate_takawasi_score(job) for job in jobs]
+        self.assertEqual(score_batch(jobs).tolist(), expected)
+
+    def test_components_and_apply(self):
+        """スコア内訳・一括設定テスト"""
+        jobs = self.scraper.create_sample_jobs()
+        components = score_components(jobs)
+        self.assertEqual(set(components), {"skill", "price", "competition", "client"})
+
+        expected = [job.takawasi_score for job in jobs]
+        for job in jobs:
+            job.takawasi_score = 0.0
+        apply_scores(jobs)
+        self.assertEqual([job.takawasi_score for job in jobs], expected)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+案件収集テスト
+逐次収集・非同期収集の結果一致とホスト別同時接続数制限の確認
+"""
+
+import unittest
+import sys
+import os
+
+# src・benchmarksディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from scraper import UpworkScraper
+from fixture_server import FixtureServer
+
+class TestCollection(unittest.TestCase):
+    def setUp(self):
+        self.server = FixtureServer(latency=0.02, jobs_per_page=5).start()
+        self.scraper = UpworkScraper("missing_settings.json")
+        self.scraper.search_url = self.server.search_url
+        self.scraper.per_host_limit = 3
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_parse_search_page(self):
+        """検索結果ページ解析テスト"""
+        jobs = self.scraper.fetch_search_page("python", 1)
+        self.assertEqual(len(jobs), 5)
+        self.assertEqual(jobs[0].id, "python_1_0")
+        self.assertIn("Python", jobs[0].skills)
+
+    def test_async_matches_serial(self):
+        """非同期収集と逐次収集の結果一致テスト"""
+        serial = self.scraper.collect_jobs()
+        concurrent = self.scraper.collect_jobs_async()
+        self.assertEqual([j.id for j in serial], [j.id for j in concurrent])
+        self.assertEqual(len(serial), len(self.scraper.search_keywords) * 2 * 5)
+
+    def test_per_host_limit(self):
+        """ホスト別同時接続数制限テスト"""
+        self.scraper.collect_jobs_async()
+        self.assertLessEqual(self.server.peak_in_flight, 3)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+変更検知テスト
+フィンガープリントの安定性と差分のみの採点・保存・通知確認
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+from dataclasses import replace
+
+# srcディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from scraper import UpworkScraper
+from job_store import JobStore
+from fingerprint import job_fingerprint
+
+class TestFingerprint(unittest.TestCase):
+    def setUp(self):
+        self.job = UpworkScraper("missing_settings.json").create_sample_jobs()[0]
+
+    def test_normalized_fields(self):
+        """空白・大文字小文字の違いは同一フィンガープリント"""
+        variant = replace(self.job, title=f"  {self.job.title.upper()} ",
+                          description=self.job.description.replace(" ", "\n "),
+                          budget_amount=int(self.job.budget_amount), takawasi_score=0.0)
+        self.assertEqual(job_fingerprint(variant), job_fingerprint(self.job))
+
+    def test_changed_fields(self):
+        """提案数・予算の変更で別フィンガープリント"""
+        self.assertNotEqual(job_fingerprint(replace(self.job, proposals=self.job.proposals + 1)),
+                            job_fingerprint(self.job))
+        self.assertNotEqual(job_fingerprint(replace(self.job, budget_amount=1.0)),
+                            job_fingerprint(self.job))
+
+class TestChangeDetection(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = JobStore(os.path.join(self.tmpdir.name, "jobs.db"))
+        self.scraper = UpworkScraper("missing_settings.json", store=self.store)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmpdir.cleanup()
+
+    def test_only_delta_processed(self):
+        """2回目以降は新規・変更案件のみ処理"""
+        self.scraper.run_collection()
+        self.assertEqual(self.scraper.cycle_stats, {"processed": 5, "skipped": 0})
+
+        self.scraper.run_collection()
+        self.assertEqual(self.scraper.cycle_stats, {"processed": 0, "skipped": 5})
+        self.assertEqual(self.scraper.last_changed, [])
+
+        original = self.scraper.create_sample_jobs
+        self.scraper.create_sample_jobs = lambda: [
+            replace(job, proposals=40) if job.id == "job_001" else job for job in original()]
+        jobs = self.scraper.run_collection()
+        self.assertEqual(self.scraper.cycle_stats, {"processed": 1, "skipped": 4})
+        self.assertEqual([job.id for job in self.scraper.last_changed], ["job_001"])
+        self.assertEqual(len(jobs), 5)
+        self.assertEqual(self.store.fingerprints(["job_001"])["job_001"][1], 63)
+
+    def test_in_memory_detector_without_store(self):
+        """ストア未使用時はプロセス内で変更検知"""
+        scraper = UpworkScraper("missing_settings.json")
+        scraper.save_jobs = lambda jobs: None
+        scraper.run_collection()
+        scraper.run_collection()
+        self.assertEqual(scraper.cycle_stats, {"processed": 0, "skipped": 5})
+
+if __name__ == "__main__":
+    unittest.main()
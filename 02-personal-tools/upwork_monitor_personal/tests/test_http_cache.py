@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+HTTPキャッシュテスト
+条件付きリクエスト (304) のディスク応答・LRU削除・統計確認
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+
+# src・benchmarksディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import requests
+
+from scraper import UpworkScraper
+from http_cache import HTTPCache, install_cache
+from fixture_server import FixtureServer
+
+class TestHTTPCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.server = FixtureServer(latency=0, jobs_per_page=3).start()
+
+    def tearDown(self):
+        self.server.stop()
+        self.tmpdir.cleanup()
+
+    def test_not_modified_served_from_disk(self):
+        """2回目の取得は304 → ディスクから応答"""
+        session = requests.Session()
+        cache = install_cache(session, self.tmpdir.name)
+        first = session.get(self.server.search_url, params={"q": "python", "page": 1})
+        second = session.get(self.server.search_url, params={"q": "python", "page": 1})
+
+        self.assertFalse(first.from_cache)
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(self.server.not_modified, 1)
+        self.assertEqual((cache.stats["hits"], cache.stats["misses"]), (1, 1))
+
+    def test_lru_eviction(self):
+        """容量超過時は最も古く参照されたエントリを削除"""
+        session = requests.Session()
+        page_size = len(session.get(self.server.search_url, params={"q": "a", "page": 1}).content)
+        cache = install_cache(session, self.tmpdir.name, max_bytes=page_size * 2 + 10)
+
+        for q in ("a", "b", "a", "c"):
+            session.get(self.server.search_url, params={"q": q, "page": 1})
+
+        urls = list(cache.entries)
+        self.assertEqual(len(urls), 2)
+        self.assertTrue(any("q=a" in url for url in urls))
+        self.assertFalse(any("q=b" in url for url in urls))
+        self.assertEqual(cache.stats["evictions"], 1)
+
+        # インデックスの永続化
+        cache.flush()
+        self.assertEqual(list(HTTPCache(self.tmpdir.name).entries), urls)
+
+    def test_scraper_async_opt_in(self):
+        """UpworkScraper (非同期収集) のキャッシュ利用"""
+        scraper = UpworkScraper("missing_settings.json")
+        scraper.http_cache = HTTPCache(self.tmpdir.name)
+        scraper.search_url = self.server.search_url
+        scraper.search_keywords = ["python", "linux"]
+
+        first = scraper.collect_jobs_async()
+        second = scraper.collect_jobs_async()
+        self.assertEqual([j.id for j in first], [j.id for j in second])
+        self.assertEqual(scraper.http_cache.stats["hits"], 4)
+
+        # 304で更新されたLRU順は終了時に保存
+        scraper.close()
+        self.assertEqual(list(HTTPCache(self.tmpdir.name).entries), list(scraper.http_cache.entries))
+
+    def test_missing_body_refetched(self):
+        """本文ファイルが失われた304は検証子なしで取り直し"""
+        session = requests.Session()
+        cache = install_cache(session, self.tmpdir.name)
+        params = {"q": "python", "page": 1}
+        first = session.get(self.server.search_url, params=params)
+        os.remove(cache._body_path(first.url))
+
+        second = session.get(self.server.search_url, params=params)
+        self.assertEqual(second.status_code, 200)
+        self.assertFalse(second.from_cache)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(self.server.not_modified, 1)
+        self.assertIn(first.url, cache.entries)
+
+    def test_store_policy(self):
+        """no-store/private は保存しない・保存するヘッダーは検証子と Content-Type のみ"""
+        cache = HTTPCache(self.tmpdir.name)
+
+        def response(**headers):
+            r = requests.Response()
+            r.status_code = 200
+            r.headers.update({"ETag": '"v1"', "Content-Type": "text/html", **headers})
+            r._content = b"<html></html>"
+            return r
+
+        self.assertFalse(cache.store("http://a/1", response(**{"Cache-Control": "no-store"})))
+        self.assertFalse(cache.store("http://a/2", response(**{"Cache-Control": "private, max-age=60"})))
+        self.assertTrue(cache.store("http://a/3", response(**{"Set-Cookie": "sid=1", "Content-Encoding": "gzip"})))
+        self.assertEqual(list(cache.entries), ["http://a/3"])
+        self.assertEqual(cache.entries["http://a/3"]["headers"], {"Content-Type": "text/html", "ETag": '"v1"'})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+JobBatch テスト
+UpworkJob・DataFrame との相互変換とスコア計算確認
+"""
+
+import unittest
+import sys
+import os
+
+# src・benchmarksディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import numpy as np
+
+from scraper import UpworkScraper
+from job_batch import JobBatch, JobRecord
+from batch_scorer import score_batch
+from synthetic_jobs import generate_jobs
+
+class TestJobBatch(unittest.TestCase):
+    def setUp(self):
+        self.jobs = UpworkScraper("missing_settings.json").create_sample_jobs()
+
+    def test_job_roundtrip(self):
+        """UpworkJob → JobBatch → UpworkJob の往復"""
+        batch = JobBatch.from_jobs(self.jobs)
+        self.assertEqual(len(batch), 5)
+        self.assertEqual(batch.to_jobs(), self.jobs)
+        self.assertEqual(len(batch.skill_vocab), len({s for job in self.jobs for s in job.skills}))
+
+    def test_record_slots(self):
+        """JobRecord はインスタンス辞書を持たない"""
+        record = JobRecord.from_job(self.jobs[0])
+        self.assertFalse(hasattr(record, '__dict__'))
+        self.assertEqual(record.to_job(), self.jobs[0])
+
+    def test_dataframe_roundtrip_shares_memory(self):
+        """DataFrame変換で数値列を共有"""
+        batch = JobBatch.from_jobs(self.jobs)
+        df = batch.to_dataframe()
+        self.assertTrue(np.shares_memory(df['budget_amount'].to_numpy(), batch.columns['budget_amount']))
+        self.assertEqual(df['skills'].tolist(), [job.skills for job in self.jobs])
+
+        again = JobBatch.from_dataframe(df)
+        self.assertTrue(np.shares_memory(again.columns['budget_amount'], batch.columns['budget_amount']))
+        self.assertEqual(again.to_jobs(), self.jobs)
+
+    def test_score_batch_accepts_job_batch(self):
+        """JobBatchのまま一括スコア計算"""
+        jobs = generate_jobs(500, seed=3)
+        self.assertEqual(score_batch(JobBatch.from_jobs(jobs)).tolist(), score_batch(jobs).tolist())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+共有コンテキストテスト
+版数一致時の再利用・ファイル更新時の無効化・収集データを分析/通知で再利用
+"""
+
+import unittest
+import sys
+import os
+import io
+import tempfile
+from contextlib import redirect_stdout
+
+# srcディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from scraper import UpworkScraper
+from analyzer import UpworkAnalyzer
+from notifier import UpworkNotifier
+from job_context import JobContext, file_version
+from job_stream import write_jobs
+
+class TestJobContext(unittest.TestCase):
+    def test_get_or_load(self):
+        """同じ版数なら再利用・版数が変われば読み直し"""
+        context = JobContext()
+        calls = []
+        loader = lambda: calls.append(1) or len(calls)
+
+        self.assertEqual(context.get_or_load("jobs", (1, 10), loader), 1)
+        self.assertEqual(context.get_or_load("jobs", (1, 10), loader), 1)
+        self.assertEqual(context.get_or_load("jobs", (2, 10), loader), 2)
+        self.assertEqual(context.stats, {"hits": 1, "loads": 2, "publishes": 0})
+
+        context.invalidate()
+        self.assertEqual(context.get_or_load("jobs", (2, 10), loader), 3)
+
+class TestSharedStages(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmpdir.name)
+        self.scraper = UpworkScraper("missing_settings.json")
+        self.jobs = self.scraper.create_sample_jobs()
+        for job in self.jobs:
+            job.takawasi_score = self.scraper.calculate_takawasi_score(job)
+        self.settings = {"notification_settings": {"log": {"file": "logs/notifications.log"}}}
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmpdir.cleanup()
+
+    def test_published_jobs_reused(self):
+        """収集直後の分析・通知はファイルを読み直さない"""
+        context = JobContext()
+        scraper = UpworkScraper("missing_settings.json", context=context)
+        notifier = UpworkNotifier(settings=self.settings, context=context)
+        with redirect_stdout(io.StringIO()):
+            scraper.save_jobs(self.jobs)
+            df = UpworkAnalyzer(context=context).load_data()
+            notifier.check_high_score_jobs()
+        notifier.close()
+
+        self.assertEqual(len(df), len(self.jobs))
+        self.assertEqual(context.stats["publishes"], 1)
+        # 読み込みは共有データからのDataFrame構築1回のみ
+        self.assertEqual(context.stats["loads"], 1)
+        self.assertEqual(context.stats["hits"], 2)
+
+    def test_file_change_invalidates(self):
+        """外部でファイルが更新されたら読み直す"""
+        context = JobContext()
+        analyzer = UpworkAnalyzer(context=context)
+        os.makedirs("data")
+        write_jobs(self.jobs, "data/jobs.json")
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual(len(analyzer.load_data()), len(self.jobs))
+            self.assertEqual(len(analyzer.load_data()), len(self.jobs))
+            self.assertEqual(context.stats, {"hits": 1, "loads": 2, "publishes": 0})
+
+            before = file_version("data/jobs.json")
+            write_jobs(self.jobs[:2], "data/jobs.json")
+            self.assertNotEqual(file_version("data/jobs.json"), before)
+            self.assertEqual(len(analyzer.load_data()), 2)
+
+if __name__ == '__main__':
+    unittest.main()
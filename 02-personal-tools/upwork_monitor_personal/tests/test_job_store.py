@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+案件ストアテスト
+upsert・インデックス検索・分析/通知との連携確認
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+from dataclasses import replace
+
+# srcディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from scraper import UpworkScraper
+from analyzer import UpworkAnalyzer
+from notifier import UpworkNotifier
+from job_store import JobStore
+
+class TestJobStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = JobStore(os.path.join(self.tmpdir.name, "jobs.db"))
+        self.scraper = UpworkScraper("missing_settings.json", store=self.store)
+        self.jobs = self.scraper.create_sample_jobs()
+
+    def tearDown(self):
+        self.store.close()
+        self.tmpdir.cleanup()
+
+    def test_upsert_by_id(self):
+        """案件ID単位のupsertテスト"""
+        self.scraper.save_jobs(self.jobs)
+        self.scraper.save_jobs([replace(self.jobs[0], proposals=30)])
+
+        self.assertEqual(self.store.count(), 5)
+        loaded = {job.id: job for job in self.scraper.load_jobs()}
+        self.assertEqual(loaded["job_001"].proposals, 30)
+        self.assertEqual(loaded["job_002"].skills, self.jobs[1].skills)
+
+    def test_wal_and_score_index(self):
+        """WALモード・スコアインデックス使用テスト"""
+        mode = self.store.conn.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
+
+        plan = self.store.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM jobs WHERE takawasi_score >= 70").fetchall()
+        self.assertIn("idx_jobs_score", " ".join(row[-1] for row in plan))
+
+    def test_indexed_queries(self):
+        """条件付き検索テスト"""
+        self.store.upsert_jobs(self.jobs)
+        high = self.store.high_score_jobs(65)
+        self.assertEqual([job['id'] for job in high], ["job_001", "job_002", "job_005"])
+        self.assertEqual(len(self.store.query_jobs(budget_type="fixed")), 2)
+        self.assertEqual(self.store.count(min_score=70), 1)
+
+    def test_analyzer_and_notifier_use_store(self):
+        """分析・通知のストア連携テスト"""
+        self.store.upsert_jobs(self.jobs)
+
+        analyzer = UpworkAnalyzer(store=self.store)
+        self.assertEqual(len(analyzer.load_data()), 5)
+        self.assertIn("総案件数: 5", analyzer.generate_report())
+
+        notifier = UpworkNotifier(store=self.store)
+        notifier.notification_threshold = 65
+        self.assertEqual(len(notifier.check_high_score_jobs()), 3)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+ストリーミング読み込みテスト
+整形JSON・JSON Lines の1件ずつ読み込みと従来の一括読み込みの一致確認
+"""
+
+import unittest
+import sys
+import os
+import json
+import tempfile
+from dataclasses import asdict
+
+# srcディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from scraper import UpworkScraper
+from analyzer import UpworkAnalyzer
+from notifier import UpworkNotifier
+from job_stream import iter_jobs, write_jobs, _is_jsonl, HEAD_SIZE
+from synthetic_jobs import generate_jobs
+
+class TestJobStream(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.jobs = generate_jobs(200, seed=4)
+        self.jobs[0].title = "日本語 \"quoted\" title, with [brackets] {braces}"
+        self.expected = [asdict(job) for job in self.jobs]
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmpdir.name, name)
+
+    def test_pretty_json_small_chunks(self):
+        """チャンク境界が値の途中でも同じ結果"""
+        write_jobs(self.jobs, self.path("jobs.json"))
+        with open(self.path("jobs.json"), 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f)['jobs'], self.expected)
+
+        for chunk_size in (1, 7, 4096):
+            self.assertEqual(list(iter_jobs(self.path("jobs.json"), chunk_size)), self.expected)
+
+    def test_jsonl(self):
+        """JSON Lines は自動判別"""
+        write_jobs(self.jobs, self.path("jobs.json"), fmt="jsonl")
+        self.assertEqual(list(iter_jobs(self.path("jobs.json"))), self.expected)
+
+    def test_empty_jsonl_round_trip(self):
+        """0件の JSON Lines (空ファイル・空白のみ) も読み戻せる"""
+        write_jobs([], self.path("empty.jsonl"), fmt="jsonl")
+        self.assertEqual(list(iter_jobs(self.path("empty.jsonl"))), [])
+
+        with open(self.path("blank.jsonl"), 'w', encoding='utf-8') as f:
+            f.write("\n" * (HEAD_SIZE + 10))
+        self.assertEqual(list(iter_jobs(self.path("blank.jsonl"))), [])
+
+    def test_compact_and_empty(self):
+        """1行の整形なしJSON・空の案件リスト"""
+        with open(self.path("compact.json"), 'w', encoding='utf-8') as f:
+            json.dump({"jobs": self.expected[:3], "total_jobs": 3}, f)
+        self.assertEqual(list(iter_jobs(self.path("compact.json"))), self.expected[:3])
+
+        write_jobs([], self.path("empty.json"))
+        self.assertEqual(list(iter_jobs(self.path("empty.json"))), [])
+
+    def test_format_from_head(self):
+        """形式は先頭のキーだけで判別 (途中で切れた先頭部分でも判定できる)"""
+        compact = json.dumps({"last_updated": "2026-01-01", "jobs": self.expected})
+        self.assertFalse(_is_jsonl(compact[:100]))
+        self.assertFalse(_is_jsonl('  {\n  "jobs": ['))
+        self.assertTrue(_is_jsonl(json.dumps(self.expected[0])[:50]))
+        self.assertFalse(_is_jsonl(""))
+
+    def test_invalid_file(self):
+        with open(self.path("broken.json"), 'w', encoding='utf-8') as f:
+            f.write('{"jobs": [{"id": 1}')
+        with self.assertRaises(ValueError):
+            list(iter_jobs(self.path("broken.json")))
+
+class TestStreamingConsumers(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmpdir.name)
+        self.scraper = UpworkScraper("missing_settings.json")
+        self.jobs = generate_jobs(300, seed=8)
+        for job in self.jobs:
+            job.takawasi_score = self.scraper.calculate_takawasi_score(job)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmpdir.cleanup()
+
+    def test_same_results_for_both_formats(self):
+        """整形JSON・JSON Lines でレポート・通知対象が同じ"""
+        results = []
+        for fmt in ("json", "jsonl"):
+            self.scraper.json_format = fmt
+            self.scraper.save_jobs(self.jobs)
+            report = UpworkAnalyzer().generate_report().split("\n", 3)[3]
+            notified = [job['id'] for job in UpworkNotifier().check_high_score_jobs()]
+            loaded = self.scraper.load_jobs()
+            results.append((report, notified, len(loaded)))
+
+        self.assertEqual(results[0], results[1])
+        expected = sorted((job for job in self.jobs if job.takawasi_score >= 80),
+                          key=lambda job: job.takawasi_score, reverse=True)
+        self.assertEqual(results[0][1], [job.id for job in expected])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+メール通知ディスパッチャーテスト
+ローカルSMTPスタンドインでダイジェスト集約・接続再利用・再送を確認
+"""
+
+import unittest
+import sys
+import os
+import io
+import time
+import email
+from contextlib import redirect_stdout
+from unittest import mock
+from email.header import decode_header, make_header
+
+# srcディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from mail_dispatcher import MailDispatcher
+from smtp_server import SMTPStandIn
+
+class TestMailDispatcher(unittest.TestCase):
+    def setUp(self):
+        self.server = SMTPStandIn().start()
+        self.sleeps = []
+
+    def tearDown(self):
+        self.server.stop()
+
+    def dispatcher(self, **overrides):
+        host, port = self.server.address
+        config = {"smtp_host": host, "smtp_port": port, "starttls": False,
+                  "from_addr": "monitor@example.com", "to_addrs": ["me@example.com"],
+                  "digest_window": 0.2, "retry_base": 1, "max_backoff": 4}
+        config.update(overrides)
+        return MailDispatcher(config, sleep=self.sleeps.append)
+
+    def test_digest_coalescing(self):
+        """集約期間内のアラートは1通にまとめる"""
+        dispatcher = self.dispatcher()
+        for i in range(5):
+            dispatcher.submit(f"alert {i}", count=2)
+        self.assertTrue(dispatcher.flush(timeout=5))
+        dispatcher.close()
+
+        self.assertEqual(len(self.server.messages), 1)
+        self.assertEqual(dispatcher.stats["digests"], 1)
+        self.assertEqual(dispatcher.stats["alerts_sent"], 5)
+
+        msg = email.message_from_bytes(self.server.messages[0])
+        self.assertEqual(str(make_header(decode_header(msg['Subject']))), "🚨 Upwork高スコア案件 10件")
+        body = msg.get_payload()[0].get_payload(decode=True).decode('utf-8')
+        self.assertIn("5回のアラート", body)
+        self.assertIn("alert 4", body)
+
+    def test_connection_reuse_and_batch_limit(self):
+        """max_batch 超過分は次のダイジェスト・接続は使い回し"""
+        dispatcher = self.dispatcher(max_batch=3)
+        for i in range(7):
+            dispatcher.submit(f"alert {i}")
+        dispatcher.flush(timeout=5)
+        dispatcher.submit("late alert")
+        dispatcher.close()
+
+        self.assertEqual(len(self.server.messages), 4)
+        self.assertEqual(dispatcher.stats["connections"], 1)
+        self.assertEqual(self.server.connections, 1)
+
+    def test_retry_with_backoff(self):
+        """一時エラーは指数バックオフで再送"""
+        self.server.fail_first = 3
+        dispatcher = self.dispatcher()
+        dispatcher.submit("alert")
+        dispatcher.close()
+
+        self.assertEqual(len(self.server.messages), 1)
+        self.assertEqual(dispatcher.stats["retries"], 3)
+        self.assertEqual(self.sleeps, [1, 2, 4])
+
+    def test_give_up_after_max_retries(self):
+        self.server.fail_first = 10
+        dispatcher = self.dispatcher(max_retries=2)
+        dispatcher.submit("alert")
+        with redirect_stdout(io.StringIO()):
+            dispatcher.close()
+
+        self.assertEqual(self.server.messages, [])
+        self.assertEqual(dispatcher.stats["failed"], 1)
+        self.assertTrue(dispatcher.flush(timeout=0))
+
+    def test_submit_does_not_block(self):
+        """SMTPが遅くても投入は即座に戻る"""
+        self.server.data_latency = 0.3
+        dispatcher = self.dispatcher(digest_window=0)
+        start = time.perf_counter()
+        for i in range(20):
+            dispatcher.submit(f"alert {i}")
+        self.assertLess(time.perf_counter() - start, 0.1)
+        dispatcher.close()
+        self.assertEqual(dispatcher.stats["alerts_sent"], 20)
+
+    def test_unexpected_error_keeps_worker(self):
+        """ダイジェスト作成中の想定外エラーはそのバッチのみ破棄・以降の送信は継続"""
+        dispatcher = self.dispatcher(digest_window=0)
+        build_digest = dispatcher.build_digest
+        calls = []
+
+        def flaky(batch):
+            calls.append(batch)
+            if len(calls) == 1:
+                raise KeyError("broken template")
+            return build_digest(batch)
+
+        dispatcher.build_digest = flaky
+        with redirect_stdout(io.StringIO()) as out:
+            dispatcher.submit("first")
+            self.assertTrue(dispatcher.flush(timeout=5))
+        self.assertIn("KeyError", out.getvalue())
+
+        dispatcher.submit("second")
+        self.assertTrue(dispatcher.flush(timeout=5))
+        dispatcher.close()
+        self.assertEqual(dispatcher.stats["failed"], 1)
+        self.assertEqual(len(self.server.messages), 1)
+
+    def test_flush_fails_fast_when_worker_dead(self):
+        """ワーカーが異常終了していれば flush・submit は待たずに例外"""
+        dispatcher = self.dispatcher()
+
+        def crash(first):
+            raise SystemExit("worker crashed")
+
+        dispatcher._collect_batch = crash
+        with mock.patch("threading.excepthook", lambda args: None):
+            dispatcher.submit("alert")
+            dispatcher._thread.join(timeout=5)
+
+        start = time.perf_counter()
+        with self.assertRaises(RuntimeError):
+            dispatcher.flush()
+        self.assertLess(time.perf_counter() - start, 1)
+        with self.assertRaises(RuntimeError):
+            dispatcher.submit("another")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+常駐デーモンテスト
+スケジュール・バックオフ・状態保存・多重起動防止の確認
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+from dataclasses import asdict
+
+# srcディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from scraper import UpworkScraper
+from monitor_daemon import MonitorDaemon, DaemonAlreadyRunning
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+class StubAnalyzer:
+    def __init__(self):
+        self.fail = False
+        self.reports = 0
+
+    def generate_report(self):
+        if self.fail:
+            raise IOError("disk full")
+        return "report"
+
+    def save_report(self, report):
+        self.reports += 1
+
+class StubNotifier:
+    def __init__(self):
+        self.checked = []
+        self.fail = False
+
+    def run_notification_check(self, candidates=None):
+        if self.fail:
+            raise ConnectionError("SMTP down")
+        self.checked.append(candidates)
+        return bool(candidates)
+
+class StubTracker:
+    def __init__(self):
+        self.scraper = UpworkScraper("missing_settings.json")
+        self.scraper.save_jobs = lambda jobs: None
+        self.analyzer = StubAnalyzer()
+        self.notifier = StubNotifier()
+
+    def write_reports(self):
+        self.analyzer.save_report(self.analyzer.generate_report())
+
+class TestMonitorDaemon(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.settings = {"daemon": {
+            "collection_interval": 100, "analysis_interval": 200, "notification_interval": 50,
+            "jitter": 0, "retry_base": 10, "max_backoff": 30,
+            "state_file": os.path.join(self.tmpdir.name, "state.json"),
+            "lock_file": os.path.join(self.tmpdir.name, "daemon.lock")
+        }}
+        self.clock = FakeClock()
+        self.tracker = StubTracker()
+        self.daemon = MonitorDaemon(self.tracker, self.settings, clock=self.clock)
+
+    def tearDown(self):
+        self.daemon.release_lock()
+        self.tmpdir.cleanup()
+
+    def test_stage_intervals(self):
+        """ステージごとの実行間隔"""
+        latencies = self.daemon.run_due_stages()
+        self.assertEqual(set(latencies), {"collection", "analysis", "notification"})
+        self.assertEqual(len(self.tracker.notifier.checked[0]), 5)
+
+        self.clock.now += 50
+        self.assertEqual(set(self.daemon.run_due_stages()), {"notification"})
+        self.assertEqual(self.tracker.notifier.checked[-1], [])
+
+        self.clock.now += 50
+        self.assertEqual(set(self.daemon.run_due_stages()), {"collection", "notification"})
+
+    def test_failure_backoff(self):
+        """失敗時の指数バックオフと成功時のリセット"""
+        self.tracker.analyzer.fail = True
+        for expected_delay in (10, 20, 30, 30):
+            self.assertFalse(self.daemon.run_stage("analysis"))
+            self.assertEqual(self.daemon.state["analysis"]["next_run"], self.clock.now + expected_delay)
+        self.assertEqual(self.daemon.state["analysis"]["failures"], 4)
+
+        self.tracker.analyzer.fail = False
+        self.assertTrue(self.daemon.run_stage("analysis"))
+        self.assertEqual(self.daemon.state["analysis"]["failures"], 0)
+        self.assertEqual(self.daemon.state["analysis"]["next_run"], self.clock.now + 200)
+
+    def test_state_persisted(self):
+        """スケジュール状態の保存と再起動時の引き継ぎ"""
+        self.daemon.run_due_stages()
+        restarted = MonitorDaemon(self.tracker, self.settings, clock=self.clock)
+        self.assertEqual(restarted.state["collection"]["next_run"], self.clock.now + 100)
+        self.assertIsNotNone(restarted.state["collection"]["last_latency"])
+        self.assertEqual(restarted.run_due_stages(), {})
+
+    def test_pending_kept_until_notified(self):
+        """通知失敗時は未通知案件を保持して再試行で送信"""
+        self.daemon.run_stage("collection")
+        self.tracker.notifier.fail = True
+        self.assertFalse(self.daemon.run_stage("notification"))
+        self.assertEqual(len(self.daemon.pending_changes), 5)
+
+        self.tracker.notifier.fail = False
+        self.assertTrue(self.daemon.run_stage("notification"))
+        self.assertEqual(len(self.tracker.notifier.checked[-1]), 5)
+        self.assertEqual(self.daemon.pending_changes, {})
+
+    def test_pending_restored_after_restart(self):
+        """収集後・通知前に再起動しても未通知案件を状態ファイルから復元 (ストア不要)"""
+        self.daemon.run_stage("collection")
+        changed = self.tracker.scraper.last_changed
+        self.assertIsNone(self.tracker.scraper.store)
+
+        restarted = MonitorDaemon(self.tracker, self.settings, clock=self.clock)
+        self.tracker.notifier.fail = True
+        self.assertFalse(restarted.run_stage("notification"))
+        restarted.save_state()
+
+        self.tracker.notifier.fail = False
+        restarted = MonitorDaemon(self.tracker, self.settings, clock=self.clock)
+        self.assertTrue(restarted.run_stage("notification"))
+        self.assertEqual(self.tracker.notifier.checked[-1], [asdict(job) for job in changed])
+        self.assertEqual(restarted.pending_changes, {})
+
+    def test_single_instance_lock(self):
+        """多重起動防止 (拒否された側は実行中デーモンのPIDを消さない)"""
+        self.daemon.acquire_lock()
+        other = MonitorDaemon(self.tracker, self.settings, clock=self.clock)
+        with self.assertRaises(DaemonAlreadyRunning):
+            other.acquire_lock()
+        with open(self.settings["daemon"]["lock_file"]) as f:
+            self.assertEqual(f.read(), str(os.getpid()))
+
+if __name__ == "__main__":
+    unittest.main()
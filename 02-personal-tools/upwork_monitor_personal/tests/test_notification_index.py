@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+通知インデックステスト
+再通知の防止・ウォーターマーク以降の案件のみ確認・再起動後の引き継ぎ
+"""
+
+import unittest
+import sys
+import os
+import io
+import tempfile
+from contextlib import redirect_stdout
+from dataclasses import asdict, replace
+
+# srcディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from scraper import UpworkScraper
+from notifier import UpworkNotifier
+from job_store import JobStore
+from notification_index import NotificationIndex
+
+class TestNotificationIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.index_file = os.path.join(self.tmpdir.name, "notified.jsonl")
+        self.jobs = [{"id": f"job_{i}", "takawasi_score": score}
+                     for i, score in enumerate([85, 92, 40, 80, 79])]
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_select_and_record(self):
+        """スコア降順・通知済みは除外・再読み込み後も保持"""
+        index = NotificationIndex(self.index_file)
+        selected = index.select(self.jobs, 80)
+        self.assertEqual([job['id'] for job in selected], ["job_1", "job_0", "job_3"])
+
+        index.record(selected, "2025-07-03T10:00:00")
+        reloaded = NotificationIndex(self.index_file)
+        self.assertEqual(reloaded.select(self.jobs, 80), [])
+        self.assertEqual(reloaded.watermark, "2025-07-03T10:00:00")
+
+    def test_compaction(self):
+        """ウォーターマーク行が溜まると圧縮"""
+        index = NotificationIndex(self.index_file)
+        index.record(self.jobs[:1], "t0")
+        for i in range(1100):
+            index.record([], f"t{i + 1}")
+
+        reloaded = NotificationIndex(self.index_file)
+        with open(self.index_file, 'r', encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 2)
+        self.assertEqual(reloaded.watermark, "t1100")
+        self.assertIn("job_0", reloaded.notified)
+
+class TestNotifierWatermark(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = JobStore(os.path.join(self.tmpdir.name, "jobs.db"))
+        self.jobs = UpworkScraper("missing_settings.json").create_sample_jobs()
+        for job, score in zip(self.jobs, [90, 85, 60, 81, 50]):
+            job.takawasi_score = score
+        self.store.upsert_jobs(self.jobs)
+        self.settings = {"notification_settings": {
+            "log": {"file": os.path.join(self.tmpdir.name, "notifications.log")}}}
+
+    def tearDown(self):
+        self.store.close()
+        self.tmpdir.cleanup()
+
+    def run_check(self, notifier, candidates=None):
+        with redirect_stdout(io.StringIO()):
+            sent = notifier.run_notification_check(candidates)
+        notifier.close()
+        return sent
+
+    def test_no_repeat_alerts(self):
+        """同じ案件は1度だけ通知"""
+        notifier = UpworkNotifier(store=self.store, settings=self.settings)
+        self.assertEqual([job['takawasi_score'] for job in notifier.check_high_score_jobs()], [90, 85, 81])
+        self.assertTrue(self.run_check(notifier))
+        self.assertFalse(self.run_check(notifier))
+
+        # 再起動後も通知済み
+        restarted = UpworkNotifier(store=self.store, settings=self.settings)
+        self.assertEqual(restarted.check_high_score_jobs(), [])
+        self.assertEqual(restarted.check_high_score_jobs([asdict(job) for job in self.jobs]), [])
+
+    def test_only_updates_after_watermark(self):
+        """前回確認以降に更新された案件のみ検索"""
+        notifier = UpworkNotifier(store=self.store, settings=self.settings)
+        self.run_check(notifier)
+
+        raised = replace(self.jobs[2], takawasi_score=95.0)
+        self.store.upsert_jobs([raised])
+        self.assertEqual(len(self.store.high_score_jobs(80, updated_since=notifier.index.watermark)), 1)
+        self.assertEqual([job['id'] for job in notifier.check_high_score_jobs()], [raised.id])
+
+if __name__ == '__main__':
+    unittest.main()
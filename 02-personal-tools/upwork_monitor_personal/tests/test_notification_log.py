@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+通知ログテスト
+バッファ書き込み・日付/サイズローテーション・インデックスによる時間範囲読み出し
+"""
+
+import unittest
+import sys
+import os
+import gzip
+import tempfile
+import threading
+from datetime import datetime, timedelta, timezone
+
+# srcディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import notification_log
+from notification_log import NotificationLog
+
+class FakeClock:
+    def __init__(self, start=datetime(2025, 7, 1, 9, 0), step=timedelta(hours=1)):
+        self.now = start
+        self.step = step
+
+    def __call__(self):
+        current = self.now
+        self.now += self.step
+        return current
+
+class TestNotificationLog(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.log_file = os.path.join(self.tmpdir.name, "logs", "notifications.log")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_buffered_writes_keep_format(self):
+        """flush まではバッファ・書き出し内容は従来形式"""
+        log = NotificationLog(self.log_file, flush_records=10, flush_interval=None)
+        log.write("first")
+        log.write("second")
+        self.assertEqual(os.path.getsize(self.log_file), 0)
+
+        log.flush()
+        with open(self.log_file, 'r', encoding='utf-8') as f:
+            self.assertEqual(f.read(), f"\n{'=' * 50}\nfirst\n{'=' * 50}\n"
+                                       f"\n{'=' * 50}\nsecond\n{'=' * 50}\n")
+        log.close()
+
+    def test_daily_rotation_and_range(self):
+        """日付でローテーション・圧縮し、時間範囲で読み出し"""
+        clock = FakeClock(datetime(2025, 7, 1), step=timedelta(hours=6))
+        log = NotificationLog(self.log_file, flush_records=1, clock=clock, tz=timezone.utc)
+        for i in range(12):  # 3日分
+            log.write(f"alert {i}")
+        log.close()
+
+        segments = log.segments()
+        self.assertEqual(len(segments), 3)
+        self.assertTrue(segments[0][0].endswith(".gz"))
+        with gzip.open(segments[0][0], 'rt', encoding='utf-8') as f:
+            self.assertIn("alert 0", f.read())
+
+        day2 = log.read_range(datetime(2025, 7, 2), datetime(2025, 7, 2, 23, 59))
+        self.assertEqual([message for _, message in day2],
+                         ["alert 4", "alert 5", "alert 6", "alert 7"])
+        self.assertEqual(len(log.read_range()), 12)
+
+    def test_size_rotation_and_reopen(self):
+        """サイズ上限でローテーション・再起動後も続きから追記"""
+        log = NotificationLog(self.log_file, max_bytes=1000, flush_records=1,
+                              compress=False, clock=FakeClock(step=timedelta(seconds=1)))
+        for i in range(30):
+            log.write(f"alert {i:02d} " + "x" * 100)
+        log.close()
+        self.assertGreater(len(log.segments()), 3)
+        self.assertTrue(all(os.path.getsize(path) <= 1000 for path, _ in log.segments()))
+
+        reopened = NotificationLog(self.log_file, max_bytes=1000, flush_records=1, compress=False,
+                                   clock=FakeClock(datetime(2025, 7, 1, 9, 1)))
+        reopened.write("after restart")
+        messages = [message for _, message in reopened.read_range()]
+        self.assertEqual(len(messages), 31)
+        self.assertTrue(messages[0].startswith("alert 00"))
+        self.assertEqual(messages[-1], "after restart")
+        reopened.close()
+
+    def test_range_seeks_with_index(self):
+        """範囲の開始位置は二分探索 (範囲前のレコードは読まない)"""
+        log = NotificationLog(self.log_file, max_bytes=10 ** 9, rotate_daily=False,
+                              flush_records=100, clock=FakeClock(step=timedelta(minutes=1)))
+        for i in range(2000):
+            log.write(f"alert {i}")
+
+        start = datetime(2025, 7, 1, 9, 0) + timedelta(minutes=1500)
+        records = log.read_range(start, start + timedelta(minutes=4))
+        self.assertEqual([message for _, message in records],
+                         [f"alert {i}" for i in range(1500, 1505)])
+        self.assertEqual(records[0][0], start)
+        log.close()
+
+    def test_flush_interval_timer(self):
+        """flush_interval 経過で自動書き出し"""
+        log = NotificationLog(self.log_file, flush_records=100, flush_interval=0.05)
+        log.write("timed")
+        log._timer.join(1)
+        self.assertGreater(os.path.getsize(self.log_file), 0)
+        log.close()
+
+    def test_compression_does_not_block_writes(self):
+        """ローテーション後の圧縮中も書き込みは待たない"""
+        release = threading.Event()
+        original = notification_log._compress_segment
+
+        def slow_compress(path):
+            release.wait(5)
+            original(path)
+
+        notification_log._compress_segment = slow_compress
+        try:
+            log = NotificationLog(self.log_file, flush_records=1, clock=FakeClock(step=timedelta(days=1)),
+                                  tz=timezone.utc)
+            log.write("day 1")
+            log.write("day 2")  # ローテーション → 圧縮は待機中
+            log.write("day 3")
+            self.assertEqual([message for _, message in log.read_range()], ["day 1", "day 2", "day 3"])
+            release.set()
+            log.close()
+        finally:
+            notification_log._compress_segment = original
+        self.assertEqual([path.endswith(".gz") for path, _ in log.segments()], [True, True, False])
+
+    def test_utc_across_dst_fallback(self):
+        """夏時間終了で現地時刻が戻っても記録はUTCで単調増加し、範囲検索できる"""
+        edt, est = timezone(timedelta(hours=-4)), timezone(timedelta(hours=-5))
+        times = iter([datetime(2025, 11, 2, 1, 30, tzinfo=edt), datetime(2025, 11, 2, 1, 50, tzinfo=edt),
+                      datetime(2025, 11, 2, 1, 10, tzinfo=est), datetime(2025, 11, 2, 1, 40, tzinfo=est)])
+        log = NotificationLog(self.log_file, rotate_daily=False, flush_records=1, clock=lambda: next(times))
+        for i in range(4):
+            log.write(f"alert {i}")
+
+        records = log.read_range(datetime(2025, 11, 2, 1, 0, tzinfo=est))
+        self.assertEqual([message for _, message in records], ["alert 2", "alert 3"])
+        self.assertEqual(records[0][0], datetime(2025, 11, 2, 6, 10))
+        log.close()
+
+    def test_daily_rotation_uses_local_date(self):
+        """日付ローテーションは現地 (JST) の日付で判定・インデックスはUTCのまま"""
+        jst = timezone(timedelta(hours=9))
+        times = iter([datetime(2025, 7, 1, 10, 0), datetime(2025, 7, 1, 14, 0),   # JST 19:00 / 23:00
+                      datetime(2025, 7, 1, 16, 0), datetime(2025, 7, 2, 1, 0)])   # JST 翌01:00 / 翌10:00
+        log = NotificationLog(self.log_file, flush_records=1, compress=False, clock=lambda: next(times), tz=jst)
+        for i in range(4):
+            log.write(f"alert {i}")
+        log.close()
+
+        segments = log.segments()
+        self.assertEqual(len(segments), 2)
+        self.assertTrue(segments[0][0].endswith(".20250701-100000-000000"))
+        self.assertEqual([t for t, _ in log.read_range()][2], datetime(2025, 7, 1, 16, 0))
+
+    def test_interrupted_compression_recovered(self):
+        """圧縮途中で終了したセグメントは再オープン時に一時ファイルを削除して再圧縮"""
+        log = NotificationLog(self.log_file, flush_records=1, compress=False,
+                              clock=FakeClock(step=timedelta(days=1)), tz=timezone.utc)
+        log.write("day 1")
+        log.write("day 2")
+        log.close()
+        rotated = log.segments()[0][0]
+        with open(rotated + ".gz.tmp", 'wb') as f:
+            f.write(b"partial")
+
+        reopened = NotificationLog(self.log_file, flush_records=1, clock=FakeClock(datetime(2025, 7, 2, 10, 0)),
+                                   tz=timezone.utc)
+        reopened.write("day 2 again")
+        reopened.close()
+        self.assertFalse(os.path.exists(rotated + ".gz.tmp"))
+        self.assertFalse(os.path.exists(rotated))
+        self.assertEqual(reopened.segments()[0][0], rotated + ".gz")
+        self.assertEqual([message for _, message in reopened.read_range()], ["day 1", "day 2", "day 2 again"])
+
+if __name__ == '__main__':
+    unittest.main()
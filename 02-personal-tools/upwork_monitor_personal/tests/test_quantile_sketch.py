@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+分位点スケッチテスト
+順位誤差の上限・日別スケッチ合算・保存形式・スケッチモードの価格動向
+"""
+
+import unittest
+import sys
+import os
+import json
+import random
+import tempfile
+from datetime import date
+
+import numpy as np
+
+# srcディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from analyzer import UpworkAnalyzer
+from job_store import JobStore
+from rollups import JobRollups
+from quantile_sketch import KLLSketch, rank_error
+from synthetic_jobs import generate_jobs
+
+def observed_rank_error(sketch, values, qs=(0.01, 0.1, 0.5, 0.9, 0.99)):
+    ordered = np.sort(values)
+    return max(abs(np.searchsorted(ordered, sketch.quantile(q), side='right') / len(ordered) - q)
+               for q in qs)
+
+class TestKLLSketch(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(1)
+        self.values = [rng.lognormvariate(4.0, 1.0) for _ in range(50000)]
+
+    def test_rank_error_bound(self):
+        """順位誤差は公表上限以内・記憶量は件数によらず O(k)"""
+        sketch = KLLSketch(seed=3).update_many(self.values)
+        self.assertLess(observed_rank_error(sketch, self.values), rank_error(200, all_quantiles=True))
+        self.assertLess(sum(len(c) for c in sketch.compactors), 3 * 200)
+        self.assertEqual(sketch.count, len(self.values))
+        self.assertAlmostEqual(sketch.mean(), np.mean(self.values))
+        self.assertEqual((sketch.min, sketch.max), (min(self.values), max(self.values)))
+
+    def test_merge_daily_sketches(self):
+        """日別スケッチの合算も同じ誤差範囲"""
+        days = [KLLSketch(seed=i).update_many(self.values[i::365]) for i in range(365)]
+        merged = KLLSketch(seed=0)
+        for day in days:
+            merged.merge(KLLSketch.from_dict(json.loads(json.dumps(day.to_dict()))))
+        self.assertEqual(merged.count, len(self.values))
+        self.assertLess(observed_rank_error(merged, self.values), rank_error(200, all_quantiles=True))
+
+    def test_small_inputs_are_exact(self):
+        """k 件未満は全値保持 (厳密)"""
+        sketch = KLLSketch().update_many([5, 1, 4, 2, 3])
+        self.assertTrue(sketch.exact)
+        self.assertEqual(sketch.quantiles([0, 0.5, 1]), [1, 3, 5])
+        self.assertEqual(KLLSketch().quantile(0.5), None)
+
+class TestSketchTrends(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = JobStore(os.path.join(self.tmpdir.name, "jobs.db"))
+        self.jobs = generate_jobs(5000, seed=6)
+        self.store.upsert_jobs(self.jobs)
+        JobRollups(self.store).rebuild()
+
+    def tearDown(self):
+        self.store.close()
+        self.tmpdir.cleanup()
+
+    def test_sketch_mode_matches_exact(self):
+        """スケッチモードの価格動向は厳密値と順位誤差以内で一致"""
+        hourly = np.array([job.budget_amount for job in self.jobs if job.budget_type == "hourly"])
+        analyzer = UpworkAnalyzer(store=self.store, stats_mode="sketch")
+        trends = analyzer.sketch_price_trends()
+
+        stats = trends["hourly_stats"]
+        self.assertEqual(stats["count"], len(hourly))
+        self.assertAlmostEqual(stats["avg_rate"], hourly.mean())
+        for q, key in ((0.5, "median_rate"), (0.9, "p90_rate"), (0.99, "p99_rate")):
+            rank = np.searchsorted(np.sort(hourly), stats[key], side='right') / len(hourly)
+            self.assertLess(abs(rank - q), trends["rank_error"] + 0.01)
+
+        price = analyzer.analyze_price_trends(analyzer.load_data())
+        self.assertEqual(price["hourly_stats"]["median_rate"], stats["median_rate"])
+
+    def test_window(self):
+        """期間指定は該当日のスケッチのみ合算"""
+        day = self.jobs[0].posted
+        analyzer = UpworkAnalyzer(store=self.store, stats_mode="sketch")
+        trends = analyzer.sketch_price_trends(date.fromisoformat(day), date.fromisoformat(day))
+        self.assertEqual(trends["proposal_stats"]["count"],
+                         sum(1 for job in self.jobs if job.posted == day))
+
+    def test_configured_k(self):
+        """収集側と同じ k のスケッチを合算し、その k の誤差上限を返す"""
+        JobRollups(self.store, sketch_k=50).rebuild()
+        analyzer = UpworkAnalyzer(store=self.store, stats_mode="sketch", sketch_k=50)
+        trends = analyzer.sketch_price_trends()
+        self.assertEqual(trends["rank_error"], rank_error(50))
+        self.assertEqual(analyzer.rollups.merged_sketch("proposals").k, 50)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+レポート集計テスト
+1パス集計と従来のpandas集計の一致・データ版数によるキャッシュ確認
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+
+# srcディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from scraper import UpworkScraper
+from analyzer import UpworkAnalyzer
+from job_store import JobStore
+from batch_scorer import to_frame, score_batch
+from report_aggregates import ReportAggregator
+from synthetic_jobs import generate_jobs
+
+class TestReportAggregator(unittest.TestCase):
+    def test_matches_pandas_reference(self):
+        """従来の個別集計と同じ値"""
+        df = to_frame(generate_jobs(500, seed=3))
+        df["takawasi_score"] = score_batch(df)
+        stats = ReportAggregator().compute(df)
+
+        hourly = df[df['budget_type'] == 'hourly']['budget_amount']
+        fixed = df[df['budget_type'] == 'fixed']['budget_amount']
+        self.assertEqual(stats.total_jobs, len(df))
+        self.assertEqual(stats.high_score_jobs, int((df['takawasi_score'] >= 70).sum()))
+        self.assertAlmostEqual(stats.avg_score, df['takawasi_score'].mean())
+        self.assertEqual(stats.hourly_stats['count'], len(hourly))
+        self.assertAlmostEqual(stats.hourly_stats['median_rate'], hourly.median())
+        self.assertAlmostEqual(stats.fixed_stats['avg_budget'], fixed.mean())
+        self.assertEqual(stats.fixed_stats['max_budget'], fixed.max())
+        self.assertAlmostEqual(stats.competition['avg_proposals'], df['proposals'].mean())
+        self.assertEqual(stats.competition['median_proposals'], df['proposals'].median())
+        self.assertEqual(stats.competition['low_competition'], int((df['proposals'] < 5).sum()))
+
+    def test_missing_budget_type(self):
+        """時間単価案件なしでも0埋め"""
+        df = to_frame(generate_jobs(200, seed=1))
+        df["takawasi_score"] = score_batch(df)
+        stats = ReportAggregator().compute(df[df['budget_type'] == 'fixed'])
+        self.assertEqual(stats.hourly_stats, {"count": 0, "avg_rate": 0, "median_rate": 0,
+                                              "max_rate": 0, "min_rate": 0})
+
+class TestReportCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = JobStore(os.path.join(self.tmpdir.name, "jobs.db"))
+        self.scraper = UpworkScraper("missing_settings.json", store=self.store)
+        self.jobs = generate_jobs(100, seed=7)
+        for job in self.jobs:
+            job.takawasi_score = self.scraper.calculate_takawasi_score(job)
+        self.store.upsert_jobs(self.jobs)
+        self.analyzer = UpworkAnalyzer(store=self.store)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmpdir.cleanup()
+
+    def test_cache_until_data_changes(self):
+        """データ版数が同じ間は再集計しない"""
+        first = self.analyzer.compute_stats()
+        self.assertIs(self.analyzer.compute_stats(), first)
+
+        self.store.upsert_jobs(generate_jobs(1, seed=99))
+        second = self.analyzer.compute_stats()
+        self.assertIsNot(second, first)
+        self.assertEqual(second.total_jobs, 101)
+
+if __name__ == '__main__':
+    unittest.main()
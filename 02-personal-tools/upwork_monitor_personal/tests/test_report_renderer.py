@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+レポート出力テスト
+各形式の内容・テンプレート解析の再利用・データ未更新時のスキップ
+"""
+
+import unittest
+import sys
+import os
+import io
+import json
+import tempfile
+from contextlib import redirect_stdout
+
+# srcディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from scraper import UpworkScraper
+from analyzer import UpworkAnalyzer
+from report_renderer import ReportRenderer, report_data, render_report, compile_template
+
+class TestReportRenderer(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmpdir.name)
+        self.scraper = UpworkScraper("missing_settings.json")
+        self.jobs = self.scraper.create_sample_jobs()
+        for job in self.jobs:
+            job.takawasi_score = self.scraper.calculate_takawasi_score(job)
+        self.jobs[0].title = "Python <script> | Automation & AI"
+        with redirect_stdout(io.StringIO()):
+            self.scraper.save_jobs(self.jobs)
+        self.analyzer = UpworkAnalyzer()
+        self.renderer = ReportRenderer(self.analyzer, formats=["text", "markdown", "html", "json"])
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmpdir.cleanup()
+
+    def write(self, **kwargs):
+        with redirect_stdout(io.StringIO()):
+            return self.renderer.write(**kwargs)
+
+    def test_formats(self):
+        """全形式を出力・テキストは従来レポートと同じ"""
+        paths = self.write()
+        contents = {}
+        for fmt, path in paths.items():
+            with open(path, 'r', encoding='utf-8') as f:
+                contents[fmt] = f.read()
+
+        stats = self.analyzer.compute_stats()
+        self.assertEqual(contents["text"].split("\n", 3)[3],
+                         self.analyzer.format_report(stats).split("\n", 3)[3])
+        self.assertIn("&lt;script&gt;", contents["html"])
+        self.assertNotIn("<script>", contents["html"])
+        self.assertIn("Python <script> \\| Automation & AI", contents["markdown"])
+
+        data = json.loads(contents["json"])
+        self.assertEqual(data["summary"]["total_jobs"], len(self.jobs))
+        self.assertEqual(data["top_opportunities"][0]["rank"], 1)
+
+    def test_templates_compiled_once(self):
+        """テンプレート解析はプロセス内で1回"""
+        data = report_data(self.analyzer.compute_stats())
+        for _ in range(3):
+            render_report(data, "markdown")
+        self.assertIs(compile_template("markdown"), compile_template("markdown"))
+
+    def test_skip_when_unchanged(self):
+        """データ版数が同じなら出力しない・更新されたら再出力"""
+        self.write()
+        self.write()
+        self.assertEqual(self.renderer.stats, {"renders": 1, "skipped": 1})
+
+        with redirect_stdout(io.StringIO()):
+            self.scraper.save_jobs(self.jobs[:3])
+        self.write()
+        self.write(force=True)
+        self.assertEqual(self.renderer.stats, {"renders": 3, "skipped": 1})
+
+        with open("reports/daily_report.json", 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f)["summary"]["total_jobs"], 3)
+
+    def test_markdown_escapes_break_characters(self):
+        """改行・バッククォートを含むタイトルでも表の1行に収まる"""
+        data = report_data(self.analyzer.compute_stats())
+        data["top_opportunities"][0]["title"] = "Line one\r\nline `two` | \\ end"
+        markdown = render_report(data, "markdown")
+        self.assertIn("Line one<br>line \\`two\\` \\| \\\\ end", markdown)
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            ReportRenderer(self.analyzer, formats=["pdf"])
+        with self.assertRaises(ValueError):
+            ReportRenderer(self.analyzer, formats=[])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+ロールアップテスト
+差分更新と全件再構築の一致・分位点とスコア分布の確認
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+from dataclasses import replace
+
+import numpy as np
+
+# srcディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from scraper import UpworkScraper
+from analyzer import UpworkAnalyzer
+from job_store import JobStore
+from rollups import JobRollups, ALL_KEYWORDS
+from synthetic_jobs import generate_jobs
+
+class TestJobRollups(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = JobStore(os.path.join(self.tmpdir.name, "jobs.db"))
+        self.scraper = UpworkScraper("missing_settings.json")
+        self.jobs = generate_jobs(600, seed=11, days=60)
+        for job in self.jobs:
+            job.takawasi_score = self.scraper.calculate_takawasi_score(job)
+        self.rollups = JobRollups(self.store, self.scraper.search_keywords)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmpdir.cleanup()
+
+    def snapshot(self, table):
+        return [tuple(row)[:-1] for row in self.store.conn.execute(
+            f"SELECT * FROM {table} ORDER BY period_start, keyword, budget_type")]
+
+    def test_incremental_matches_rebuild(self):
+        """サイクル毎の差分更新と全件再構築が同じ集計"""
+        for i in range(0, len(self.jobs), 100):
+            batch = self.jobs[i:i + 100]
+            self.store.upsert_jobs(batch)
+            self.rollups.update(batch)
+
+        changed = [replace(job, proposals=job.proposals + 3) for job in self.jobs[:20]]
+        self.store.upsert_jobs(changed)
+        self.rollups.update(changed)
+
+        incremental = (self.snapshot("daily_rollups"), self.snapshot("weekly_rollups"))
+        self.rollups.rebuild()
+        self.assertEqual(incremental, (self.snapshot("daily_rollups"), self.snapshot("weekly_rollups")))
+
+    def test_built_marker(self):
+        """構築済みの記録で判定 (日付の読めない案件しかなく集計表が空でも再構築を繰り返さない)"""
+        self.store.upsert_jobs([replace(job, posted="unknown") for job in self.jobs[:10]])
+        self.assertTrue(self.rollups.needs_rebuild())
+        self.assertEqual(self.rollups.rebuild(), 0)
+        self.assertFalse(self.rollups.needs_rebuild())
+        self.assertFalse(JobRollups(self.store, self.scraper.search_keywords).needs_rebuild())
+        self.assertEqual(self.snapshot("daily_rollups"), [])
+
+    def test_daily_stats(self):
+        """日次の分位点・スコア分布が生データと一致"""
+        self.store.upsert_jobs(self.jobs)
+        self.rollups.rebuild()
+
+        day = self.jobs[0].posted
+        raw = [job for job in self.jobs if job.posted == day and job.budget_type == "hourly"]
+        trends = self.rollups.trends("daily", budget_type="hourly")
+        row = trends[trends['period_start'] == day].iloc[0]
+
+        amounts = [job.budget_amount for job in raw]
+        self.assertEqual(row['jobs'], len(raw))
+        self.assertAlmostEqual(row['amount_p50'], np.percentile(amounts, 50))
+        self.assertAlmostEqual(row['amount_p90'], np.percentile(amounts, 90))
+        self.assertEqual(row['score_low'] + row['score_medium'] + row['score_high'] + row['score_notify'],
+                         len(raw))
+
+    def test_keyword_rows(self):
+        """キーワード別の行はキーワード横断の行以下の件数"""
+        self.store.upsert_jobs(self.jobs)
+        self.rollups.rebuild()
+
+        totals = self.rollups.keyword_totals("weekly")
+        self.assertEqual(totals[ALL_KEYWORDS], len(self.jobs))
+        self.assertIn("python", totals)
+        self.assertTrue(all(count <= len(self.jobs) for count in totals.values()))
+
+    def test_trend_report_reads_rollups(self):
+        """長期トレンドはロールアップ行 (週単位) から生成"""
+        self.store.upsert_jobs(self.jobs)
+        self.rollups.rebuild()
+
+        analyzer = UpworkAnalyzer(store=self.store)
+        trends = analyzer.analyze_historical_trends("weekly", months=12)
+        self.assertLessEqual(len(trends), 2 * 10)
+        self.assertIn("長期トレンド", analyzer.generate_trend_report())
+
+if __name__ == '__main__':
+    unittest.main()
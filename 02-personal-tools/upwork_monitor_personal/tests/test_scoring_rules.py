@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+採点ルールテスト
+設定による配点・閾値の変更・1件採点と一括採点の一致・設定ファイル更新時の再読み込み
+"""
+
+import unittest
+import sys
+import os
+import io
+import json
+import tempfile
+from contextlib import redirect_stdout
+
+# src・benchmarksディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from scraper import UpworkScraper
+from notifier import UpworkNotifier
+from batch_scorer import score_batch, apply_scores
+from job_store import JobStore
+from scoring_rules import ScoringRules, ScoringRulesLoader
+from synthetic_jobs import generate_jobs
+
+CUSTOM_SETTINGS = {
+    "score_thresholds": {"notification": 60, "high_priority": 55, "medium_priority": 40},
+    "budget_preferences": {"hourly_min": 40, "hourly_max": 90, "fixed_min": 1000},
+    "scoring": {
+        "competition": {"bands": [{"below": 10, "points": 20}], "default": 0},
+        "weights": {"skill": 0.5, "price": 2, "competition": 1, "client": 0}
+    }
+}
+
+class TestScoringRules(unittest.TestCase):
+    def test_custom_rules(self):
+        """希望価格帯・配点・重みを設定から反映"""
+        rules = ScoringRules.from_settings(CUSTOM_SETTINGS)
+        job = generate_jobs(1, seed=3)[0]
+        job.title, job.description = "Python automation", ""
+        job.budget_type, job.budget_amount = "hourly", 45.0
+        job.proposals, job.client_rating = 12, 5.0
+
+        # スキル 2件×6点×0.5 + 価格 30点×2 + 競合 0点 + 評価 ×0
+        self.assertEqual(rules.score(job), 66)
+        self.assertEqual(rules.notification_threshold, 60)
+        self.assertEqual(rules.high_priority, 55)
+
+    def test_partial_section_override(self):
+        """セクションの一部だけ上書きしても残りのキーは既定値"""
+        rules = ScoringRules({"skills": {"keywords": ["Python"]}, "hourly": {"default": 5}})
+        job = generate_jobs(1, seed=3)[0]
+        job.title, job.description = "Python automation", ""
+        job.budget_type, job.budget_amount = "hourly", 20.0
+        job.proposals, job.client_rating = 30, 3.0
+
+        # スキル 1件×6点 + 価格 5点 (帯外) + 競合 5点 + 評価 3点
+        self.assertEqual(rules.score(job), 19)
+        self.assertEqual(rules.max_skill_points, 40)
+
+    def test_scalar_batch_parity(self):
+        """設定変更後も1件採点と一括採点が一致"""
+        rules = ScoringRules.from_settings(CUSTOM_SETTINGS)
+        jobs = generate_jobs(1000, seed=11)
+        self.assertEqual(score_batch(jobs, rules).tolist(), [float(rules.score(job)) for job in jobs])
+
+class TestRulesReload(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.settings_file = os.path.join(self.tmpdir.name, "settings.json")
+        self.write_settings({"score_thresholds": {"notification": 80}})
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write_settings(self, settings, raw=None):
+        with open(self.settings_file, 'w', encoding='utf-8') as f:
+            f.write(raw if raw is not None else json.dumps(settings))
+        # 同一時刻内の書き換えでも更新を検知できるよう更新時刻を進める
+        stat = os.stat(self.settings_file)
+        os.utime(self.settings_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    def test_reload_on_change(self):
+        """設定ファイル更新で再コンパイル・記述ミスは現在のルールを維持"""
+        loader = ScoringRulesLoader(self.settings_file)
+        rules = loader.current()
+        self.assertIs(loader.current(), rules)
+
+        self.write_settings(CUSTOM_SETTINGS)
+        with redirect_stdout(io.StringIO()):
+            reloaded = loader.current()
+        self.assertIsNot(reloaded, rules)
+        self.assertEqual(reloaded.notification_threshold, 60)
+
+        self.write_settings(None, raw="{broken")
+        with redirect_stdout(io.StringIO()):
+            self.assertIs(loader.current(), reloaded)
+        self.assertEqual(loader.reloads, 1)
+
+    def test_stages_follow_reload(self):
+        """ルール変更後の収集は全案件を再採点・通知閾値も更新"""
+        loader = ScoringRulesLoader(self.settings_file)
+        scraper = UpworkScraper(self.settings_file, scoring=loader)
+        notifier = UpworkNotifier(index_file=os.path.join(self.tmpdir.name, "notified.jsonl"),
+                                  settings={"notification_settings": {"log": {
+                                      "file": os.path.join(self.tmpdir.name, "notifications.log")}}},
+                                  scoring=loader)
+        scraper.save_jobs = lambda jobs: None
+        with redirect_stdout(io.StringIO()):
+            first = {job.id: job.takawasi_score for job in scraper.run_collection()}
+            scraper.run_collection()
+            self.assertEqual(scraper.cycle_stats["processed"], 0)
+
+            self.write_settings(CUSTOM_SETTINGS)
+            jobs = scraper.run_collection()
+            notifier.check_high_score_jobs([])
+        notifier.close()
+
+        self.assertEqual(scraper.cycle_stats["processed"], len(jobs))
+        self.assertNotEqual({job.id: job.takawasi_score for job in jobs}, first)
+        self.assertEqual(notifier.notification_threshold, 60)
+
+    def test_store_rescored_on_rule_change(self):
+        """ルール変更時は今回の検索結果にない保存済み案件・ロールアップも新ルールで作り直す"""
+        store = JobStore(os.path.join(self.tmpdir.name, "jobs.db"))
+        store.upsert_jobs(apply_scores(generate_jobs(200, seed=5)))
+        loader = ScoringRulesLoader(self.settings_file)
+        with redirect_stdout(io.StringIO()):
+            scraper = UpworkScraper(self.settings_file, store=store, scoring=loader)
+            scraper.run_collection()
+            self.write_settings(CUSTOM_SETTINGS)
+            scraper.run_collection()
+
+        rules = ScoringRules.from_settings(CUSTOM_SETTINGS)
+        stored = scraper.load_jobs()
+        self.assertEqual([job.takawasi_score for job in stored], [rules.score(job) for job in stored])
+
+        notify = store.conn.execute(
+            "SELECT SUM(score_notify) FROM daily_rollups WHERE keyword = '*'").fetchone()[0]
+        self.assertEqual(notify, store.count(min_score=rules.notification_threshold))
+        store.close()
+
+if __name__ == '__main__':
+    unittest.main()
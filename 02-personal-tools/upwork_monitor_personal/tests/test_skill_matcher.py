@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+スキルマッチャー・テンプレート選択テスト
+"""
+
+import unittest
+import sys
+import os
+import re
+
+# srcディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from skill_matcher import SkillMatcher
+from template_selector import TemplateSelector
+
+CONFIG_DIR = os.path.join(os.path.dirname(__file__), '..', 'config')
+
+class TestSkillMatcher(unittest.TestCase):
+    def test_overlapping_matches(self):
+        """重なり・包含キーワードの検出テスト"""
+        matcher = SkillMatcher(["he", "she", "his", "hers"], word_boundary=False)
+        self.assertEqual(matcher.find_all("ushers"),
+                         [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")])
+
+    def test_word_boundary(self):
+        """単語境界テスト (maintain の ai・database の data は不一致)"""
+        matcher = SkillMatcher(["ai", "data", "machine learning"])
+        self.assertEqual(matcher.matches("Maintain the database"), set())
+        self.assertEqual(matcher.matches("AI/ML data-pipeline with Machine Learning"),
+                         {"ai", "data", "machine learning"})
+
+    def test_version_suffix(self):
+        """バージョン番号付き表記テスト (WSL2・Python3)"""
+        matcher = SkillMatcher(["wsl", "python"])
+        self.assertEqual(matcher.matches("WSL2 setup for Python3"), {"wsl", "python"})
+
+    def test_japanese_substring(self):
+        """日本語キーワードは前後に区切りがなくても一致 (位置は元のテキスト上)"""
+        matcher = SkillMatcher(["スクレイピング", "自動化", "python"])
+        text = "Webスクレイピング案件・Python3で業務自動化"
+        self.assertEqual(matcher.matches(text), {"スクレイピング", "自動化", "python"})
+        self.assertEqual(matcher.find_all("Webスクレイピング案件")[0], (3, 10, "スクレイピング"))
+
+    def test_joined_alphanumerics(self):
+        """英字と数字を続けたキーワードは空白で区切った表記に一致しない"""
+        matcher = SkillMatcher(["skill12", "skill"])
+        self.assertEqual(matcher.matches("skill 12"), {"skill"})
+        self.assertEqual(matcher.matches("skill12"), {"skill", "skill12"})
+
+    def test_matches_regex_reference(self):
+        """多数キーワードでの正規表現との一致テスト"""
+        keywords = [f"skill{i}" for i in range(300)] + ["python", "py", "web scraping"]
+        text = "Python web scraping with skill12, skill120 and skill299; not pyside or skill3000"
+        matcher = SkillMatcher(keywords)
+        expected = {k for k in keywords if re.search(rf"(?<![^\W_]){re.escape(k)}(?![^\W_])", text.lower())}
+        self.assertEqual(matcher.matches(text), expected)
+
+class TestTemplateSelector(unittest.TestCase):
+    def setUp(self):
+        self.selector = TemplateSelector(os.path.join(CONFIG_DIR, 'templates.json'))
+
+    def test_select(self):
+        """最適テンプレート選択テスト"""
+        key, template = self.selector.select({
+            "title": "Web scraping with BeautifulSoup",
+            "description": "Data collection using requests"
+        })
+        self.assertEqual(key, "web_scraping")
+        self.assertIn("name", template)
+
+    def test_no_match(self):
+        """一致なしテスト"""
+        self.assertIsNone(self.selector.select({"title": "Logo design", "description": "Branding"}))
+
+if __name__ == "__main__":
+    unittest.main()
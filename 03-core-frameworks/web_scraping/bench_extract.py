@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+HTML抽出ベンチマーク
+BeautifulSoup (全体パース) vs StreamingExtractor (逐次パース・早期終了) - 保存済みページで比較
+"""
+
+import argparse
+import glob
+import json
+import os
+import time
+
+from bs4 import BeautifulSoup
+
+from html_extract import StreamingExtractor
+
+DEFAULT_SELECTORS = {
+    "title": ".product-title",
+    "price": ".price",
+    "availability": ".stock-status"
+}
+
+def generate_pages(output_dir, count=5, listings=3000):
+    """ベンチマーク用の大きな商品ページ生成 (対象フィールドは先頭付近、以降は関連商品一覧)"""
+    os.makedirs(output_dir, exist_ok=True)
+    for n in range(count):
+        related = "".join(
+            f'<li class="related-item"><a href="/product/{i}"><img src="/img/{i}.jpg">'
+            f'<span class="name">Related product {i}</span><span class="related-price">${i % 500}.99</span></a></li>'
+            for i in range(listings))
+        page = f"""<!DOCTYPE html><html><head><title>Product {n}</title>
+<script>window.analytics = {{"page": {n}}};</script></head><body>
+<header><nav><a href="/">Home</a> &gt; <a href="/c">Category</a></nav></header>
+<main><div class="product"><h1 class="product-title">Product {n} &amp; Accessories</h1>
+<div class="price-box"><span class="price">${100 + n}.00</span></div>
+<p class="stock-status">In stock</p></div>
+<section class="related"><ul>{related}</ul></section></main></body></html>"""
+        with open(os.path.join(output_dir, f"product_{n}.html"), 'w', encoding='utf-8') as f:
+            f.write(page)
+
+def run_benchmark(pages_dir, selectors):
+    files = sorted(glob.glob(os.path.join(pages_dir, "*.html")))
+    pages = []
+    for path in files:
+        with open(path, 'rb') as f:
+            pages.append(f.read())
+
+    start = time.perf_counter()
+    soup_results = []
+    for content in pages:
+        soup = BeautifulSoup(content, 'html.parser')
+        soup_results.append({key: (el.text.strip() if (el := soup.select_one(sel)) else None)
+                             for key, sel in selectors.items()})
+    soup_sec = time.perf_counter() - start
+
+    extractor = StreamingExtractor(selectors)
+    start = time.perf_counter()
+    stream_results = [extractor.extract(content) for content in pages]
+    stream_sec = time.perf_counter() - start
+
+    return {
+        "pages": len(pages),
+        "total_bytes": sum(len(p) for p in pages),
+        "soup_ms_per_page": round(soup_sec * 1000 / max(len(pages), 1), 2),
+        "stream_ms_per_page": round(stream_sec * 1000 / max(len(pages), 1), 2),
+        "speedup": round(soup_sec / stream_sec, 1) if stream_sec else None,
+        "bytes_parsed_ratio": round(extractor.stats["bytes_parsed"] / max(extractor.stats["bytes_total"], 1), 3),
+        "identical": soup_results == stream_results
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='HTML extraction benchmark (BeautifulSoup vs streaming)')
+    parser.add_argument('--pages', default='bench_pages', help='Directory of saved .html pages')
+    parser.add_argument('--generate', type=int, default=0, help='Generate N sample pages into --pages first')
+    parser.add_argument('--selectors', help='JSON file with field → selector mapping')
+
+    args = parser.parse_args()
+    if args.generate:
+        generate_pages(args.pages, args.generate)
+
+    selectors = DEFAULT_SELECTORS
+    if args.selectors:
+        with open(args.selectors, 'r', encoding='utf-8') as f:
+            selectors = json.load(f)
+
+    print(json.dumps(run_benchmark(args.pages, selectors), indent=2))
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+価格取得ベンチマーク
+逐次取得 vs 並行取得 (ホスト別トークンバケット) - ローカル商品ページサーバー複数台で比較
+"""
+
+import argparse
+import json
+import time
+from contextlib import ExitStack
+
+from web_scraper import WebScraper
+from shop_server import ShopServer
+
+SELECTORS = {
+    "title": ".product-title",
+    "price": ".price",
+    "availability": ".stock-status"
+}
+
+def run_mode(hosts, products, latency, host_rate, concurrent):
+    with ExitStack() as stack:
+        shops = [stack.enter_context(ShopServer(latency)) for _ in range(hosts)]
+        urls = [f"{shop.base_url}/product/{i}" for i in range(products) for shop in shops]
+        scraper = stack.enter_context(WebScraper(host_rate=host_rate))
+
+        start = time.perf_counter()
+        results = scraper.scrape_prices(urls, SELECTORS, streaming=True, concurrent=concurrent)
+        elapsed = time.perf_counter() - start
+
+        return {
+            "urls": len(urls),
+            "elapsed_sec": round(elapsed, 2),
+            "urls_per_sec": round(len(urls) / elapsed, 1),
+            "errors": sum(1 for r in results if 'error' in r),
+            # 各ホストが受けた最短の受信間隔 (1 / host_rate 以上であること)
+            "min_host_interval_sec": round(min(shop.min_interval() for shop in shops), 3),
+            # URLが待ち行列で待った最長時間 (ホスト別メトリクスの最大)
+            "max_queue_wait_sec": round(max(m["wait_max"] for m in scraper.crawl_metrics().values()), 2)
+        }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Serial vs concurrent price scraping benchmark')
+    parser.add_argument('--hosts', type=int, default=12, help='Number of shop hosts')
+    parser.add_argument('--products', type=int, default=5, help='Products per host')
+    parser.add_argument('--latency', type=float, default=0.05, help='Server latency (seconds)')
+    parser.add_argument('--host-rate', type=float, default=4.0, help='Requests per second per host')
+
+    args = parser.parse_args()
+    results = {mode: run_mode(args.hosts, args.products, args.latency, args.host_rate, mode == "concurrent")
+               for mode in ("serial", "concurrent")}
+    results["speedup"] = round(results["serial"]["elapsed_sec"] / results["concurrent"]["elapsed_sec"], 1)
+    print(json.dumps(results, indent=2))
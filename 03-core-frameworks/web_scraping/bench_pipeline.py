@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+取得・抽出パイプラインのベンチマーク
+並行取得 (取得スレッド内で抽出) vs パイプライン (抽出をプロセスプールで実行) - 大きめの商品ページで比較
+"""
+
+import argparse
+import json
+import os
+import time
+from contextlib import ExitStack
+
+from web_scraper import WebScraper
+from shop_server import ShopServer
+
+SELECTORS = {
+    "title": ".product-title",
+    "price": ".price",
+    "availability": ".stock-status"
+}
+
+def run_mode(args, pipeline):
+    with ExitStack() as stack:
+        shops = [stack.enter_context(ShopServer(args.latency, related=args.related)) for _ in range(args.hosts)]
+        urls = [f"{shop.base_url}/product/{i}" for i in range(args.products) for shop in shops]
+        scraper = stack.enter_context(WebScraper(host_rate=args.host_rate, parse_workers=args.parse_workers))
+
+        # 全体パース (BeautifulSoup) でCPU負荷の高い抽出を再現
+        start = time.perf_counter()
+        results = scraper.scrape_prices(urls, SELECTORS, concurrent=True, pipeline=pipeline)
+        elapsed = time.perf_counter() - start
+
+        report = {
+            "urls": len(urls),
+            "elapsed_sec": round(elapsed, 2),
+            "urls_per_sec": round(len(urls) / elapsed, 1),
+            "errors": sum(1 for r in results if 'error' in r)
+        }
+        if pipeline:
+            report["stages"] = scraper.pipeline_stats
+        return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Concurrent vs pipelined (fetch threads + parse processes) scraping benchmark')
+    parser.add_argument('--hosts', type=int, default=8, help='Number of shop hosts')
+    parser.add_argument('--products', type=int, default=10, help='Products per host')
+    parser.add_argument('--latency', type=float, default=0.05, help='Server latency (seconds)')
+    parser.add_argument('--host-rate', type=float, default=20.0, help='Requests per second per host')
+    parser.add_argument('--related', type=int, default=500, help='Related items per page (page size)')
+    parser.add_argument('--parse-workers', type=int, default=None, help='Parse processes (default: CPU count)')
+
+    args = parser.parse_args()
+    results = {"cpus": os.cpu_count()}
+    results.update({mode: run_mode(args, mode == "pipeline") for mode in ("concurrent", "pipeline")})
+    results["speedup"] = round(results["concurrent"]["elapsed_sec"] / results["pipeline"]["elapsed_sec"], 1)
+    print(json.dumps(results, indent=2))
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+並行取得エンジン
+max_connections 個のワーカーが巡回スケジューラーから送信可能なURLを順に取得
+ホスト別トークンバケットで各ホストへの送信間隔を維持
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from http_cache import CachingAdapter
+from crawl_scheduler import CrawlScheduler
+
+class TokenBucket:
+    def __init__(self, rate=1.0, burst=1, clock=time.monotonic):
+        self.rate = rate    # 1秒あたりの補充数 (= ホストへのリクエスト数/秒)
+        self.burst = burst  # 連続で送れる最大数
+        self.clock = clock
+        self.tokens = float(burst)
+        self.updated = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self):
+        """次のトークンまでの待ち時間 (秒・予約はしない)"""
+        self._refill()
+        return 0.0 if self.tokens >= 1 - 1e-9 else (1 - self.tokens) / self.rate
+
+    def try_take(self):
+        """トークンがあれば1つ消費してTrue"""
+        self._refill()
+        if self.tokens >= 1 - 1e-9:
+            self.tokens -= 1
+            return True
+        return False
+
+class HostRateLimiter:
+    def __init__(self, rate=1.0, burst=1, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.buckets = {}  # ホスト → TokenBucket
+        self._lock = threading.Lock()
+
+    def set_min_interval(self, url, interval):
+        """ホスト個別の最小送信間隔 (robots.txt の Crawl-delay 等・Noneで既定値に戻す)"""
+        with self._lock:
+            bucket = self._bucket(url)
+            if interval:
+                bucket.rate = min(self.rate, 1 / interval)
+                bucket.burst = 1
+                bucket.tokens = min(bucket.tokens, 1)
+            else:
+                bucket.rate, bucket.burst = self.rate, self.burst
+
+    def _bucket(self, url):
+        host = urlsplit(url).netloc
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(self.rate, self.burst, self.clock)
+        return self.buckets[host]
+
+    def delay(self, url):
+        with self._lock:
+            return self._bucket(url).delay()
+
+    def try_take(self, url):
+        with self._lock:
+            return self._bucket(url).try_take()
+
+    def wait(self, url, sleep=time.sleep):
+        """トークン取得まで待機 (逐次取得用)"""
+        while not self.try_take(url):
+            sleep(self.delay(url))
+
+def build_session(scraper, max_connections):
+    """共有セッション作成 (接続プールをmax_connectionsで固定)"""
+    session = requests.Session()
+    session.headers.update(scraper.session.headers)
+
+    pool = dict(pool_connections=max_connections,
+                pool_maxsize=max_connections,
+                pool_block=True)
+    if scraper.http_cache is not None:
+        adapter = CachingAdapter(scraper.http_cache, **pool)
+    else:
+        adapter = HTTPAdapter(**pool)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+class ConcurrentFetcher:
+    def __init__(self, scraper, max_connections=16, session=None):
+        self.scraper = scraper
+        self.max_connections = max_connections
+        # session 指定時は呼び出し側の接続プールを使い回す (未指定時は自前で作成し close で解放)
+        self.owns_session = session is None
+        self.session = session if session is not None else build_session(scraper, max_connections)
+        self.stats = {"requests": 0, "errors": 0, "elapsed": 0.0}
+
+    def close(self):
+        if self.owns_session:
+            self.session.close()
+
+    async def _worker(self, executor, scheduler, fetch, results):
+        """送信可能になったURLから順に取得 (1ワーカー = 1接続)"""
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await scheduler.next_async()
+            if item is None:
+                return
+            self.stats["requests"] += 1
+            result = await loop.run_in_executor(executor, scheduler.execute, item, fetch, self.session)
+            if 'error' in result:
+                self.stats["errors"] += 1
+            results[item.index] = result
+
+    async def fetch_all(self, urls, fetch, scheduler=None, results=None):
+        """全URL同時取得 (結果はURL順・results指定時は完了順にそこへ格納)"""
+        if scheduler is None:
+            scheduler = CrawlScheduler(self.scraper.rate_limiter)
+            scheduler.add(urls)
+        if results is None:
+            results = [None] * len(urls)
+        with ThreadPoolExecutor(max_workers=self.max_connections) as executor:
+            await asyncio.gather(*(self._worker(executor, scheduler, fetch, results)
+                                   for _ in range(self.max_connections)))
+        return results
+
+    def run(self, urls, fetch, scheduler=None, results=None):
+        """同期呼び出し用エントリポイント (fetch(url, session) → 結果辞書)"""
+        start = time.perf_counter()
+        try:
+            return asyncio.run(self.fetch_all(urls, fetch, scheduler, results))
+        finally:
+            self.stats["elapsed"] += time.perf_counter() - start
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+巡回スケジューラー
+robots.txt をホスト毎に取得してTTL付きでキャッシュ (Disallow / Crawl-delay / Request-rate に従う)
+送信可能なホストのURLから順に払い出し、1つの遅いホストを待ってワーカーが止まらないようにする
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque, namedtuple
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+# index: 元のURL順 / allowed: robots.txt で許可 / needs_policy: このホストの robots.txt 未取得 / wait: 待ち時間 (秒)
+ScheduledURL = namedtuple("ScheduledURL", "index url allowed needs_policy wait")
+
+POLL_INTERVAL = 0.01  # robots.txt 取得待ちのホストしか残っていない場合の再確認間隔
+
+def host_of(url):
+    return urlsplit(url).netloc
+
+def parse_crawl_delays(lines):
+    """グループ毎の Crawl-delay → [(User-agentのリスト, 秒)] (RobotFileParser.crawl_delay は整数しか扱わないため)"""
+    groups, agents, in_rules = [], [], False
+    for line in lines:
+        line = line.split("#", 1)[0].strip()
+        if ":" not in line:
+            continue
+        key, value = (part.strip() for part in line.split(":", 1))
+        key = key.lower()
+        if key == "user-agent":
+            if in_rules:
+                agents, in_rules = [], False
+            agents.append(value.lower())
+            continue
+        in_rules = True
+        if key == "crawl-delay" and agents:
+            try:
+                delay = float(value)
+            except ValueError:
+                continue
+            if delay > 0:
+                groups.append((list(agents), delay))
+    return groups
+
+class RobotsPolicy:
+    def __init__(self, parser=None, user_agent="*", allow_all=False, disallow_all=False, crawl_delays=()):
+        self.parser = parser
+        self.user_agent = user_agent
+        self.allow_all = allow_all
+        self.disallow_all = disallow_all
+        self.crawl_delays = crawl_delays  # parse_crawl_delays の結果 (小数秒対応)
+
+    def allowed(self, url):
+        if self.disallow_all:
+            return False
+        if self.allow_all or self.parser is None:
+            return True
+        return self.parser.can_fetch(self.user_agent, url)
+
+    def crawl_delay(self):
+        """該当グループの Crawl-delay (RobotFileParser と同じく User-agent の製品名で照合・なければ *)"""
+        agent = self.user_agent.split("/")[0].lower()
+        default = None
+        for agents, delay in self.crawl_delays:
+            if any(name != "*" and name in agent for name in agents):
+                return delay
+            if default is None and "*" in agents:
+                default = delay
+        return default
+
+    @property
+    def min_interval(self):
+        """Crawl-delay と Request-rate から求めた最小送信間隔 (秒・指定なしはNone)"""
+        if self.parser is None:
+            return None
+        intervals = []
+        delay = self.crawl_delay()
+        if delay:
+            intervals.append(delay)
+        rate = self.parser.request_rate(self.user_agent)
+        if rate and rate.requests:
+            intervals.append(rate.seconds / rate.requests)
+        return max(intervals) if intervals else None
+
+class RobotsCache:
+    def __init__(self, ttl=3600, error_ttl=300, timeout=10, disallow_on_error=False, clock=time.monotonic):
+        self.ttl = ttl              # 取得成功時の有効期間 (秒)
+        self.error_ttl = error_ttl  # 取得失敗 (5xx・接続エラー) 時の再取得までの期間
+        self.timeout = timeout
+        # 取得失敗時の扱い (False: 従来通り全許可 / True: RFC 9309 に従い error_ttl の間は全禁止)
+        self.disallow_on_error = disallow_on_error
+        self.clock = clock
+        self.entries = {}  # "scheme://host" → (期限, RobotsPolicy)
+        self.stats = {"fetches": 0, "hits": 0, "errors": 0}
+        self._lock = threading.Lock()
+
+    def policy(self, url, session):
+        """URLのホストの robots.txt ポリシー (期限内はキャッシュ)"""
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        now = self.clock()
+        with self._lock:
+            entry = self.entries.get(origin)
+            if entry is not None and entry[0] > now:
+                self.stats["hits"] += 1
+                return entry[1]
+
+        policy, ttl = self._fetch(origin, session)
+        with self._lock:
+            self.entries[origin] = (now + ttl, policy)
+        return policy
+
+    def _fetch(self, origin, session):
+        """robots.txt 取得 (401/403は全禁止・その他4xxは全許可
+        5xx・接続エラーは error_ttl 後に再取得 (disallow_on_error 指定時はそれまで全禁止))"""
+        user_agent = session.headers.get("User-Agent", "*")
+        self.stats["fetches"] += 1
+        try:
+            response = session.get(origin + "/robots.txt", timeout=self.timeout)
+        except Exception:
+            return self._error_policy(user_agent)
+
+        if response.status_code in (401, 403):
+            return RobotsPolicy(user_agent=user_agent, disallow_all=True), self.ttl
+        if 400 <= response.status_code < 500:
+            return RobotsPolicy(user_agent=user_agent, allow_all=True), self.ttl
+        if response.status_code >= 500:
+            return self._error_policy(user_agent)
+
+        lines = response.text.splitlines()
+        parser = RobotFileParser(origin + "/robots.txt")
+        parser.parse(lines)
+        return RobotsPolicy(parser, user_agent, crawl_delays=parse_crawl_delays(lines)), self.ttl
+
+    def _error_policy(self, user_agent):
+        self.stats["errors"] += 1
+        if self.disallow_on_error:
+            return RobotsPolicy(user_agent=user_agent, disallow_all=True), self.error_ttl
+        return RobotsPolicy(user_agent=user_agent, allow_all=True), self.error_ttl
+
+class CrawlScheduler:
+    def __init__(self, limiter, robots=None, clock=time.monotonic):
+        self.limiter = limiter  # HostRateLimiter (ホスト別トークンバケット)
+        self.robots = robots    # RobotsCache (Noneなら robots.txt を確認しない)
+        self.clock = clock
+        self.queues = {}        # ホスト → deque[(index, url, 投入時刻)]
+        self.policies = {}      # ホスト → RobotsPolicy
+        self.resolving = set()  # robots.txt 取得中のホスト (取得と初回URLの送信待ちが終わるまで次を払い出さない)
+        self.metrics_by_host = {}
+        self._lock = threading.Lock()
+
+    def add(self, urls, start=0):
+        """URLを投入 (index は start からの連番)"""
+        now = self.clock()
+        with self._lock:
+            for index, url in enumerate(urls, start):
+                host = host_of(url)
+                queue = self.queues.setdefault(host, deque())
+                queue.append((index, url, now))
+                metrics = self.metrics_by_host.setdefault(host, {
+                    "queued": 0, "peak_queued": 0, "dispatched": 0, "disallowed": 0,
+                    "wait_total": 0.0, "wait_max": 0.0, "min_interval": None})
+                metrics["queued"] = len(queue)
+                metrics["peak_queued"] = max(metrics["peak_queued"], len(queue))
+
+    @property
+    def pending(self):
+        with self._lock:
+            return sum(len(queue) for queue in self.queues.values())
+
+    def pop_ready(self):
+        """送信可能なURLを1つ払い出し → (ScheduledURL, None) / なければ (None, 次に送信可能になるまでの秒数)
+        送信可能なホストが複数あれば待ち行列の長いホストを優先 (全体の完了が早い)
+        キューが空なら (None, None)"""
+        with self._lock:
+            best, soonest = None, None
+            for host, queue in self.queues.items():
+                if not queue:
+                    continue
+                if host in self.resolving:
+                    soonest = min(soonest, POLL_INTERVAL) if soonest is not None else POLL_INTERVAL
+                    continue
+
+                policy = self.policies.get(host)
+                if policy is not None and not policy.allowed(queue[0][1]):
+                    # 禁止URLはトークンを使わずに即払い出し
+                    return self._dispatch(host, allowed=False), None
+
+                wait = self.limiter.delay(queue[0][1])
+                if wait > 0:
+                    soonest = min(soonest, wait) if soonest is not None else wait
+                elif best is None or len(queue) > len(self.queues[best]):
+                    best = host
+
+            if best is None or not self.limiter.try_take(self.queues[best][0][1]):
+                return None, soonest
+
+            needs_policy = self.robots is not None and best not in self.policies
+            if needs_policy:
+                self.resolving.add(best)
+            return self._dispatch(best, allowed=True, needs_policy=needs_policy), None
+
+    def _dispatch(self, host, allowed, needs_policy=False):
+        index, url, enqueued = self.queues[host].popleft()
+        metrics = self.metrics_by_host[host]
+        metrics["queued"] = len(self.queues[host])
+        wait = self.clock() - enqueued
+        item = ScheduledURL(index, url, allowed, needs_policy, wait)
+        if not needs_policy:
+            # robots.txt 確認待ちのURLは確認後に execute で計上 (許可・禁止のどちらか一方のみ)
+            self._count(metrics, item)
+        return item
+
+    @staticmethod
+    def _count(metrics, item):
+        if item.allowed:
+            metrics["dispatched"] += 1
+            metrics["wait_total"] += item.wait
+            metrics["wait_max"] = max(metrics["wait_max"], item.wait)
+        else:
+            metrics["disallowed"] += 1
+
+    def set_policy(self, url, policy):
+        """ホストの robots.txt ポリシーを登録 (Crawl-delay / Request-rate は送信間隔に反映)"""
+        host = host_of(url)
+        with self._lock:
+            self.policies[host] = policy
+            interval = policy.min_interval
+            self.limiter.set_min_interval(url, interval)
+            if host in self.metrics_by_host:
+                self.metrics_by_host[host]["min_interval"] = interval
+
+    def execute(self, item, fetch, session, sleep=time.sleep):
+        """払い出したURLを処理 (初回は robots.txt を確認・禁止URLは取得しない)
+        払い出し時のトークンは robots.txt の取得に使い、許可されたURLは改めてトークンを取得してから送信"""
+        if item.needs_policy:
+            host = host_of(item.url)
+            try:
+                policy = self.robots.policy(item.url, session)
+                self.set_policy(item.url, policy)
+                item = item._replace(allowed=policy.allowed(item.url))
+                with self._lock:
+                    self._count(self.metrics_by_host[host], item)
+                if item.allowed:
+                    self.limiter.wait(item.url, sleep)
+            finally:
+                with self._lock:
+                    self.resolving.discard(host)
+
+        if not item.allowed:
+            return {'url': item.url, 'error': 'robots.txt により取得禁止'}
+        return fetch(item.url, session)
+
+    def next_blocking(self, sleep=time.sleep):
+        """次のURL (送信可能になるまで待機・全て払い出し済みならNone)"""
+        while True:
+            item, wait = self.pop_ready()
+            if item is not None or wait is None:
+                return item
+            sleep(wait)
+
+    async def next_async(self):
+        while True:
+            item, wait = self.pop_ready()
+            if item is not None or wait is None:
+                return item
+            await asyncio.sleep(wait)
+
+    def metrics(self):
+        """ホスト別の待ち行列長・待ち時間 (秒)"""
+        with self._lock:
+            return {host: dict(metrics, wait_avg=metrics["wait_total"] / metrics["dispatched"]
+                               if metrics["dispatched"] else 0.0)
+                    for host, metrics in self.metrics_by_host.items()}
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+取得・抽出パイプライン
+I/Oスレッド (取得) → 上限付きキュー → プロセスプール (セレクター抽出) の2段構成
+抽出のCPU処理がGILで取得スレッドを止めないようにし、段毎の稼働率で両側の並列数を調整できるようにする
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+
+from html_extract import StreamingExtractor, UnsupportedSelector, soup_extract
+from concurrent_fetch import ConcurrentFetcher
+from crawl_scheduler import CrawlScheduler
+
+@lru_cache(maxsize=32)
+def _process_extractor(selector_items):
+    """プロセス内でセレクターを1回だけコンパイル (未対応セレクターはNone)"""
+    try:
+        return StreamingExtractor(dict(selector_items))
+    except UnsupportedSelector:
+        return None
+
+def parse_page(content, selector_items, streaming=False, encoding=None):
+    """抽出ワーカー (プロセスプールで実行) → (抽出結果, CPU秒)"""
+    start = time.process_time()
+    extractor = _process_extractor(selector_items) if streaming else None
+    if extractor is not None:
+        data = extractor.extract(content, encoding)
+    else:
+        data = soup_extract(content, dict(selector_items), encoding)
+    return data, time.process_time() - start
+
+class FetchPipeline(ConcurrentFetcher):
+    def __init__(self, scraper, max_connections=16, parse_workers=None, queue_size=64, session=None):
+        super().__init__(scraper, max_connections, session)
+        self.parse_workers = parse_workers or os.cpu_count() or 1
+        self.queue_size = queue_size  # 抽出待ちの本文の上限 (超えると取得側が待つ)
+        self.stages = {}
+
+    async def _fetch_worker(self, executor, scheduler, fetch, queue, results):
+        """取得段: 本文を抽出キューへ (キューが満杯なら空くまで待機)"""
+        loop = asyncio.get_running_loop()
+        stage = self.stages["fetch"]
+        while True:
+            item = await scheduler.next_async()
+            if item is None:
+                return
+            self.stats["requests"] += 1
+            start = time.perf_counter()
+            raw = await loop.run_in_executor(executor, scheduler.execute, item, fetch, self.session)
+            stage["busy_sec"] += time.perf_counter() - start
+            if 'error' in raw:
+                self.stats["errors"] += 1
+                results[item.index] = raw
+                continue
+
+            start = time.perf_counter()
+            await queue.put((item.index, raw))
+            stage["blocked_sec"] += time.perf_counter() - start
+            self.stages["queue"]["peak"] = max(self.stages["queue"]["peak"], queue.qsize())
+
+    async def _parse_worker(self, pool, queue, selector_items, streaming, results):
+        """抽出段: キューの本文をプロセスプールで抽出 (Noneで終了)"""
+        loop = asyncio.get_running_loop()
+        stage = self.stages["parse"]
+        while True:
+            start = time.perf_counter()
+            entry = await queue.get()
+            stage["idle_sec"] += time.perf_counter() - start
+            if entry is None:
+                return
+
+            index, raw = entry
+            data = raw["data"]
+            start = time.perf_counter()
+            try:
+                fields, cpu = await loop.run_in_executor(
+                    pool, parse_page, raw["content"], selector_items, streaming, raw["encoding"])
+                stage["cpu_sec"] += cpu
+                data.update(fields)
+            except Exception as e:
+                self.stats["errors"] += 1
+                data = {'url': data['url'], 'error': str(e)}
+            stage["busy_sec"] += time.perf_counter() - start
+            stage["pages"] += 1
+            results[index] = data
+
+    async def process_all(self, urls, selectors, streaming=False, scheduler=None, results=None):
+        """全URLを取得・抽出 (結果はURL順・results指定時は完了順にそこへ格納)"""
+        if scheduler is None:
+            scheduler = CrawlScheduler(self.scraper.rate_limiter)
+            scheduler.add(urls)
+        self.stages = {
+            "fetch": {"workers": self.max_connections, "busy_sec": 0.0, "blocked_sec": 0.0},
+            "parse": {"workers": self.parse_workers, "busy_sec": 0.0, "cpu_sec": 0.0,
+                      "idle_sec": 0.0, "pages": 0},
+            "queue": {"size": self.queue_size, "peak": 0}
+        }
+        selector_items = tuple(selectors.items())
+        if results is None:
+            results = [None] * len(urls)
+        queue = asyncio.Queue(maxsize=self.queue_size)
+
+        def fetch(url, session):
+            try:
+                data, content, charset = self.scraper.fetch_page(url, session)
+                return {"data": data, "content": content, "encoding": charset}
+            except Exception as e:
+                return {'url': url, 'error': str(e)}
+
+        with ThreadPoolExecutor(max_workers=self.max_connections) as executor, \
+                ProcessPoolExecutor(max_workers=self.parse_workers) as pool:
+            parsers = [asyncio.create_task(self._parse_worker(pool, queue, selector_items, streaming, results))
+                       for _ in range(self.parse_workers)]
+            await asyncio.gather(*(self._fetch_worker(executor, scheduler, fetch, queue, results)
+                                   for _ in range(self.max_connections)))
+            for _ in parsers:
+                await queue.put(None)
+            await asyncio.gather(*parsers)
+        return results
+
+    def run_pipeline(self, urls, selectors, streaming=False, scheduler=None, results=None):
+        """同期呼び出し用エントリポイント (段毎の稼働率は utilization() で参照)"""
+        start = time.perf_counter()
+        try:
+            return asyncio.run(self.process_all(urls, selectors, streaming, scheduler, results))
+        finally:
+            self.stats["elapsed"] += time.perf_counter() - start
+
+    def utilization(self):
+        """段毎の稼働率 (処理中の時間 / (ワーカー数 × 経過時間))
+        取得側が高く抽出側が低ければ接続数を、キュー満杯待ち (blocked) が長ければ抽出プロセスを増やす"""
+        elapsed = self.stats["elapsed"]
+        report = {}
+        for name in ("fetch", "parse"):
+            stage = dict(self.stages.get(name, {}))
+            if not stage:
+                continue
+            capacity = stage["workers"] * elapsed
+            stage["utilization"] = round(stage["busy_sec"] / capacity, 3) if capacity else 0.0
+            report[name] = {k: round(v, 3) if isinstance(v, float) else v for k, v in stage.items()}
+        if "queue" in self.stages:
+            report["queue"] = dict(self.stages["queue"])
+        report["elapsed_sec"] = round(elapsed, 3)
+        return report
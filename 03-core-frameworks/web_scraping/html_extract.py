@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+ストリーミングHTML抽出エンジン
+セレクターを1回だけコンパイルし、逐次パースで必要なフィールドだけを取得 (全フィールド取得後は即終了)
+BeautifulSoupのselect_one(...).text.strip() と同じ結果を返す
+"""
+
+import codecs
+import re
+from html.parser import HTMLParser
+
+from bs4 import BeautifulSoup
+
+# 子要素を持たない要素 (終了タグなし)
+VOID_ELEMENTS = {"area", "base", "br", "col", "embed", "hr", "img", "input",
+                 "link", "meta", "param", "source", "track", "wbr"}
+
+# <meta charset> / <meta http-equiv="Content-Type" content="...; charset=..."> を探す範囲 (HTML仕様は先頭1024バイト)
+SNIFF_BYTES = 4096
+META_CHARSET = re.compile(rb"""<meta[^>]+?charset\s*=\s*["']?\s*([A-Za-z0-9_.:-]+)""", re.IGNORECASE)
+
+RAW_TEXT_ELEMENTS = {"script", "style", "template"}
+PRESERVE_WHITESPACE = {"pre", "textarea"}
+
+SIMPLE_PATTERN = re.compile(
+    r"""(?P<tag>[a-zA-Z][\w-]*|\*)?"""
+    r"""(?P<rest>(?:[.#][\w-]+|\[[\w-]+(?:=(?:"[^"]*"|'[^']*'|[^\]]*))?\])*)$""")
+PART_PATTERN = re.compile(r"""[.#][\w-]+|\[([\w-]+)(?:=("[^"]*"|'[^']*'|[^\]]*))?\]""")
+
+class UnsupportedSelector(ValueError):
+    pass
+
+def _compile_simple(text):
+    """単純セレクター (tag.class#id[attr=value]) → 条件辞書"""
+    m = SIMPLE_PATTERN.match(text)
+    if not m or not text:
+        raise UnsupportedSelector(text)
+
+    simple = {"tag": m.group('tag') if m.group('tag') not in (None, '*') else None,
+              "id": None, "classes": set(), "attrs": []}
+    if simple["tag"]:
+        simple["tag"] = simple["tag"].lower()
+
+    for part in PART_PATTERN.finditer(m.group('rest')):
+        token = part.group(0)
+        if token[0] == '.':
+            simple["classes"].add(token[1:])
+        elif token[0] == '#':
+            simple["id"] = token[1:]
+        else:
+            value = part.group(2)
+            if value is not None and value[:1] in ('"', "'"):
+                value = value[1:-1]
+            simple["attrs"].append((part.group(1).lower(), value))
+    return simple
+
+def compile_selector(selector):
+    """CSSセレクター → [(結合子, 単純セレクター), ...] の候補リスト (カンマ区切り対応)"""
+    alternatives = []
+    for alternative in selector.split(','):
+        tokens = re.findall(r">|[^\s>]+", alternative.strip())
+        if not tokens or tokens[0] == '>' or tokens[-1] == '>':
+            raise UnsupportedSelector(selector)
+
+        chain, combinator = [], ' '
+        for token in tokens:
+            if token == '>':
+                combinator = '>'
+                continue
+            chain.append((combinator, _compile_simple(token)))
+            combinator = ' '
+        alternatives.append(chain)
+    return alternatives
+
+def _simple_matches(simple, element):
+    tag, attrs, classes = element
+    if simple["tag"] and simple["tag"] != tag:
+        return False
+    if simple["id"] and attrs.get("id") != simple["id"]:
+        return False
+    if simple["classes"] and not simple["classes"] <= classes:
+        return False
+    for name, value in simple["attrs"]:
+        if name not in attrs or (value is not None and attrs[name] != value):
+            return False
+    return True
+
+def _chain_matches(chain, stack, pi=None, si=None):
+    """セレクター連鎖の照合 (右端 = 現在要素から祖先方向へ)"""
+    if pi is None:
+        pi, si = len(chain) - 1, len(stack) - 1
+    combinator, simple = chain[pi]
+    if not _simple_matches(simple, stack[si]):
+        return False
+    if pi == 0:
+        return True
+    if combinator == '>':
+        return si > 0 and _chain_matches(chain, stack, pi - 1, si - 1)
+    return any(_chain_matches(chain, stack, pi - 1, j) for j in range(si - 1, -1, -1))
+
+class _ExtractParser(HTMLParser):
+    def __init__(self, fields):
+        super().__init__(convert_charrefs=True)
+        self.fields = fields
+        self.pending = dict(fields)  # 未発見フィールド
+        self.capturing = {}          # フィールド → [要素の深さ, テキスト断片]
+        self.results = {}
+        self.stack = []
+
+    @property
+    def done(self):
+        return not self.pending and not self.capturing
+
+    def handle_starttag(self, tag, attrs):
+        attrs = {name: value or "" for name, value in attrs}
+        element = (tag, attrs, set(attrs.get("class", "").split()))
+        self.stack.append(element)
+
+        for key, alternatives in list(self.pending.items()):
+            if any(_chain_matches(chain, self.stack) for chain in alternatives):
+                del self.pending[key]
+                self.capturing[key] = [len(self.stack), []]
+
+        if tag in VOID_ELEMENTS:
+            self._pop_to(len(self.stack) - 1)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self._pop_to(len(self.stack) - 1)
+
+    def handle_endtag(self, tag):
+        # 閉じ忘れの要素は対応する開始タグまでまとめて閉じる
+        for depth in range(len(self.stack) - 1, -1, -1):
+            if self.stack[depth][0] == tag:
+                self._pop_to(depth)
+                return
+
+    def _pop_to(self, depth):
+        del self.stack[depth:]
+        for key, (element_depth, parts) in list(self.capturing.items()):
+            if element_depth > depth:
+                self.results[key] = "".join(parts).strip()
+                del self.capturing[key]
+
+    def handle_data(self, data):
+        # script/style の中身はテキストに含めない (BeautifulSoupのget_textと同じ)
+        if not self.capturing or (self.stack and self.stack[-1][0] in RAW_TEXT_ELEMENTS):
+            return
+        # 空白のみのテキストは改行1つ (または空白1つ) に畳む (BeautifulSoupと同じ)
+        if not data.strip() and not any(e[0] in PRESERVE_WHITESPACE for e in self.stack):
+            data = "\n" if "\n" in data else " "
+        for _, parts in self.capturing.values():
+            parts.append(data)
+
+    def finish(self):
+        """文書末尾で未終了の要素を確定"""
+        self._pop_to(0)
+        return {key: self.results.get(key) for key in self.fields}
+
+def sniff_encoding(content):
+    """文書先頭の <meta> で宣言された文字コード (なし・未知の名前はNone)"""
+    m = META_CHARSET.search(content[:SNIFF_BYTES])
+    if not m:
+        return None
+    name = m.group(1).decode("ascii")
+    try:
+        codecs.lookup(name)
+    except LookupError:
+        return None
+    return name
+
+def soup_extract(content, selectors, encoding=None):
+    """BeautifulSoupで全体パースして抽出 (ストリーミング未対応セレクター用・encodingはContent-Typeのcharset)"""
+    if isinstance(content, bytes) and encoding:
+        soup = BeautifulSoup(content, 'html.parser', from_encoding=encoding)
+    else:
+        soup = BeautifulSoup(content, 'html.parser')
+    data = {}
+    for key, selector in selectors.items():
+        element = soup.select_one(selector)
+        data[key] = element.text.strip() if element else None
+    return data
+
+class StreamingExtractor:
+    def __init__(self, selectors, chunk_size=16 * 1024):
+        self.selectors = dict(selectors)
+        self.fields = {key: compile_selector(selector) for key, selector in self.selectors.items()}
+        self.chunk_size = chunk_size
+        self.stats = {"pages": 0, "early_exits": 0, "bytes_parsed": 0, "bytes_total": 0}
+
+    def extract(self, content, encoding=None):
+        """フィールド抽出 (全フィールド取得時点でパース終了)
+        encoding未指定 (Content-Typeにcharsetなし) は <meta charset> → UTF-8 の順で決定"""
+        parser = _ExtractParser(self.fields)
+        self.stats["pages"] += 1
+        self.stats["bytes_total"] += len(content)
+
+        if isinstance(content, bytes):
+            encoding = encoding or sniff_encoding(content) or "utf-8"
+            try:
+                decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+            except LookupError:
+                decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        else:
+            decoder = None
+
+        for offset in range(0, len(content), self.chunk_size):
+            chunk = content[offset:offset + self.chunk_size]
+            self.stats["bytes_parsed"] += len(chunk)
+            parser.feed(decoder.decode(chunk) if decoder else chunk)
+            if parser.done:
+                self.stats["early_exits"] += 1
+                break
+        else:
+            if decoder:
+                parser.feed(decoder.decode(b"", final=True))
+            parser.close()
+
+        return parser.finish()
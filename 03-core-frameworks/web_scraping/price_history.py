@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+価格履歴ストア (SQLite)
+URL × フィールド単位で値が変わった時だけ記録 (容量は取得回数ではなく変化の回数に比例)
+最新値・時刻T時点の値をインデックスで検索
+"""
+
+import os
+import sqlite3
+from datetime import datetime
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS fields (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    field TEXT NOT NULL,
+    value TEXT,
+    changed_at TEXT NOT NULL,
+    checked_at TEXT NOT NULL,
+    UNIQUE (url, field)
+);
+CREATE TABLE IF NOT EXISTS changes (
+    field_id INTEGER NOT NULL REFERENCES fields(id),
+    changed_at TEXT NOT NULL,
+    value TEXT,
+    PRIMARY KEY (field_id, changed_at)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_changes_time ON changes(changed_at);
+"""
+
+# 結果辞書のうちフィールド値ではないキー
+META_KEYS = {"url", "timestamp", "error"}
+
+def _iso(when):
+    return when.isoformat() if isinstance(when, datetime) else when
+
+class PriceHistory:
+    def __init__(self, db_file="data/price_history.db"):
+        self.db_file = db_file
+        if os.path.dirname(db_file):
+            os.makedirs(os.path.dirname(db_file), exist_ok=True)
+
+        self.conn = sqlite3.connect(db_file)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._latest = None  # (URL, フィールド) → (id, 最新値) (変化判定用・初回記録時に読み込み)
+
+    def _load_latest(self):
+        if self._latest is None:
+            self._latest = {(row['url'], row['field']): (row['id'], row['value'])
+                            for row in self.conn.execute("SELECT id, url, field, value FROM fields")}
+        return self._latest
+
+    def record(self, results):
+        """取得結果を記録 → 値が変わったフィールドのみのリスト (エラー結果は無視)"""
+        latest = self._load_latest()
+        changes = []
+        with self.conn:
+            for result in results:
+                if result is None or 'error' in result:
+                    continue
+                url = result['url']
+                when = result.get('timestamp') or datetime.now().isoformat()
+                for field, value in result.items():
+                    if field in META_KEYS:
+                        continue
+                    key = (url, field)
+                    if key in latest and latest[key][1] == value:
+                        continue
+
+                    if key in latest:
+                        field_id = latest[key][0]
+                        self.conn.execute("UPDATE fields SET value = ?, changed_at = ?, checked_at = ? WHERE id = ?",
+                                          (value, when, when, field_id))
+                    else:
+                        field_id = self.conn.execute(
+                            "INSERT INTO fields (url, field, value, changed_at, checked_at) VALUES (?, ?, ?, ?, ?)",
+                            (url, field, value, when, when)).lastrowid
+                    self.conn.execute("INSERT OR REPLACE INTO changes (field_id, changed_at, value) VALUES (?, ?, ?)",
+                                      (field_id, when, value))
+                    changes.append({'url': url, 'field': field, 'value': value, 'changed_at': when,
+                                    'previous': latest[key][1] if key in latest else None})
+                    latest[key] = (field_id, value)
+
+                # 変化がなくても最終確認時刻は更新 (時刻T時点の値がどこまで確かかの目安)
+                self.conn.execute("UPDATE fields SET checked_at = ? WHERE url = ? AND checked_at < ?",
+                                  (when, url, when))
+        return changes
+
+    def latest(self, url, field=None):
+        """最新値 (field省略時は URL の全フィールド辞書)"""
+        if field is not None:
+            row = self.conn.execute("SELECT value FROM fields WHERE url = ? AND field = ?", (url, field)).fetchone()
+            return row['value'] if row else None
+        return {row['field']: row['value']
+                for row in self.conn.execute("SELECT field, value FROM fields WHERE url = ?", (url,))}
+
+    def at(self, url, field, when):
+        """時刻 when 時点の値 (記録開始前ならNone)"""
+        row = self.conn.execute(
+            "SELECT c.value FROM fields f JOIN changes c ON c.field_id = f.id "
+            "WHERE f.url = ? AND f.field = ? AND c.changed_at <= ? "
+            "ORDER BY c.changed_at DESC LIMIT 1", (url, field, _iso(when))).fetchone()
+        return row['value'] if row else None
+
+    def history(self, url, field):
+        """変化の履歴 [(時刻, 値), ...] (古い順)"""
+        return [(row['changed_at'], row['value']) for row in self.conn.execute(
+            "SELECT c.changed_at, c.value FROM fields f JOIN changes c ON c.field_id = f.id "
+            "WHERE f.url = ? AND f.field = ? ORDER BY c.changed_at", (url, field))]
+
+    def changes_since(self, since):
+        """時刻 since より後の変化 (古い順)"""
+        return [dict(row) for row in self.conn.execute(
+            "SELECT f.url, f.field, c.value, c.changed_at FROM changes c JOIN fields f ON f.id = c.field_id "
+            "WHERE c.changed_at > ? ORDER BY c.changed_at", (_iso(since),))]
+
+    def stats(self):
+        """記録件数 (フィールド数・変化数)"""
+        fields = self.conn.execute("SELECT COUNT(*) FROM fields").fetchone()[0]
+        changes = self.conn.execute("SELECT COUNT(*) FROM changes").fetchone()[0]
+        return {'fields': fields, 'changes': changes}
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+取得結果のストリーミング保存 (JSON Lines・gzip対応)
+完了した結果から1行ずつ追記し、fsyncはN件またはN秒毎にまとめて実行
+ファイル書き込み・fsyncは専用の書き込みスレッドで行い、呼び出し側 (巡回のイベントループ) を止めない
+再起動時は保存済みのURLを読み込んで取得済み分をスキップ (途中で切れた末尾は修復)
+"""
+
+import gzip
+import json
+import os
+import queue
+import threading
+import time
+import zlib
+
+def read_results(path, compress=None):
+    """保存済み結果を順に返す (途中で切れた末尾の行・gzipメンバーは無視)"""
+    if not os.path.exists(path):
+        return
+    if compress is None:
+        compress = path.endswith(".gz")
+    opener = gzip.open if compress else open
+    try:
+        with opener(path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    return
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    return
+    except (EOFError, OSError, zlib.error):
+        return
+
+_SYNC = object()  # 書き込みスレッドへのfsync要求
+
+class JsonLinesSink:
+    def __init__(self, path, compress=None, fsync_every=100, fsync_interval=1.0, resume=True,
+                 clock=time.monotonic):
+        self.path = path
+        self.compress = path.endswith(".gz") if compress is None else compress
+        self.fsync_every = fsync_every        # この件数毎にfsync
+        self.fsync_interval = fsync_interval  # 前回のfsyncからこの秒数経過でもfsync
+        self.resume = resume
+        self.clock = clock
+        self.completed = set()  # 取得成功済みのURL (再開時にスキップ)
+        self.stats = {"written": 0, "fsyncs": 0, "resumed": 0, "repaired": False}
+        self._raw = None
+        self._out = None
+        self._unsynced = 0
+        self._last_sync = clock()
+        self._queue = None
+        self._writer = None
+        self._error = None  # 書き込みスレッドで発生した例外 (次の write / sync / close で送出)
+
+    def open(self):
+        """既存ファイルから再開 (resume=Falseなら作り直し)"""
+        count = 0
+        self.completed = set()
+        if self.resume:
+            for record in read_results(self.path, self.compress):
+                count += 1
+                if "error" not in record:
+                    self.completed.add(record["url"])
+        self.stats["resumed"] = len(self.completed)
+
+        if self.resume and os.path.exists(self.path) and not self._is_clean(count):
+            # 書き込み途中で終了したファイルは有効な行だけで書き直してから追記
+            self._rewrite()
+            self.stats["repaired"] = True
+
+        self._raw = open(self.path, "ab" if self.resume else "wb")
+        self._out = gzip.GzipFile(fileobj=self._raw, mode="ab") if self.compress else self._raw
+        self._last_sync = self.clock()
+        self._error = None
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="result-sink", daemon=True)
+        self._writer.start()
+        return self
+
+    def _is_clean(self, count):
+        """末尾まで読み切れるか (gzipの未完了メンバー・改行なしの末尾行がないか)"""
+        opener = gzip.open if self.compress else open
+        lines, last = 0, b"\n"
+        try:
+            with opener(self.path, "rb") as f:
+                for line in f:
+                    lines += 1
+                    last = line[-1:]
+        except (EOFError, OSError, zlib.error):
+            return False
+        return lines == count and last == b"\n"
+
+    def _rewrite(self):
+        tmp = self.path + ".tmp"
+        opener = gzip.open if self.compress else open
+        with opener(tmp, "wb") as f:
+            for record in read_results(self.path, self.compress):
+                f.write(self._encode(record))
+        os.replace(tmp, self.path)
+
+    @staticmethod
+    def _encode(result):
+        return (json.dumps(result, ensure_ascii=False) + "\n").encode("utf-8")
+
+    def _write_loop(self):
+        """書き込みスレッド: キューの結果を追記 (fsync_every件 / fsync_interval秒毎にディスクへ同期)"""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                if self._error is not None:
+                    continue
+                if item is _SYNC:
+                    self._sync()
+                    continue
+                self._out.write(self._encode(item))
+                self.stats["written"] += 1
+                self._unsynced += 1
+                if self._unsynced >= self.fsync_every or self.clock() - self._last_sync >= self.fsync_interval:
+                    self._sync()
+            except Exception as e:
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+    def _raise_error(self):
+        if self._error is not None:
+            raise self._error
+
+    def write(self, result):
+        """結果を書き込みキューへ (取得済みURLは即時に反映・ディスクへの書き込みは書き込みスレッド)"""
+        self._raise_error()
+        if "error" not in result:
+            self.completed.add(result["url"])
+        self._queue.put(result)
+
+    def __setitem__(self, index, result):
+        """巡回結果の格納先として使用 (results[index] = result → 追記)"""
+        self.write(result)
+
+    def _sync(self):
+        if self._unsynced:
+            self._out.flush()  # gzipはZ_SYNC_FLUSHで圧縮済み分を書き出し
+            self._raw.flush()
+            os.fsync(self._raw.fileno())
+            self.stats["fsyncs"] += 1
+            self._unsynced = 0
+        self._last_sync = self.clock()
+
+    def drain(self):
+        """キュー内の結果を書き終えるまで待機 (fsyncは通常の間隔のまま)"""
+        self._queue.join()
+        self._raise_error()
+
+    def sync(self):
+        """キュー内の結果を書き終えてからディスクへ同期"""
+        self._queue.put(_SYNC)
+        self.drain()
+
+    def pending(self, urls):
+        """未取得のURL (取得成功済みを除く・元の順序)"""
+        return [url for url in urls if url not in self.completed]
+
+    def close(self):
+        if self._out is None:
+            return
+        self._queue.put(_SYNC)
+        self._queue.put(None)
+        self._writer.join()
+        if self.compress:
+            self._out.close()
+        self._raw.close()
+        self._out = self._raw = None
+        self._writer = None
+        self._raise_error()
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+ローカル商品ページサーバー
+オフラインでの取得ベンチマーク・テスト用 (1サーバー = 1ホスト・応答遅延と受信時刻を記録・robots.txt 指定可)
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+def render_product_page(path, related=0):
+    """商品ページHTML生成 (パスから決定的に生成・related件の関連商品でページを大きくできる)"""
+    n = sum(path.encode("utf-8")) % 1000
+    items = "".join(f'<li class="related-item"><a href="/product/{i}">Related {i}</a>'
+                    f'<span class="related-price">${i}.49</span></li>' for i in range(related))
+    return f"""<!DOCTYPE html><html><head><title>Product {n}</title></head><body>
+<div class="product"><h1 class="product-title">Product {n}</h1>
+<span class="price">${n}.99</span>
+<p class="stock-status">{"In stock" if n % 3 else "Sold out"}</p></div>
+<ul class="related">{items}</ul></body></html>"""
+
+class ShopServer:
+    def __init__(self, latency=0.05, port=0, robots=None, related=0):
+        self.latency = latency
+        self.related = related  # 関連商品数 (ページサイズ・抽出負荷の調整用)
+        self.port = port
+        self.robots = robots  # robots.txt の内容 (Noneなら404)
+        self.arrivals = []  # 商品ページのリクエスト受信時刻 (time.monotonic)
+        self.robots_requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    def _handler(self):
+        shop = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/robots.txt":
+                    self._robots()
+                    return
+                with shop._lock:
+                    shop.arrivals.append(time.monotonic())
+                    shop.in_flight += 1
+                    shop.peak_in_flight = max(shop.peak_in_flight, shop.in_flight)
+                try:
+                    time.sleep(shop.latency)
+                    body = render_product_page(self.path, shop.related).encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/html; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                finally:
+                    with shop._lock:
+                        shop.in_flight -= 1
+
+            def _robots(self):
+                with shop._lock:
+                    shop.robots_requests += 1
+                if shop.robots is None:
+                    self.send_error(404)
+                    return
+                body = shop.robots.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    def min_interval(self):
+        """受信間隔の最小値 (秒・ホストへの送信間隔の確認用)"""
+        arrivals = sorted(self.arrivals)
+        return min((b - a for a, b in zip(arrivals, arrivals[1:])), default=None)
+
+    def start(self):
+        self._server = ThreadingHTTPServer(("127.0.0.1", self.port), self._handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
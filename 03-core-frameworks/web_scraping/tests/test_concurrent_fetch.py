@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+並行取得テスト
+トークンバケット・ホスト別の送信間隔・接続数上限・逐次取得との結果一致
+"""
+
+import unittest
+import sys
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import ExitStack
+
+# web_scrapingディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from concurrent_fetch import TokenBucket, HostRateLimiter, ConcurrentFetcher
+from web_scraper import WebScraper
+from shop_server import ShopServer
+
+SELECTORS = {"title": ".product-title", "price": ".price", "availability": ".stock-status"}
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+class TestTokenBucket(unittest.TestCase):
+    def test_rate_and_burst(self):
+        """バースト分は即時・以降は補充速度で取得"""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2.0, burst=2, clock=clock)
+        self.assertTrue(bucket.try_take())
+        self.assertTrue(bucket.try_take())
+        self.assertFalse(bucket.try_take())
+        self.assertAlmostEqual(bucket.delay(), 0.5)
+
+        clock.sleep(0.5)
+        self.assertTrue(bucket.try_take())
+
+    def test_hosts_are_independent(self):
+        """別ホストへのリクエストは待たない"""
+        clock = FakeClock()
+        limiter = HostRateLimiter(rate=1.0, clock=clock)
+        for url in ("http://shop1/a", "http://shop2/a", "http://shop3/a"):
+            limiter.wait(url, sleep=clock.sleep)
+        self.assertEqual(clock.now, 100.0)
+
+        limiter.wait("http://shop1/b", sleep=clock.sleep)
+        self.assertAlmostEqual(clock.now, 101.0)
+
+class TestConcurrentFetcher(unittest.TestCase):
+    def test_politeness_and_connection_limit(self):
+        """ホスト毎の送信間隔を守りつつ全体の同時接続数は上限以下"""
+        scraper = WebScraper(max_connections=3, host_rate=20.0)
+        urls = [f"http://shop{h}.example/product/{i}" for i in range(4) for h in range(5)]
+        starts = defaultdict(list)
+        lock = threading.Lock()
+        state = {"in_flight": 0, "peak": 0}
+
+        def fetch(url, session):
+            with lock:
+                starts[url.split("/")[2]].append(time.monotonic())
+                state["in_flight"] += 1
+                state["peak"] = max(state["peak"], state["in_flight"])
+            time.sleep(0.02)
+            with lock:
+                state["in_flight"] -= 1
+            return {"url": url}
+
+        results = ConcurrentFetcher(scraper, max_connections=3).run(urls, fetch)
+        self.assertEqual([r["url"] for r in results], urls)
+        self.assertLessEqual(state["peak"], 3)
+        for times in starts.values():
+            gaps = [b - a for a, b in zip(times, times[1:])]
+            self.assertGreaterEqual(min(gaps), 1 / 20.0 - 0.005)
+
+    def test_matches_serial_and_faster(self):
+        """逐次取得と同じ結果・ホスト数に応じて短縮"""
+        with ExitStack() as stack:
+            shops = [stack.enter_context(ShopServer(latency=0.1)) for _ in range(3)]
+            urls = [f"{shop.base_url}/product/{i}" for i in range(3) for shop in shops]
+            scraper = WebScraper(host_rate=10.0)
+
+            start = time.perf_counter()
+            serial = scraper.scrape_prices(urls, SELECTORS)
+            serial_sec = time.perf_counter() - start
+
+            start = time.perf_counter()
+            concurrent = scraper.scrape_prices(urls, SELECTORS, streaming=True, concurrent=True)
+            concurrent_sec = time.perf_counter() - start
+
+        strip = lambda results: [{k: v for k, v in r.items() if k != 'timestamp'} for r in results]
+        self.assertEqual(strip(concurrent), strip(serial))
+        scraper.close()
+        self.assertNotIn('error', concurrent[0])
+        self.assertLess(concurrent_sec, serial_sec / 2)
+
+    def test_session_reused_across_runs(self):
+        """接続プールは取得毎に作り直さず使い回し・2回目は既存の接続で取得"""
+        with ShopServer(latency=0.01) as shop, WebScraper(host_rate=50.0) as scraper:
+            urls = [f"{shop.base_url}/product/{i}" for i in range(3)]
+            scraper.scrape_prices(urls, SELECTORS, concurrent=True)
+            session = scraper.pooled_session()
+            adapter = session.get_adapter(shop.base_url)
+            pooled = len(adapter.poolmanager.pools)
+
+            scraper.scrape_prices(urls, SELECTORS, concurrent=True)
+            self.assertIs(scraper.pooled_session(), session)
+            self.assertEqual(len(adapter.poolmanager.pools), pooled)
+        self.assertIsNone(scraper._pooled_session)
+
+if __name__ == "__main__":
+    unittest.main()
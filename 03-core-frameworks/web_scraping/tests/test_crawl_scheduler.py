@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+巡回スケジューラーテスト
+robots.txt のキャッシュ・Disallow / Request-rate の反映・送信可能なホストからの払い出し・メトリクス
+"""
+
+import unittest
+import sys
+import os
+import time
+from contextlib import ExitStack
+
+# web_scrapingディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from concurrent_fetch import HostRateLimiter
+from crawl_scheduler import CrawlScheduler, RobotsCache, parse_crawl_delays
+from web_scraper import WebScraper
+from shop_server import ShopServer
+
+SELECTORS = {"title": ".product-title", "price": ".price"}
+
+ROBOTS = """User-agent: *
+Disallow: /private
+Request-rate: 5/1
+"""
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+class FakeResponse:
+    def __init__(self, status_code, text=""):
+        self.status_code = status_code
+        self.text = text
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = responses
+        self.headers = {"User-Agent": "Mozilla/5.0"}
+        self.requested = []
+
+    def get(self, url, timeout=None):
+        self.requested.append(url)
+        response = self.responses[url]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+class TestRobotsCache(unittest.TestCase):
+    def test_ttl_and_status(self):
+        """TTL内はキャッシュ・401/403は全禁止・404は全許可・5xx/接続エラーは error_ttl 後に再取得"""
+        clock = FakeClock()
+        session = FakeSession({
+            "http://a/robots.txt": FakeResponse(200, ROBOTS),
+            "http://b/robots.txt": FakeResponse(403),
+            "http://c/robots.txt": FakeResponse(404),
+            "http://d/robots.txt": ConnectionError("down"),
+            "http://e/robots.txt": FakeResponse(503)})
+        cache = RobotsCache(ttl=60, error_ttl=10, clock=clock)
+
+        policy = cache.policy("http://a/product/1", session)
+        self.assertTrue(policy.allowed("http://a/product/1"))
+        self.assertFalse(policy.allowed("http://a/private/1"))
+        self.assertAlmostEqual(policy.min_interval, 0.2)
+        self.assertIs(cache.policy("http://a/product/2", session), policy)
+
+        self.assertFalse(cache.policy("http://b/x", session).allowed("http://b/x"))
+        self.assertTrue(cache.policy("http://c/x", session).allowed("http://c/x"))
+        self.assertTrue(cache.policy("http://d/x", session).allowed("http://d/x"))
+        self.assertTrue(cache.policy("http://e/x", session).allowed("http://e/x"))
+
+        clock.sleep(30)
+        cache.policy("http://d/x", session)
+        cache.policy("http://a/x", session)
+        self.assertEqual(session.requested.count("http://d/robots.txt"), 2)
+        self.assertEqual(session.requested.count("http://a/robots.txt"), 1)
+        self.assertEqual(cache.stats, {"fetches": 6, "hits": 2, "errors": 3})
+
+    def test_disallow_on_error(self):
+        """disallow_on_error 指定時は取得できないホストを error_ttl の間は全禁止 (RFC 9309)"""
+        session = FakeSession({"http://d/robots.txt": ConnectionError("down"),
+                               "http://e/robots.txt": FakeResponse(503)})
+        cache = RobotsCache(error_ttl=10, disallow_on_error=True)
+        self.assertFalse(cache.policy("http://d/x", session).allowed("http://d/x"))
+        self.assertFalse(cache.policy("http://e/x", session).allowed("http://e/x"))
+
+    def test_fractional_crawl_delay(self):
+        """小数の Crawl-delay もそのまま送信間隔に反映 (該当 User-agent のグループを優先)"""
+        robots = "User-agent: *\nCrawl-delay: 1.5\n\nUser-agent: Mozilla\nUser-agent: other\nCrawl-delay: 2.5\n"
+        self.assertEqual(parse_crawl_delays(robots.splitlines()), [(["*"], 1.5), (["mozilla", "other"], 2.5)])
+
+        session = FakeSession({"http://a/robots.txt": FakeResponse(200, robots)})
+        self.assertAlmostEqual(RobotsCache().policy("http://a/x", session).min_interval, 2.5)
+        session.headers["User-Agent"] = "SomeBot/1.0"
+        self.assertAlmostEqual(RobotsCache().policy("http://a/x", session).min_interval, 1.5)
+
+class TestCrawlScheduler(unittest.TestCase):
+    def test_ready_hosts_first(self):
+        """待ち中のホストがあっても他ホストのURLを払い出す・待ち行列の長いホストを優先"""
+        clock = FakeClock()
+        scheduler = CrawlScheduler(HostRateLimiter(rate=1.0, clock=clock), clock=clock)
+        urls = ["http://slow/1", "http://slow/2", "http://slow/3", "http://fast/1", "http://other/1"]
+        scheduler.add(urls)
+
+        order = []
+        while (item := scheduler.next_blocking(sleep=clock.sleep)) is not None:
+            order.append((item.url, clock.now - 100.0))
+
+        self.assertEqual([url for url, _ in order[:3]], ["http://slow/1", "http://fast/1", "http://other/1"])
+        self.assertEqual(order[3:], [("http://slow/2", 1.0), ("http://slow/3", 2.0)])
+
+        metrics = scheduler.metrics()
+        self.assertEqual(metrics["slow"]["peak_queued"], 3)
+        self.assertEqual(metrics["slow"]["queued"], 0)
+        self.assertAlmostEqual(metrics["slow"]["wait_max"], 2.0)
+        self.assertAlmostEqual(metrics["slow"]["wait_avg"], 1.0)
+        self.assertEqual(metrics["fast"]["wait_max"], 0.0)
+
+    def test_first_url_after_robots(self):
+        """初回URLは robots.txt の取得とは別のトークンで送信・禁止された初回URLは disallowed のみ計上"""
+        clock = FakeClock()
+        session = FakeSession({"http://a/robots.txt": FakeResponse(200, ROBOTS),
+                               "http://c/robots.txt": FakeResponse(404)})
+        scheduler = CrawlScheduler(HostRateLimiter(rate=1.0, clock=clock), RobotsCache(clock=clock), clock=clock)
+        scheduler.add(["http://a/private/1", "http://c/1"])
+        fetched = []
+
+        def fetch(url, session):
+            fetched.append((url, clock.now - 100.0))
+            return {"url": url}
+
+        while (item := scheduler.next_blocking(sleep=clock.sleep)) is not None:
+            scheduler.execute(item, fetch, session, sleep=clock.sleep)
+
+        self.assertEqual(fetched, [("http://c/1", 1.0)])
+        metrics = scheduler.metrics()
+        self.assertEqual((metrics["a"]["dispatched"], metrics["a"]["disallowed"]), (0, 1))
+        self.assertEqual((metrics["c"]["dispatched"], metrics["c"]["disallowed"]), (1, 0))
+
+class TestPoliteScraping(unittest.TestCase):
+    def test_robots_respected(self):
+        """禁止URLは取得しない・Request-rate のホストだけ間隔を空け、他ホストは待たない"""
+        with ExitStack() as stack:
+            polite = stack.enter_context(ShopServer(latency=0.01, robots=ROBOTS))
+            open_shop = stack.enter_context(ShopServer(latency=0.01))
+            urls = ([f"{polite.base_url}/product/{i}" for i in range(3)] + [f"{polite.base_url}/private/1"]
+                    + [f"{open_shop.base_url}/product/{i}" for i in range(3)])
+            scraper = WebScraper(host_rate=50.0)
+
+            start = time.perf_counter()
+            results = scraper.scrape_prices(urls, SELECTORS, concurrent=True)
+            elapsed = time.perf_counter() - start
+
+            self.assertIn('robots.txt', results[3]['error'])
+            self.assertTrue(all('error' not in r for i, r in enumerate(results) if i != 3))
+            self.assertEqual(len(polite.arrivals), 3)
+            self.assertGreaterEqual(polite.min_interval(), 0.15)
+            self.assertEqual((polite.robots_requests, open_shop.robots_requests), (1, 1))
+            self.assertGreaterEqual(elapsed, 0.4)
+
+            metrics = scraper.crawl_metrics()
+            self.assertAlmostEqual(metrics[f"127.0.0.1:{polite.port}"]["min_interval"], 0.2)
+            self.assertEqual(metrics[f"127.0.0.1:{polite.port}"]["disallowed"], 1)
+            self.assertLess(metrics[f"127.0.0.1:{open_shop.port}"]["wait_max"], 0.2)
+
+            # 2回目はキャッシュ済みの robots.txt を使用
+            scraper.scrape_prices(urls[:1], SELECTORS)
+            self.assertEqual(polite.robots_requests, 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+取得・抽出パイプラインテスト
+逐次取得との結果一致・抽出待ちキューの上限・段毎の稼働率
+"""
+
+import unittest
+import sys
+import os
+from contextlib import ExitStack
+
+# web_scrapingディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from fetch_pipeline import FetchPipeline, parse_page
+from web_scraper import WebScraper
+from shop_server import ShopServer, render_product_page
+
+SELECTORS = {"title": ".product-title", "price": ".price", "availability": ".stock-status"}
+
+class TestParsePage(unittest.TestCase):
+    def test_streaming_matches_soup(self):
+        """ストリーミング抽出とBeautifulSoup抽出が一致・未対応セレクターはフォールバック"""
+        content = render_product_page("/product/7", related=20).encode("utf-8")
+        items = tuple(SELECTORS.items())
+        streamed, _ = parse_page(content, items, streaming=True)
+        parsed, cpu = parse_page(content, items)
+        self.assertEqual(streamed, parsed)
+        self.assertGreaterEqual(cpu, 0.0)
+
+        fallback, _ = parse_page(content, (("first", "ul > li:first-child a"),), streaming=True)
+        self.assertEqual(fallback, {"first": "Related 0"})
+
+class TestFetchPipeline(unittest.TestCase):
+    def test_matches_serial_with_stage_stats(self):
+        """逐次取得と同じ結果 (URL順)・キューは上限以下・段毎の稼働率を記録"""
+        with ExitStack() as stack:
+            shops = [stack.enter_context(ShopServer(latency=0.01, related=50)) for _ in range(3)]
+            urls = [f"{shop.base_url}/product/{i}" for i in range(4) for shop in shops]
+            urls.append("http://127.0.0.1:1/product/0")  # 接続できないホスト
+            scraper = WebScraper(host_rate=50.0, parse_workers=2, parse_queue_size=2)
+
+            serial = scraper.scrape_prices(urls, SELECTORS)
+            piped = scraper.scrape_prices(urls, SELECTORS, streaming=True, pipeline=True)
+
+        strip = lambda results: [{k: v for k, v in r.items() if k not in ('timestamp', 'error')} for r in results]
+        self.assertEqual(strip(piped), strip(serial))
+        self.assertIn('error', piped[-1])
+        self.assertNotIn('error', piped[0])
+
+        stages = scraper.pipeline_stats
+        self.assertEqual(stages["parse"]["pages"], len(urls) - 1)
+        self.assertEqual(stages["parse"]["workers"], 2)
+        self.assertLessEqual(stages["queue"]["peak"], 2)
+        for name in ("fetch", "parse"):
+            self.assertGreater(stages[name]["busy_sec"], 0.0)
+            self.assertTrue(0.0 < stages[name]["utilization"] <= 1.0)
+
+    def test_utilization_before_run(self):
+        """未実行時は空の段情報"""
+        fetcher = FetchPipeline(WebScraper(), max_connections=2, parse_workers=1)
+        self.assertEqual(fetcher.utilization(), {"elapsed_sec": 0.0})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+ストリーミングHTML抽出テスト
+BeautifulSoup select_one(...).text.strip() との結果一致確認
+"""
+
+import unittest
+import sys
+import os
+
+# web_scrapingディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from bs4 import BeautifulSoup
+
+from html_extract import StreamingExtractor, UnsupportedSelector, compile_selector, sniff_encoding
+from web_scraper import WebScraper
+
+PAGE = """<!DOCTYPE html>
+<html><head><title>Shop</title><script>var price = "$0";</script></head>
+<body>
+  <div id="main" class="container wide">
+    <h1 class="product-title">Widget <b>Pro</b> &amp; Case</h1>
+    <img src="a.jpg" alt="widget">
+    <ul class="prices">
+      <li><span class="price old">$120.00</span></li>
+      <li><span class="price" data-kind="sale">$99.00</span></li>
+    </ul>
+    <p class="stock-status">In stock<br>Ships today
+    <p class="note">Unclosed paragraph</p>
+    <table><tr><td class="sku">SKU-1</td></tr></table>
+  </div>
+  <footer><span class="price">$1.00</span></footer>
+</body></html>"""
+
+SELECTORS = {
+    "title": ".product-title",
+    "first_price": ".price",
+    "sale_price": "span[data-kind=sale]",
+    "child_price": "ul.prices > li > .price",
+    "descendant_price": "#main .prices .price",
+    "stock": "p.stock-status",
+    "sku": "table td.sku",
+    "footer_price": "footer .price",
+    "missing": ".does-not-exist",
+    "either": ".missing-class, .note"
+}
+
+def soup_extract(content, selectors):
+    soup = BeautifulSoup(content, 'html.parser')
+    return {key: (el.text.strip() if (el := soup.select_one(sel)) else None)
+            for key, sel in selectors.items()}
+
+class TestStreamingExtractor(unittest.TestCase):
+    def test_matches_beautifulsoup(self):
+        """BeautifulSoupとの結果一致テスト"""
+        extractor = StreamingExtractor(SELECTORS, chunk_size=64)
+        self.assertEqual(extractor.extract(PAGE.encode("utf-8")), soup_extract(PAGE, SELECTORS))
+
+    def test_early_exit(self):
+        """全フィールド取得後のパース終了テスト"""
+        page = "<div><span class='price'>$5</span></div>" + "<p>filler</p>" * 5000
+        extractor = StreamingExtractor({"price": ".price"}, chunk_size=1024)
+        self.assertEqual(extractor.extract(page.encode("utf-8")), {"price": "$5"})
+        self.assertEqual(extractor.stats["early_exits"], 1)
+        self.assertLess(extractor.stats["bytes_parsed"], extractor.stats["bytes_total"] / 10)
+
+    def test_multibyte_chunks(self):
+        """マルチバイト文字がチャンク境界をまたぐ場合"""
+        page = "<p class='title'>" + "価格比較" * 50 + "</p>"
+        extractor = StreamingExtractor({"title": ".title"}, chunk_size=7)
+        self.assertEqual(extractor.extract(page.encode("utf-8"))["title"], "価格比較" * 50)
+
+    def test_meta_charset(self):
+        """Content-Typeにcharsetがなければ <meta> の宣言で復号 (Shift_JIS / EUC-JP)"""
+        pages = {
+            "shift_jis": '<html><head><meta charset="Shift_JIS"></head>'
+                         '<body><h1 class="product-title">日本語の商品名</h1><span class="price">￥1,980</span></body></html>',
+            "euc_jp": '<html><head><meta http-equiv="Content-Type" content="text/html; charset=EUC-JP"></head>'
+                      '<body><h1 class="product-title">日本語の商品名</h1><span class="price">￥1,980</span></body></html>'}
+        selectors = {"title": ".product-title", "price": ".price"}
+        expected = {"title": "日本語の商品名", "price": "￥1,980"}
+        scraper = WebScraper()
+
+        for encoding, page in pages.items():
+            content = page.encode(encoding)
+            self.assertEqual(sniff_encoding(content).lower().replace("-", "_"), encoding)
+            streamed = scraper.extract_fields(content, selectors, StreamingExtractor(selectors, chunk_size=16))
+            self.assertEqual(streamed, expected)
+            self.assertEqual(scraper.extract_fields(content, selectors), expected)
+
+        self.assertIsNone(sniff_encoding(b'<meta charset="no-such-codec"><p>x</p>'))
+
+    def test_unsupported_selector(self):
+        """未対応セレクターは例外 (呼び出し側でBeautifulSoupにフォールバック)"""
+        with self.assertRaises(UnsupportedSelector):
+            compile_selector("li:nth-child(2) .price")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+価格履歴ストアテスト
+変化時のみの記録・最新値 / 時刻T時点の値の検索・再オープン後の継続
+"""
+
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+
+# web_scrapingディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from price_history import PriceHistory
+from web_scraper import WebScraper
+from shop_server import ShopServer
+
+SELECTORS = {"title": ".product-title", "price": ".price"}
+
+def poll(timestamp, prices):
+    return [{"url": url, "timestamp": timestamp, "title": url.upper(), "price": price}
+            for url, price in prices.items()]
+
+class TestPriceHistory(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.db_file = os.path.join(self.tmp, "history.db")
+        self.history = PriceHistory(self.db_file)
+
+    def tearDown(self):
+        self.history.close()
+        shutil.rmtree(self.tmp)
+
+    def test_records_changes_only(self):
+        """値が変わったフィールドだけ記録 (取得回数が増えても件数は増えない)"""
+        first = self.history.record(poll("2026-01-01T00:00:00", {"a": "$10", "b": "$20"}))
+        self.assertEqual(len(first), 4)  # 初回は全フィールド
+
+        for hour in range(1, 10):
+            self.assertEqual(self.history.record(poll(f"2026-01-01T{hour:02d}:00:00", {"a": "$10", "b": "$20"})), [])
+
+        changes = self.history.record(poll("2026-01-01T10:00:00", {"a": "$9", "b": "$20"}))
+        self.assertEqual(changes, [{"url": "a", "field": "price", "value": "$9",
+                                    "changed_at": "2026-01-01T10:00:00", "previous": "$10"}])
+        self.assertEqual(self.history.stats(), {"fields": 4, "changes": 5})
+
+        # エラー結果は値の変化として扱わない
+        self.assertEqual(self.history.record([{"url": "a", "error": "timeout"}]), [])
+
+    def test_latest_and_at(self):
+        """最新値・時刻T時点の値 (記録開始前はNone)"""
+        self.history.record(poll("2026-01-01T00:00:00", {"a": "$10"}))
+        self.history.record(poll("2026-01-02T00:00:00", {"a": "$12"}))
+        self.history.record(poll("2026-01-03T00:00:00", {"a": "$8"}))
+
+        self.assertEqual(self.history.latest("a", "price"), "$8")
+        self.assertEqual(self.history.latest("a"), {"title": "A", "price": "$8"})
+        self.assertIsNone(self.history.at("a", "price", "2025-12-31T00:00:00"))
+        self.assertEqual(self.history.at("a", "price", "2026-01-01T12:00:00"), "$10")
+        self.assertEqual(self.history.at("a", "price", "2026-01-02T00:00:00"), "$12")
+        self.assertEqual(self.history.at("a", "price", "2026-02-01T00:00:00"), "$8")
+        self.assertEqual([value for _, value in self.history.history("a", "price")], ["$10", "$12", "$8"])
+        self.assertEqual(len(self.history.changes_since("2026-01-01T00:00:00")), 2)
+
+        plan = " ".join(row[-1] for row in self.history.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT value FROM changes WHERE field_id = 1 AND changed_at <= ? "
+            "ORDER BY changed_at DESC LIMIT 1", ("2026",)))
+        self.assertIn("PRIMARY KEY", plan)
+
+    def test_reopen_continues(self):
+        """再オープン後も前回の最新値と比較"""
+        self.history.record(poll("2026-01-01T00:00:00", {"a": "$10"}))
+        self.history.close()
+        self.history = PriceHistory(self.db_file)
+        self.assertEqual(self.history.record(poll("2026-01-02T00:00:00", {"a": "$10"})), [])
+        self.assertEqual(len(self.history.record(poll("2026-01-03T00:00:00", {"a": "$11"}))), 1)
+
+class TestTrackPrices(unittest.TestCase):
+    def test_track_prices(self):
+        """2回目の取得で値が同じなら変化なし"""
+        tmp = tempfile.mkdtemp()
+        try:
+            with ShopServer(latency=0.01) as shop:
+                urls = [f"{shop.base_url}/product/{i}" for i in range(3)]
+                scraper = WebScraper(host_rate=50.0, history_db=os.path.join(tmp, "history.db"))
+                self.assertEqual(len(scraper.track_prices(urls, SELECTORS)), 6)
+                self.assertEqual(scraper.track_prices(urls, SELECTORS, concurrent=True), [])
+                self.assertTrue(scraper.price_history.latest(urls[0], "price").startswith("$"))
+                scraper.price_history.close()
+        finally:
+            shutil.rmtree(tmp)
+
+if __name__ == "__main__":
+    unittest.main()
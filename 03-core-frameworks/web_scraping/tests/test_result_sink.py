@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+結果のストリーミング保存テスト
+JSON Lines / gzip の追記・fsyncのまとめ実行・途中終了からの再開
+"""
+
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import threading
+from unittest import mock
+
+# web_scrapingディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import result_sink
+from result_sink import JsonLinesSink, read_results
+from web_scraper import WebScraper
+from shop_server import ShopServer
+
+SELECTORS = {"title": ".product-title", "price": ".price"}
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+def records(n, start=0):
+    return [{"url": f"http://shop/product/{i}", "price": f"${i}.99"} for i in range(start, start + n)]
+
+class TestJsonLinesSink(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_resume_skips_completed(self):
+        """取得成功済みURLはスキップ・エラーだったURLは再取得対象"""
+        path = os.path.join(self.tmp, "results.jsonl")
+        with JsonLinesSink(path) as sink:
+            for record in records(2):
+                sink.write(record)
+            sink.write({"url": "http://shop/product/2", "error": "timeout"})
+
+        urls = [r["url"] for r in records(4)]
+        with JsonLinesSink(path) as sink:
+            self.assertEqual(sink.pending(urls), urls[2:])
+            self.assertEqual(sink.stats["resumed"], 2)
+        self.assertEqual(len(list(read_results(path))), 3)
+
+    def test_truncated_line_repaired(self):
+        """改行なしで切れた末尾行は捨ててから追記"""
+        path = os.path.join(self.tmp, "results.jsonl")
+        with JsonLinesSink(path) as sink:
+            for record in records(2):
+                sink.write(record)
+        with open(path, "ab") as f:
+            f.write(b'{"url": "http://shop/pro')
+
+        with JsonLinesSink(path) as sink:
+            self.assertTrue(sink.stats["repaired"])
+            sink.write(records(1, start=2)[0])
+        self.assertEqual(list(read_results(path)), records(3))
+
+    def test_gzip_crash_recovery(self):
+        """fsync済みの分はgzipが閉じられていなくても復元"""
+        path = os.path.join(self.tmp, "results.jsonl.gz")
+        crashed = os.path.join(self.tmp, "crashed.jsonl.gz")
+        sink = JsonLinesSink(path, fsync_every=1).open()
+        for record in records(3):
+            sink.write(record)
+        sink.drain()
+        shutil.copy(path, crashed)  # 終了処理前のファイル内容
+        sink.close()
+
+        with JsonLinesSink(crashed) as resumed:
+            self.assertTrue(resumed.stats["repaired"])
+            self.assertEqual(resumed.stats["resumed"], 3)
+            for record in records(2, start=3):
+                resumed.write(record)
+        self.assertEqual(list(read_results(crashed)), records(5))
+
+    def test_fsync_batching(self):
+        """fsyncは件数 (fsync_every) または経過時間 (fsync_interval) でまとめて実行"""
+        clock = FakeClock()
+        path = os.path.join(self.tmp, "results.jsonl")
+        with JsonLinesSink(path, fsync_every=3, fsync_interval=5.0, clock=clock) as sink:
+            for record in records(7):
+                sink.write(record)
+            sink.drain()
+            self.assertEqual(sink.stats["fsyncs"], 2)
+
+            clock.now += 5.0
+            sink.write(records(1, start=7)[0])
+            sink.drain()
+            self.assertEqual(sink.stats["fsyncs"], 3)
+
+    def test_write_not_blocked_by_fsync(self):
+        """fsync中も write は待たずに戻る (取得済みURLは即時に反映)"""
+        path = os.path.join(self.tmp, "results.jsonl")
+        release = threading.Event()
+        real_fsync = os.fsync
+
+        def slow_fsync(fd):
+            release.wait(5)
+            real_fsync(fd)
+
+        with mock.patch.object(result_sink.os, "fsync", slow_fsync):
+            with JsonLinesSink(path, fsync_every=1) as sink:
+                for record in records(3):
+                    sink.write(record)
+                self.assertEqual(sink.pending([r["url"] for r in records(4)]), [records(4)[3]["url"]])
+                self.assertEqual(sink.stats["fsyncs"], 0)
+                release.set()
+            self.assertEqual(sink.stats["written"], 3)
+        self.assertEqual(list(read_results(path)), records(3))
+
+class TestScrapeToSink(unittest.TestCase):
+    def test_resume_scraping(self):
+        """再実行時は未取得のURLだけ取得して追記"""
+        tmp = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp, "prices.jsonl.gz")
+            with ShopServer(latency=0.01) as shop:
+                urls = [f"{shop.base_url}/product/{i}" for i in range(5)]
+                scraper = WebScraper(host_rate=50.0)
+
+                with JsonLinesSink(path) as sink:
+                    scraper.scrape_to_sink(urls[:2], SELECTORS, sink)
+                with JsonLinesSink(path) as sink:
+                    summary = scraper.scrape_to_sink(urls, SELECTORS, sink, concurrent=True)
+
+                self.assertEqual(summary, {'total': 5, 'skipped': 2, 'fetched': 3})
+                self.assertEqual(len(shop.arrivals), 5)
+
+            saved = list(read_results(path))
+            self.assertEqual(sorted(r["url"] for r in saved), sorted(urls))
+            self.assertTrue(all(r["price"] for r in saved))
+        finally:
+            shutil.rmtree(tmp)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,45 +1,158 @@
 #!/usr/bin/env python3
 import requests
-from bs4 import BeautifulSoup
 import json
-import time
 from datetime import datetime
 
+from http_cache import install_cache
+from html_extract import StreamingExtractor, UnsupportedSelector, soup_extract
+from concurrent_fetch import ConcurrentFetcher, HostRateLimiter, build_session
+from crawl_scheduler import CrawlScheduler, RobotsCache
+from fetch_pipeline import FetchPipeline
+from result_sink import JsonLinesSink
+from price_history import PriceHistory
+
 class WebScraper:
-    def __init__(self):
+    def __init__(self, cache_dir=None, cache_max_mb=100, max_connections=16,
+                 host_rate=1.0, host_burst=1, respect_robots=True, robots_ttl=3600, robots_strict=False,
+                 parse_workers=None, parse_queue_size=64, history_db=None):
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
+        
+        # HTTPキャッシュ (cache_dir指定時のみ有効)
+        self.http_cache = None
+        if cache_dir:
+            self.http_cache = install_cache(self.session, cache_dir, cache_max_mb * 1024 * 1024)
+        
+        # レート制限 (ホスト毎に host_rate 件/秒・別ホストへのリクエストは待たない)
+        self.rate_limiter = HostRateLimiter(host_rate, host_burst)
+        self.max_connections = max_connections
+        self._pooled_session = None  # 並行取得用の接続プール (取得毎に作り直さずkeep-aliveを維持)
+        
+        # robots.txt (ホスト毎にTTL付きキャッシュ・Crawl-delayは送信間隔に反映)
+        # robots_strict: robots.txt が取得できない (5xx・接続エラー) ホストは再取得まで巡回しない (RFC 9309)
+        self.robots = RobotsCache(robots_ttl, disallow_on_error=robots_strict) if respect_robots else None
+        self.scheduler = None  # 直近の巡回スケジューラー (ホスト別メトリクス参照用)
+        
+        # パイプライン取得 (抽出プロセス数・抽出待ちキューの上限)
+        self.parse_workers = parse_workers
+        self.parse_queue_size = parse_queue_size
+        self.pipeline_stats = {}  # 直近のパイプライン取得の段毎の稼働率
+        
+        # 価格履歴 (history_db指定時のみ・値が変わったフィールドだけ記録)
+        self.price_history = PriceHistory(history_db) if history_db else None
     
-    def scrape_prices(self, urls, selectors):
-        """価格情報取得 - EC比較案件対応"""
-        results = []
+    def extract_fields(self, content, selectors, extractor=None, encoding=None):
+        """セレクター指定フィールド抽出 (extractor指定時はストリーミング抽出)"""
+        if extractor is not None:
+            return extractor.extract(content, encoding)
+        return soup_extract(content, selectors, encoding)
+    
+    def fetch_page(self, url, session=None):
+        """1ページ取得 → (結果辞書の雛形, 本文bytes, 文字コード)"""
+        response = (session or self.session).get(url)
         
-        for url in urls:
+        data = {'url': url, 'timestamp': datetime.now().isoformat()}
+        charset = response.encoding if 'charset' in response.headers.get('Content-Type', '') else None
+        return data, response.content, charset
+    
+    def scrape_page(self, url, selectors, extractor=None, session=None):
+        """1ページ取得・抽出 (失敗時はエラー内容を返す)"""
+        try:
+            data, content, charset = self.fetch_page(url, session)
+            data.update(self.extract_fields(content, selectors, extractor, charset))
+            return data
+            
+        except Exception as e:
+            return {'url': url, 'error': str(e)}
+    
+    def scrape_prices(self, urls, selectors, streaming=False, concurrent=False, pipeline=False, results=None):
+        """価格情報取得 - EC比較案件対応 (concurrent指定時は全URL同時取得・pipeline指定時は抽出を別プロセスで実行)
+        results指定時は完了した結果から順に results[index] = 結果 で格納 (JsonLinesSink等)"""
+        # ストリーミング抽出 (未対応セレクターはBeautifulSoupで処理)
+        extractor = None
+        if streaming:
             try:
-                response = self.session.get(url)
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                data = {'url': url, 'timestamp': datetime.now().isoformat()}
-                
-                for key, selector in selectors.items():
-                    element = soup.select_one(selector)
-                    data[key] = element.text.strip() if element else None
-                
-                results.append(data)
-                time.sleep(1)  # レート制限対応
-                
-            except Exception as e:
-                results.append({'url': url, 'error': str(e)})
+                extractor = StreamingExtractor(selectors)
+            except UnsupportedSelector:
+                extractor = None
+        
+        # 送信可能なホストのURLから順に取得 (結果は元のURL順)
+        self.scheduler = CrawlScheduler(self.rate_limiter, self.robots)
+        self.scheduler.add(urls)
+        
+        if pipeline:
+            fetcher = FetchPipeline(self, self.max_connections, self.parse_workers, self.parse_queue_size,
+                                    self.pooled_session())
+            results = fetcher.run_pipeline(urls, selectors, streaming, self.scheduler, results)
+            self.pipeline_stats = fetcher.utilization()
+            return results
+        
+        fetch = lambda url, session: self.scrape_page(url, selectors, extractor, session)
+        
+        if concurrent:
+            fetcher = ConcurrentFetcher(self, self.max_connections, self.pooled_session())
+            return fetcher.run(urls, fetch, self.scheduler, results)
+        
+        if results is None:
+            results = [None] * len(urls)
+        while (item := self.scheduler.next_blocking()) is not None:
+            results[item.index] = self.scheduler.execute(item, fetch, self.session)
         
         return results
     
+    def scrape_to_sink(self, urls, selectors, sink, **options):
+        """結果を1件ずつ JsonLinesSink へ追記 (取得済みURLはスキップして再開・結果はメモリに保持しない)"""
+        pending = sink.pending(urls)
+        self.scrape_prices(pending, selectors, results=sink, **options)
+        sink.sync()
+        return {'total': len(urls), 'skipped': len(urls) - len(pending), 'fetched': len(pending)}
+    
+    def track_prices(self, urls, selectors, **options):
+        """価格取得して履歴に記録 → 前回から値が変わったフィールドのみ (要 history_db)"""
+        if self.price_history is None:
+            raise ValueError("history_db が未指定です")
+        return self.price_history.record(self.scrape_prices(urls, selectors, **options))
+    
+    def pooled_session(self):
+        """並行取得用セッション (初回のみ作成・以降は同じ接続プールを使用)"""
+        if self._pooled_session is None:
+            self._pooled_session = build_session(self, self.max_connections)
+        return self._pooled_session
+    
+    def close(self):
+        """セッション・価格履歴を閉じる (HTTPキャッシュはLRU順を含めてインデックス保存)"""
+        if self.http_cache is not None:
+            self.http_cache.flush()
+        self.session.close()
+        if self._pooled_session is not None:
+            self._pooled_session.close()
+            self._pooled_session = None
+        if self.price_history is not None:
+            self.price_history.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def crawl_metrics(self):
+        """直近の取得のホスト別メトリクス (待ち行列長・待ち時間・最小送信間隔)"""
+        return self.scheduler.metrics() if self.scheduler is not None else {}
+    
     def save_results(self, results, filename=None):
-        """結果保存"""
+        """結果保存 (.jsonl / .jsonl.gz 指定時は1行1件で逐次書き込み)"""
         if not filename:
             filename = f"scraping_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         
+        if filename.endswith(('.jsonl', '.jsonl.gz')):
+            with JsonLinesSink(filename, resume=False) as sink:
+                for result in results:
+                    sink.write(result)
+            return filename
+        
         with open(filename, 'w', encoding='utf-8') as f:
             json.dump(results, f, indent=2, ensure_ascii=False)
         
@@ -60,5 +173,6 @@ scraping_config = {
     }
 }
 
-with open('scraping_config.json', 'w') as f:
-    json.dump(scraping_config, f, indent=2)
+if __name__ == "__main__":
+    with open('scraping_config.json', 'w') as f:
+        json.dump(scraping_config, f, indent=2)